@@ -2,27 +2,59 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import time
+import math
 import logging
+import logging.handlers
+import threading
+import functools
+import signal
+import importlib.util
+import multiprocessing
+import queue
 from datetime import datetime
-import pygame
-
-# 安全導入 RPi.GPIO / Safe import of RPi.GPIO
-try:
-    import RPi.GPIO as GPIO
-    RPI_GPIO_AVAILABLE = True
-except ImportError:
-    RPI_GPIO_AVAILABLE = False
-    print("⚠️ RPi.GPIO 不可用，將使用相容模式 / RPi.GPIO not available, using compatibility mode")
-
-from modules.camera import Camera
-from modules.gesture import GestureRecognizer
-from modules.mediapipe_gesture import MediaPipeGestureRecognizer
-from modules.poem_api import generate_poem
-from modules.printer import print_poem
-from modules.gpio_control import GPIOControl
-from modules.lcd_display import LCDDisplay
-from modules.config import Config
-import subprocess
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# forkserver 子行程會以 __mp_main__ 重新執行本檔頂層；重量級模組只在主行程導入，列印子行程只需 modules.print_worker
+# forkserver children re-run this file's top level as __mp_main__; heavy modules are imported in the main process only, the print child needs just modules.print_worker
+if __name__ == "__main__":
+    import pygame
+    
+    # 安全導入 RPi.GPIO / Safe import of RPi.GPIO
+    try:
+        import RPi.GPIO as GPIO
+        RPI_GPIO_AVAILABLE = True
+    except ImportError:
+        RPI_GPIO_AVAILABLE = False
+        print("⚠️ RPi.GPIO 不可用，將使用相容模式 / RPi.GPIO not available, using compatibility mode")
+    
+    from modules.camera import Camera
+    from modules.inference_worker import InferenceWorker, average_hash, hamming_distance
+    from modules.gesture import GestureRecognizer
+    from modules.mediapipe_gesture import MediaPipeGestureRecognizer
+    from modules.poem_api import generate_poem
+    from modules.gpio_control import GPIOControl
+    from modules.lcd_display import LCDDisplay, MODE_MANUAL, MODE_TM, MODE_MP, MODE_NAMES
+    from modules.config import Config, setup_logging as setup_file_logging
+
+from modules.print_worker import print_worker, printer_settings
+
+# 調試輸出開關，啟動時由配置設定 / Debug output switch, set from the configuration at startup
+DEBUG = False
+
+# 停止事件，由 SIGINT/SIGTERM 設置，所有等待都會立即醒來 / Shutdown event set by SIGINT/SIGTERM, wakes every wait immediately
+_shutdown = threading.Event()
+
+def _request_shutdown(signum, frame):
+    """
+    信號處理函數：要求主迴圈結束 / Signal handler: ask the main loop to finish
+    
+    Args:
+        signum: 信號編號 / Signal number
+        frame: 目前堆疊框架 / Current stack frame
+    """
+    logging.info("Received signal %s, shutting down", signum)
+    _shutdown.set()
 
 def setup_logging(config):
     """
@@ -31,23 +63,9 @@ def setup_logging(config):
     Args:
         config: 配置物件 / Configuration object
     """
-    os.makedirs(config.log_dir, exist_ok=True)
-    
-    # 設置日誌級別 / Set log levels
-    log_levels = {
-        'DEBUG': logging.DEBUG,
-        'INFO': logging.INFO,
-        'WARNING': logging.WARNING,
-        'ERROR': logging.ERROR,
-        'CRITICAL': logging.CRITICAL
-    }
-    log_level = log_levels.get(config.log_level, logging.INFO)
-    
-    logging.basicConfig(
-        filename=os.path.join(config.log_dir, 'app.log'),
-        level=log_level,
-        format='%(asctime)s - %(levelname)s - %(message)s'
-    )
+    # 輪替的 app.log 由配置模組設置（只會執行一次）/ The rotating app.log is set up by the config module (runs only once)
+    setup_file_logging(config)
+    log_level = logging.getLogger().level
     
     # 如果是調試模式，也輸出到控制台 / If in debug mode, also output to console
     if config.debug:
@@ -57,6 +75,33 @@ def setup_logging(config):
         console_handler.setFormatter(formatter)
         logging.getLogger().addHandler(console_handler)
 
+class StaticRequestHandler(SimpleHTTPRequestHandler):
+    """
+    靜態文件請求處理器 / Static file request handler
+    
+    將請求日誌導向 logging 而非 stderr
+    Routes request logs to logging instead of stderr
+    """
+    def log_message(self, format, *args):
+        logging.debug("HTTP %s - %s", self.address_string(), format % args)
+
+def start_http_server(directory, port=8000):
+    """
+    在背景執行緒啟動靜態文件 HTTP 服務器 / Start static file HTTP server on a background thread
+    
+    Args:
+        directory: 靜態文件目錄 / Static files directory
+        port: 監聽端口 / Listening port
+        
+    Returns:
+        ThreadingHTTPServer: 服務器物件 / Server object
+    """
+    handler = functools.partial(StaticRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(('', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="HTTPServer", daemon=True).start()
+    return server
+
 def main():
     """
     主程式入口點 / Main program entry point
@@ -64,7 +109,9 @@ def main():
     初始化所有模組並運行手勢識別相機系統
     Initializes all modules and runs the gesture recognition camera system
     """
+    global DEBUG
     config = Config()
+    DEBUG = config.debug
     setup_logging(config)
     
     # 列印配置摘要（調試模式下）/ Print configuration summary (in debug mode)
@@ -97,23 +144,19 @@ def main():
         gpio_control.startup_sound()
         
     except Exception as e:
-        logging.error(f"模組初始化失敗: {e} / Module initialization failed: {e}")
+        logging.error("模組初始化失敗: %s / Module initialization failed: %s", e, e)
         print(f"❌ 模組初始化失敗: {e} / Module initialization failed: {e}")
         return
 
     # 啟動 HTTP 服務器 / Start HTTP server
-    server_process = None
+    http_server = None
     try:
         print("🌐 正在啟動 HTTP 服務器... / Starting HTTP server...")
-        server_process = subprocess.Popen(
-            ['python3', '-m', 'http.server', '8000', '--directory', config.static_dir],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        http_server = start_http_server(config.static_dir, 8000)
         logging.info("HTTP server started on port 8000")
         print("✓ HTTP 服務器已在端口 8000 啟動 / HTTP server started on port 8000")
     except Exception as e:
-        logging.error(f"Failed to start HTTP server: {e}")
+        logging.error("Failed to start HTTP server: %s", e)
         print(f"❌ HTTP 服務器啟動失敗: {e} / HTTP server startup failed: {e}")
 
     # 系統狀態變數 / System state variables
@@ -121,11 +164,174 @@ def main():
     current_gesture = None
     in_countdown = False
     is_processing = False
-    processed_photos = set()
+    # 已處理照片記錄，以 LRU 方式限制大小避免長時間運行時無限增長 / Processed photo record, LRU-capped so long sessions don't grow without bound
+    processed_photos = OrderedDict()
+    max_processed_photos = 256
     
     # 錯誤計數器 / Error counter
     consecutive_errors = 0
     max_consecutive_errors = 10
+    
+    # 列印在常駐的 forkserver 子行程中執行，持續持有印表機連接並依序處理佇列 / Printing runs in a long-lived forkserver child that holds the printer connection and drains a job queue in order
+    print_context = multiprocessing.get_context('forkserver')
+    print_context.set_forkserver_preload(['modules.print_worker'])
+    print_jobs = print_context.Queue()
+    print_results = print_context.Queue()
+    print_process = None
+    # 子行程的日誌經佇列送回主行程，由主行程的處理器寫入 app.log / The child's log records come back over a queue and are written to app.log by the main process's handlers
+    print_log_queue = print_context.Queue()
+    print_log_listener = logging.handlers.QueueListener(print_log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+    print_log_listener.start()
+    
+    def start_print_worker():
+        """
+        啟動列印工作行程 / Start the print worker process
+        """
+        nonlocal print_process
+        print_process = print_context.Process(
+            target=print_worker,
+            args=(print_jobs, print_results, print_log_queue, printer_settings(config)),
+            daemon=True
+        )
+        print_process.start()
+    
+    start_print_worker()
+    
+    # 列印工作行程崩潰後以指數退避重啟，重啟太多次就停用列印，避免啟動即崩潰時陷入重啟迴圈
+    # Restart a crashed print worker with exponential backoff and disable printing after too many restarts, so a worker that dies on startup cannot spin the loop
+    print_restart_base_delay = 2.0
+    print_restart_max_delay = 300.0
+    max_print_restarts = 5
+    print_restarts = 0
+    next_print_restart = None
+    printing_disabled = False
+
+    # 畫面幾乎沒變時重用上一次結果；連續略過太多幀時仍強制推論一次 / Reuse the last result while the scene is practically unchanged, but force a fresh inference after too many skips
+    unchanged_hash_distance = 4
+    max_skipped_frames = 30
+
+    # Teachable Machine 上一次的 [雜湊, 信心度, 已略過幀數] / Last Teachable Machine [hash, confidences, skipped frames]
+    tm_last = [None, None, 0]
+
+    def predict_teachable_machine(frame):
+        """
+        Teachable Machine 推論，輸出格式與 MediaPipe 一致；畫面與上一幀幾乎相同時略過
+        Teachable Machine inference with the same output shape as MediaPipe, skipped when the frame is nearly identical to the previous one
+        """
+        frame_hash = average_hash(frame)
+        last_hash, last_conf, skipped = tm_last
+        if (last_conf is not None and skipped < max_skipped_frames
+                and hamming_distance(frame_hash, last_hash) < unchanged_hash_distance):
+            tm_last[2] = skipped + 1
+            ok_conf, ya_conf, none_conf = last_conf
+            return ok_conf, ya_conf, none_conf, frame
+        ok_conf, ya_conf, none_conf = gesture_recognizer.predict(frame)
+        tm_last[0], tm_last[1], tm_last[2] = frame_hash, (ok_conf, ya_conf, none_conf), 0
+        return ok_conf, ya_conf, none_conf, frame
+
+    # MediaPipe 上一次的 [雜湊, 結果, 已略過幀數] / Last MediaPipe [hash, result, skipped frames]
+    mediapipe_last = [None, None, 0]
+
+    def predict_mediapipe(frame):
+        """
+        MediaPipe 推論，畫面與上一幀幾乎相同時略過 / MediaPipe inference, skipped when the frame is nearly identical to the previous one
+        """
+        frame_hash = average_hash(frame)
+        last_hash, last_result, skipped = mediapipe_last
+        if (last_result is not None and skipped < max_skipped_frames
+                and hamming_distance(frame_hash, last_hash) < unchanged_hash_distance):
+            mediapipe_last[2] = skipped + 1
+            ok_conf, ya_conf, none_conf, annotated_frame = last_result
+            # 沒畫出手時快取的影格就是推論緩衝區本身，會被後續影格覆寫，改回傳目前影格
+            # Without a drawn hand the cached frame is the inference buffer itself, which later frames overwrite, so return the current frame instead
+            return ok_conf, ya_conf, none_conf, frame if annotated_frame is None else annotated_frame
+        result = mediapipe_recognizer.predict(frame)
+        ok_conf, ya_conf, none_conf, annotated_frame = result
+        cached_frame = None if annotated_frame is frame else annotated_frame
+        mediapipe_last[0], mediapipe_last[1], mediapipe_last[2] = frame_hash, (ok_conf, ya_conf, none_conf, cached_frame), 0
+        return result
+
+    # 各模式的推論函數，只在模式切換時重新選擇 / Per-mode predictors, selected again only when the mode changes
+    predictors = {
+        MODE_TM: predict_teachable_machine,
+        MODE_MP: predict_mediapipe,
+    }
+
+    def run_inference(frame):
+        """
+        依目前模式執行手勢推論（於推論執行緒中呼叫）/ Run gesture inference for the current mode (called on the inference thread)
+        
+        Args:
+            frame: 相機影格 / Camera frame
+            
+        Returns:
+            tuple: (模式代碼, OK, YA, None, 顯示影格)，手動模式回傳 None / (mode id, OK, YA, None, display frame), None in manual mode
+        """
+        mode_id = lcd_display.mode_id
+        predict = predictors.get(mode_id)
+        if predict is None:
+            return None
+        
+        try:
+            ok_conf, ya_conf, none_conf, annotated_frame = predict(frame)
+        except Exception as e:
+            mode_name = MODE_NAMES[mode_id]
+            logging.warning("%s 預測錯誤: %s / %s prediction error: %s", mode_name, e, mode_name, e)
+            ok_conf, ya_conf, none_conf, annotated_frame = 0, 0, 100, frame
+        return mode_id, ok_conf, ya_conf, none_conf, annotated_frame
+
+    # 背景推論執行緒，主迴圈只讀取最新結果 / Background inference thread, the main loop only reads the latest result
+    inference_worker = InferenceWorker(camera, run_inference)
+    inference_worker.start()
+    last_result_seq = 0
+
+    def take_inference_result(mode_id):
+        """
+        取得尚未處理過的最新推論結果 / Take the newest inference result not yet consumed
+        
+        Args:
+            mode_id: 目前模式代碼，丟棄其他模式的舊結果 / Current mode id, stale results from other modes are dropped
+            
+        Returns:
+            tuple or None: 新結果，沒有新結果時回傳 None / New result, or None if there is none
+        """
+        nonlocal last_result_seq
+        seq, result = inference_worker.latest()
+        if seq == last_result_seq:
+            return None
+        last_result_seq = seq
+        if result is None or result[0] != mode_id:
+            return None
+        return result
+
+    def display_inference_result(mode_id, frame):
+        """
+        更新相機畫面並套用新的推論結果（倒數與主迴圈共用）/ Update the preview and apply a new inference result (shared by countdown and main loop)
+        
+        Args:
+            mode_id: 目前模式代碼 / Current mode id
+            frame: 最新相機影格 / Newest camera frame
+            
+        Returns:
+            tuple or None: 新結果的 (OK, YA, None) 信心度，沒有新結果時回傳 None / (OK, YA, None) confidences of a new result, or None if there is none
+        """
+        if mode_id == MODE_MANUAL:  # Manual Mode / 手動模式
+            lcd_display.update_frame_async(frame)
+            lcd_display.update_confidence(0, 0, 100)
+            return None
+        
+        if mode_id == MODE_TM:
+            lcd_display.update_frame_async(frame)
+        result = take_inference_result(mode_id)
+        if result is None:
+            return None
+        
+        _, ok_conf, ya_conf, none_conf, annotated_frame = result
+        if mode_id == MODE_MP:
+            # 標記影格需與骨架一致，僅在有新結果時更新 / Annotated frame must match the skeleton, update only on new results
+            lcd_display.update_frame_async(annotated_frame)
+        lcd_display.update_confidence(ok_conf, ya_conf, none_conf)
+        return ok_conf, ya_conf, none_conf
 
     def button_callback(channel):
         """
@@ -136,11 +342,8 @@ def main():
         """
         nonlocal consecutive_errors
         
-        # 檢查是否為手動模式（支援中英文）/ Check if in manual mode (supports Chinese and English)
-        is_manual_mode = ("手動" in lcd_display.current_mode or 
-                         "Manual Mode" == lcd_display.current_mode)
-        
-        if is_manual_mode and not in_countdown and not is_processing:
+        # 檢查是否為手動模式 / Check if in manual mode
+        if lcd_display.mode_id == MODE_MANUAL and not in_countdown and not is_processing:
             logging.info("Button triggered, starting countdown")
             print("🔘 按鈕觸發，開始倒數計時... / Button triggered, starting countdown...")
             gpio_control.button_press_sound()  # 按鈕按下音效 / Button press sound
@@ -156,65 +359,52 @@ def main():
         """
         nonlocal in_countdown, is_processing, consecutive_errors
         in_countdown = True
-        start_time = time.time()
         countdown_duration = 5  # 倒數 5 秒 / Countdown 5 seconds
+        deadline = time.monotonic() + countdown_duration
+        last_tick = None
         
         print("⏰ 開始 5 秒倒數計時... / Starting 5-second countdown...")
         
-        while time.time() - start_time < countdown_duration:
+        while not _shutdown.is_set():
+            now = time.monotonic()
+            if now >= deadline:
+                break
             try:
-                # 在倒數期間持續獲取並更新畫面 / Continuously capture and update frame during countdown
-                frame = camera.get_frame()
+                # 在倒數期間等待新影格並更新畫面，節奏由相機幀率決定 / Wait for new frames during countdown; pacing follows the camera frame rate
+                frame = camera.wait_frame(timeout=0.1)
                 if frame is None:
                     logging.warning("Failed to capture frame during countdown")
                     print("⚠️ 倒數期間無法獲取影格 / Failed to capture frame during countdown")
                     lcd_display.update_status("無法獲取相機畫面")
-                    time.sleep(0.1)
                     continue
 
-                remaining_time = int(countdown_duration - (time.time() - start_time)) + 1
-                lcd_display.update_status(f"倒數計時: {remaining_time} 秒")
-                print(f"⏱️  倒數: {remaining_time} 秒 / Countdown: {remaining_time}s")
+                remaining_time = math.ceil(deadline - now)
 
                 # 根據當前模式更新畫面 / Update display based on current mode
-                current_mode = lcd_display.current_mode
-                
-                if "Teachable Machine" in current_mode:
-                    try:
-                        ok_conf, ya_conf, none_conf = gesture_recognizer.predict(frame)
-                        lcd_display.update_frame(frame)
-                        lcd_display.update_confidence(ok_conf, ya_conf, none_conf)
-                    except Exception as e:
-                        logging.warning(f"Teachable Machine 預測錯誤: {e} / Teachable Machine prediction error: {e}")
-                        lcd_display.update_frame(frame)
-                        lcd_display.update_confidence(0, 0, 100)
-                        
-                elif "MediaPipe" in current_mode:
-                    try:
-                        ok_conf, ya_conf, none_conf, annotated_frame = mediapipe_recognizer.predict(frame)
-                        lcd_display.update_frame(annotated_frame)
-                        lcd_display.update_confidence(ok_conf, ya_conf, none_conf)
-                    except Exception as e:
-                        logging.warning(f"MediaPipe 預測錯誤: {e} / MediaPipe prediction error: {e}")
-                        lcd_display.update_frame(frame)
-                        lcd_display.update_confidence(0, 0, 100)
-                else:  # Manual Mode / 手動模式
-                    lcd_display.update_frame(frame)
-                    lcd_display.update_confidence(0, 0, 100)
-
-                # LED 閃爍和倒數音效 / LED blink and countdown sound
-                gpio_control.led_blink(1, 0.2)
-                gpio_control.countdown_sound()  # 倒數計時音效 / Countdown sound
-                time.sleep(0.3)
+                display_inference_result(lcd_display.mode_id, frame)
+
+                # 狀態、LED 閃爍和倒數音效（每秒一次）/ Status, LED blink and countdown sound (once per second)
+                if remaining_time != last_tick:
+                    last_tick = remaining_time
+                    lcd_display.update_status(f"倒數計時: {remaining_time} 秒")
+                    print(f"⏱️  倒數: {remaining_time} 秒 / Countdown: {remaining_time}s")
+                    gpio_control.led_blink(1, 0.2)
+                    # 音效在背景播放，不阻塞影格更新 / Play the sound in the background so frame updates are not blocked
+                    threading.Thread(target=gpio_control.countdown_sound, daemon=True).start()
                 
             except Exception as e:
-                logging.error(f"倒數期間錯誤: {e} / Error during countdown: {e}")
+                logging.error("倒數期間錯誤: %s / Error during countdown: %s", e, e)
                 consecutive_errors += 1
                 if consecutive_errors >= max_consecutive_errors:
                     print("❌ 過多錯誤，中止倒數 / Too many errors, aborting countdown")
                     gpio_control.error_sound()
                     break
 
+        # 收到停止信號時放棄拍照 / Abandon the photo when shutting down
+        if _shutdown.is_set():
+            in_countdown = False
+            return
+        
         # 倒數結束後拍照 / Take photo after countdown
         print("📸 倒數結束，準備拍照... / Countdown finished, preparing to take photo...")
         
@@ -231,7 +421,9 @@ def main():
                 photo_path = camera.save_photo(frame)
                 
                 if photo_path and photo_path not in processed_photos:
-                    processed_photos.add(photo_path)
+                    processed_photos[photo_path] = None
+                    if len(processed_photos) > max_processed_photos:
+                        processed_photos.popitem(last=False)
                     lcd_display.update_status(f"照片已保存: {os.path.basename(photo_path)}")
                     print(f"✓ 照片已保存: {photo_path}")
                     
@@ -253,11 +445,13 @@ def main():
                             lcd_display.update_status("正在列印詩歌")
                             gpio_control.print_start_sound()  # 開始列印音效 / Starting print sound
                             
-                            print_poem(poem_path, config)
-                            
-                            print("✅ 詩歌列印完成! / Poem printing completed!")
-                            lcd_display.update_status("詩歌列印完成")
-                            gpio_control.print_complete_sound()  # 列印完成音效 / Print complete sound
+                            if printing_disabled:
+                                print("❌ 列印功能已停用，詩歌未列印 / Printing disabled, poem not printed")
+                                lcd_display.update_status("列印功能已停用")
+                                gpio_control.error_sound()  # 錯誤音效 / Error sound
+                            else:
+                                # 交給列印工作行程依序列印，與下一輪手勢偵測並行 / Hand off to the print worker, which prints in order concurrently with the next gesture cycle
+                                print_jobs.put(poem_path)
                             
                         else:
                             print("❌ 詩歌生成失敗 / Poem generation failed")
@@ -265,7 +459,7 @@ def main():
                             gpio_control.error_sound()  # 錯誤音效 / Error sound
                             
                     except Exception as e:
-                        logging.error(f"Poem generation/printing failed: {e}")
+                        logging.error("Poem generation/printing failed: %s", e)
                         print(f"❌ 詩歌生成/列印失敗: {e}")
                         lcd_display.update_status("處理失敗")
                         gpio_control.error_sound()  # 錯誤音效 / Error sound
@@ -277,7 +471,7 @@ def main():
                 gpio_control.error_sound()  # 錯誤音效 / Error sound
                 
         except Exception as e:
-            logging.error(f"拍照過程錯誤: {e}")
+            logging.error("拍照過程錯誤: %s", e)
             print(f"❌ 拍照過程錯誤: {e}")
             gpio_control.error_sound()
             
@@ -288,128 +482,127 @@ def main():
     # 設置按鈕回調
     gpio_control.setup_button_callback(button_callback)
 
-    # 系統就緒提示
-    print("🎵 系統初始化完成，播放就緒音效... / System initialization completed, playing ready sound...")
-    gpio_control.system_ready_sound()
+    # 系統就緒提示（啟動音效已在初始化時播放）/ System ready prompt (the startup sound already played during init)
     print("✅ 系統就緒，開始運行主迴圈... / System ready, starting main loop...")
     
+    # 迴圈中不變的設定值與常用方法先存成區域變數 / Cache loop-invariant settings and hot methods in locals
+    confidence_threshold = config.gesture_confidence_threshold
+    detection_frames = config.gesture_detection_frames
+    wait_frame = camera.wait_frame
+    handle_touch_events = lcd_display.handle_touch_events
+    display_inference = display_inference_result
+    gesture_detected_sound = gpio_control.gesture_detected_sound
+    
+    # SIGINT（Ctrl-C）與 SIGTERM（systemd 停止）都走同一條正常結束路徑 / SIGINT (Ctrl-C) and SIGTERM (systemd stop) share one graceful exit path
+    signal.signal(signal.SIGINT, _request_shutdown)
+    signal.signal(signal.SIGTERM, _request_shutdown)
+    
     try:
-        while True:
+        while not _shutdown.is_set():
             # 處理觸控事件 / Handle touch events
-            lcd_display.handle_touch_events(button_callback)
+            handle_touch_events(button_callback)
+            
+            # 檢查背景列印是否完成 / Check whether background printing has finished
+            try:
+                _, printed = print_results.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                # 能回報結果代表工作行程運作正常，重設重啟次數 / A reported result means the worker is healthy, reset the restart count
+                print_restarts = 0
+                if printed:
+                    print("✅ 詩歌列印完成! / Poem printing completed!")
+                    lcd_display.update_status("詩歌列印完成")
+                    gpio_control.print_complete_sound()  # 列印完成音效 / Print complete sound
+                else:
+                    print("❌ 詩歌列印失敗 / Poem printing failed")
+                    lcd_display.update_status("詩歌列印失敗")
+                    gpio_control.error_sound()  # 錯誤音效 / Error sound
+            
+            # 列印工作行程意外結束時延後重新啟動；正在列印的那份工作會遺失，仍在佇列中的工作會保留
+            # Restart the print worker after a backoff if it died; the job it was printing is lost, jobs still queued are kept
+            if not printing_disabled and not print_process.is_alive():
+                if next_print_restart is None:
+                    # 每次崩潰只回報一次 / Report each crash only once
+                    logging.error("Print worker exited with code %s", print_process.exitcode)
+                    print("❌ 詩歌列印失敗 / Poem printing failed")
+                    gpio_control.error_sound()  # 錯誤音效 / Error sound
+                    if print_restarts >= max_print_restarts:
+                        printing_disabled = True
+                        logging.error("Print worker crashed %s times in a row, printing disabled", print_restarts + 1)
+                        lcd_display.update_status("列印功能已停用")
+                    else:
+                        delay = min(print_restart_max_delay, print_restart_base_delay * (2 ** print_restarts))
+                        logging.info("Restarting print worker in %.0fs", delay)
+                        lcd_display.update_status("詩歌列印失敗")
+                        next_print_restart = time.monotonic() + delay
+                elif time.monotonic() >= next_print_restart:
+                    print_restarts += 1
+                    next_print_restart = None
+                    start_print_worker()
             
             # 如果正在倒數或處理中，跳過主要邏輯 / Skip main logic if in countdown or processing
             if in_countdown or is_processing:
-                time.sleep(0.5)
+                _shutdown.wait(0.5)
                 continue
 
-            # 獲取相機影格 / Get camera frame
-            frame = camera.get_frame()
+            # 等待新的相機影格（事件驅動，取代固定輪詢）/ Wait for a new camera frame (event-driven instead of fixed polling)
+            frame = wait_frame(timeout=1.0)
             if frame is None:
                 logging.warning("Failed to capture frame")
                 lcd_display.update_status("無法獲取相機畫面")
-                time.sleep(1)
                 continue
 
-            # 根據當前模式處理手勢識別 / Handle gesture recognition based on current mode
-            current_mode = lcd_display.current_mode
-            
-            if "Teachable Machine" in current_mode:
-                try:
-                    ok_conf, ya_conf, none_conf = gesture_recognizer.predict(frame)
-                    lcd_display.update_frame(frame)
-                    lcd_display.update_confidence(ok_conf, ya_conf, none_conf)
-                    
-                    # 手勢識別邏輯 / Gesture recognition logic
-                    if ok_conf > config.gesture_confidence_threshold:
-                        if current_gesture == "OK":
-                            gesture_counter += 1
-                        else:
-                            gesture_counter = 1
-                            current_gesture = "OK"
-                        if config.debug:
-                            print(f"🔍 偵測到 OK 手勢 (信心度: {ok_conf:.1f}%) / Detected OK gesture (confidence: {ok_conf:.1f}%)")
-                    elif ya_conf > config.gesture_confidence_threshold:
-                        if current_gesture == "YA":
-                            gesture_counter += 1
-                        else:
-                            gesture_counter = 1
-                            current_gesture = "YA"
-                        if config.debug:
-                            print(f"🔍 偵測到 YA 手勢 (信心度: {ya_conf:.1f}%) / Detected YA gesture (confidence: {ya_conf:.1f}%)")
-                    else:
-                        gesture_counter = 0
-                        current_gesture = None
-                    
-                    # 達到連續識別次數閾值時觸發拍照 / Trigger photo when consecutive recognition threshold is reached
-                    if gesture_counter >= config.gesture_detection_frames:
-                        logging.info(f"{current_gesture} gesture detected, starting countdown")
-                        print(f"✋ {current_gesture} 手勢確認識別，開始倒數計時... / {current_gesture} gesture recognized, starting countdown...")
-                        gpio_control.gesture_detected_sound()  # 手勢識別音效 / Gesture recognition sound
-                        start_countdown()
-                        gesture_counter = 0
-                        current_gesture = None
-                        
-                except Exception as e:
-                    logging.error(f"Teachable Machine 錯誤: {e} / Teachable Machine error: {e}")
-                    consecutive_errors += 1
-
-            elif "MediaPipe" in current_mode:
-                try:
-                    ok_conf, ya_conf, none_conf, annotated_frame = mediapipe_recognizer.predict(frame)
-                    lcd_display.update_frame(annotated_frame)
-                    lcd_display.update_confidence(ok_conf, ya_conf, none_conf)
-                    
-                    # MediaPipe 手勢識別邏輯 / MediaPipe gesture recognition logic
-                    if ok_conf > config.gesture_confidence_threshold:
-                        if current_gesture == "OK":
-                            gesture_counter += 1
-                        else:
-                            gesture_counter = 1
-                            current_gesture = "OK"
-                        if config.debug:
-                            print(f"🔍 MediaPipe 偵測到 OK 手勢 (信心度: {ok_conf:.1f}%) / MediaPipe detected OK gesture (confidence: {ok_conf:.1f}%)")
-                    elif ya_conf > config.gesture_confidence_threshold:
-                        if current_gesture == "YA":
-                            gesture_counter += 1
-                        else:
-                            gesture_counter = 1
-                            current_gesture = "YA"
-                        if config.debug:
-                            print(f"🔍 MediaPipe 偵測到 YA 手勢 (信心度: {ya_conf:.1f}%) / MediaPipe detected YA gesture (confidence: {ya_conf:.1f}%)")
-                    else:
-                        gesture_counter = 0
-                        current_gesture = None
-                    
-                    # 達到連續識別次數閾值時觸發拍照 / Trigger photo when consecutive recognition threshold is reached
-                    if gesture_counter >= config.gesture_detection_frames:
-                        logging.info(f"{current_gesture} gesture detected, starting countdown")
-                        print(f"✋ MediaPipe {current_gesture} 手勢確認識別，開始倒數計時... / MediaPipe {current_gesture} gesture recognized, starting countdown...")
-                        gpio_control.gesture_detected_sound()  # 手勢識別音效 / Gesture recognition sound
-                        start_countdown()
-                        gesture_counter = 0
-                        current_gesture = None
-                        
-                except Exception as e:
-                    logging.error(f"MediaPipe 錯誤: {e} / MediaPipe error: {e}")
-                    consecutive_errors += 1
-
-            else:  # Manual Mode / 手動模式
-                lcd_display.update_frame(frame)
-                lcd_display.update_confidence(0, 0, 100)
-
             # 重置錯誤計數器 / Reset error counter
             if consecutive_errors > 0:
                 consecutive_errors = max(0, consecutive_errors - 0.1)
 
-            time.sleep(0.1)
+            # 根據當前模式處理手勢識別 / Handle gesture recognition based on current mode
+            mode_id = lcd_display.mode_id
+            confidences = display_inference(mode_id, frame)
+            if confidences is not None:
+                ok_conf, ya_conf, none_conf = confidences
+                
+                # 手勢識別邏輯（兩種模式共用）/ Gesture recognition logic (shared by both modes)
+                if ok_conf > confidence_threshold:
+                    detected_gesture, detected_conf = "OK", ok_conf
+                elif ya_conf > confidence_threshold:
+                    detected_gesture, detected_conf = "YA", ya_conf
+                else:
+                    detected_gesture = None
+                
+                if detected_gesture is None:
+                    gesture_counter = 0
+                    current_gesture = None
+                else:
+                    if current_gesture == detected_gesture:
+                        gesture_counter += 1
+                    else:
+                        gesture_counter = 1
+                        current_gesture = detected_gesture
+                    if DEBUG:
+                        mode_name = MODE_NAMES[mode_id]
+                        print(f"🔍 {mode_name} 偵測到 {detected_gesture} 手勢 (信心度: {detected_conf:.1f}%) / {mode_name} detected {detected_gesture} gesture (confidence: {detected_conf:.1f}%)")
+                
+                # 達到連續識別次數閾值時觸發拍照 / Trigger photo when consecutive recognition threshold is reached
+                if gesture_counter >= detection_frames:
+                    mode_name = MODE_NAMES[mode_id]
+                    logging.info("%s %s gesture detected, starting countdown", mode_name, current_gesture)
+                    print(f"✋ {mode_name} {current_gesture} 手勢確認識別，開始倒數計時... / {mode_name} {current_gesture} gesture recognized, starting countdown...")
+                    gesture_detected_sound()  # 手勢識別音效 / Gesture recognition sound
+                    start_countdown()
+                    gesture_counter = 0
+                    current_gesture = None
 
+        logging.info("Program interrupted by signal")
+        print("\n🛑 收到停止信號 / Shutdown signal received")
+        
     except KeyboardInterrupt:
         logging.info("Program interrupted by user")
         print("\n🛑 程序被用戶中斷 / Program interrupted by user")
         
     except Exception as e:
-        logging.error(f"Unexpected error in main loop: {e}")
+        logging.error("Unexpected error in main loop: %s", e)
         print(f"❌ 主迴圈發生未預期錯誤: {e} / Unexpected error in main loop: {e}")
         gpio_control.error_sound()  # 錯誤音效 / Error sound
         
@@ -417,20 +610,23 @@ def main():
         print("🧹 正在清理資源... / Cleaning up resources...")
         
         # 清理 HTTP 服務器 / Clean up HTTP server
-        if server_process:
+        if http_server:
             print("🌐 正在停止 HTTP 服務器... / Stopping HTTP server...")
-            server_process.terminate()
-            try:
-                server_process.wait(timeout=2)
-                logging.info("HTTP server terminated")
-                print("✓ HTTP 服務器已停止 / HTTP server stopped")
-            except subprocess.TimeoutExpired:
-                server_process.kill()
-                logging.warning("HTTP server forcefully killed")
-                print("⚠️ HTTP 服務器已強制終止 / HTTP server forcefully killed")
+            http_server.shutdown()
+            http_server.server_close()
+            logging.info("HTTP server stopped")
+            print("✓ HTTP 服務器已停止 / HTTP server stopped")
+        
+        # 等待佇列中的列印完成後結束列印工作行程 / Let queued print jobs finish, then stop the print worker
+        if print_process.is_alive():
+            print("🖨️  等待列印完成... / Waiting for printing to finish...")
+            print_jobs.put(None)
+            print_process.join(timeout=30)
+        print_log_listener.stop()
         
         # 清理各個模組 / Clean up all modules
         print("📷 正在釋放相機資源... / Releasing camera resources...")
+        inference_worker.stop()
         camera.release()
         
         print("🔧 正在釋放 GPIO 資源... / Releasing GPIO resources...")
@@ -458,19 +654,14 @@ def check_dependencies():
     if not RPI_GPIO_AVAILABLE:
         warnings.append("RPi.GPIO (將使用相容模式 / will use compatibility mode)")
     
-    try:
-        import cv2
-    except ImportError:
+    # 只查找模組而不真正載入，避免重複付出匯入成本 / Only locate modules without importing them to avoid paying the import cost twice
+    if importlib.util.find_spec("cv2") is None:
         missing_deps.append("opencv-python")
     
-    try:
-        import pygame
-    except ImportError:
+    if importlib.util.find_spec("pygame") is None:
         missing_deps.append("pygame")
     
-    try:
-        from dotenv import load_dotenv
-    except ImportError:
+    if importlib.util.find_spec("dotenv") is None:
         warnings.append("python-dotenv (將使用預設值 / will use default values)")
     
     if missing_deps:
@@ -6,111 +6,345 @@ import logging
 import cv2
 import datetime
 import time
+import math
+import glob
+import random
+import threading
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import subprocess
 import tempfile
 from modules.config import Config
 
 # 嘗試導入 picamera2 / Try to import picamera2
 try:
-    from picamera2 import Picamera2
+    from picamera2 import Picamera2, MappedArray
     PICAMERA2_AVAILABLE = True
 except ImportError:
     PICAMERA2_AVAILABLE = False
     logging.warning("picamera2 模組不可用，將使用其他方法 / picamera2 module not available, will use other methods")
 
+# 嘗試導入 PyTurboJPEG（libjpeg-turbo，ARM 上使用 NEON）/ Try to import PyTurboJPEG (libjpeg-turbo, NEON-accelerated on ARM)
+try:
+    from turbojpeg import TurboJPEG
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# 行程的 umask 只能以設定再還原的方式讀取，在導入時讀一次 / The process umask can only be read by setting and restoring it, so read it once at import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+# mkstemp 建立的檔案權限為 0600，改為與 cv2.imwrite 相同的一般檔案權限 / mkstemp creates files as 0600, use the regular file mode cv2.imwrite would produce instead
+PHOTO_FILE_MODE = 0o666 & ~_UMASK
+
 class Camera:
     """
     相機控制類別 / Camera control class
     
     支援多種相機初始化方法，包括 picamera2、libcamera、V4L2 和 OpenCV
     Supports multiple camera initialization methods including picamera2, libcamera, V4L2 and OpenCV
+    
+    初始化後會在背景執行緒持續擷取，最新影格寫入單槽緩衝區（新影格覆寫舊影格），
+    get_frame() 不必等待相機 I/O。影格寫入預先配置的環形緩衝區，取得的影格在之後再擷取
+    ring_size - 1 幀之前保持有效；需要保存更久的消費者（例如推論執行緒）必須自行複製
+    After initialization frames are captured continuously on a background thread into a single-slot
+    buffer (new frames overwrite old ones), so get_frame() never waits on camera I/O. Frames are written
+    into a preallocated ring of buffers; a returned frame stays valid until ring_size - 1 newer frames
+    have been captured, and consumers that hold a frame longer (such as the inference worker) must copy it
     """
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, max_fps=30, ring_size=3):
         """
         初始化相機 / Initialize camera
         
         Args:
             config: 配置物件 / Configuration object
+            max_fps: 最高擷取幀率，避免模擬模式空轉 / Max capture rate, keeps simulation mode from spinning
+            ring_size: 環形緩衝區數量 / Number of ring buffers
         """
         self.config = config
         
-        # 配置日誌 / Configure logging
-        logging.basicConfig(
-            filename=os.path.join(self.config.log_dir, 'app.log'),
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        # 根日誌由 Config 建立時的 setup_logging 統一設置 / The root logger is configured once by setup_logging when Config is created
         self.logger = logging.getLogger(__name__)
         
         self.cap = None
         self.picam2 = None
         self.method_used = "none"
         self.retry_count = 3
-        self.last_error_time = 0
         self.error_cooldown = 5  # 5秒錯誤冷卻期 / 5-second error cooldown period
+        # 冷卻期結束的單調時鐘時間點，0 表示從未出錯 / Monotonic time at which the cooldown ends, 0 means no error yet
+        self._cooldown_until = 0.0
+        # libcamera 命令列工具不存在時不再重試 / Stop retrying once the libcamera CLI tools are known to be missing
+        self.libcamera_tools_missing = False
+        # 硬體檢測結果快取，期間內不重複啟動 libcamera-hello / Cached hardware check so libcamera-hello isn't respawned within the TTL
+        self._hw_check_cache = None
+        self._hw_check_ts = 0
+        self.hw_check_ttl = 60
+        
+        # JPEG 編碼器：優先 libjpeg-turbo，失敗時退回 cv2.imwrite / JPEG encoder: libjpeg-turbo first, cv2.imwrite as fallback
+        self._tj = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self._tj = TurboJPEG()
+            except Exception as e:
+                self.logger.warning("TurboJPEG 初始化失敗，使用 OpenCV 編碼: %s / TurboJPEG init failed, using OpenCV encoder: %s", e, e)
+        
+        # 相機存取鎖：擷取執行緒與拍照不可同時操作硬體 / Device lock: capture thread and photo capture must not touch hardware concurrently
+        self._lock = threading.RLock()
+        
+        # 並行探測後端時，只有第一個成功者能取得相機 / When probing backends in parallel, only the first success claims the camera
+        self._claim_lock = threading.Lock()
+        self._probe_done = threading.Event()
+        # CSI 組結束探測後才設定；USB 後端須等到 CSI 組失敗才能取得相機，維持 picamera2 → libcamera → v4l2 → opencv 的優先順序
+        # Set once the CSI group has finished probing; a USB backend may claim the camera only after the CSI group failed, keeping the picamera2 → libcamera → v4l2 → opencv priority
+        self._csi_settled = threading.Event()
+        
+        # 模擬畫面的靜態背景只繪製一次 / The static part of the simulated frame is drawn only once
+        self._sim_bg = np.full((config.frame_height, config.frame_width, 3), 50, dtype=np.uint8)
+        cv2.putText(self._sim_bg, "Camera Simulation", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        cv2.putText(self._sim_bg, "Timeout recovery mode", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+        
+        # 未提供 out 時的縮放目的緩衝區，避免每幀配置新陣列 / Resize destination used when no out buffer is given, avoids a fresh allocation per frame
+        self._frame_out = np.empty((config.frame_height, config.frame_width, 3), dtype=np.uint8)
+        
+        # 讀取函數在取得後端時綁定 / The read function is bound when a backend is claimed
+        self._read_frame = self._get_simulated_frame
         
         # 初始化相機 / Initialize camera
         self._initialize_camera()
+        
+        # 背景擷取：單槽最新影格 + 新影格通知（多個消費者共用，故不用 Queue）/ Background capture: single latest-frame slot plus new-frame notification (shared by several consumers, hence no Queue)
+        self.capture_min_interval = 1.0 / max_fps
+        shape = (config.frame_height, config.frame_width, 3)
+        self._bufs = [np.empty(shape, dtype=np.uint8) for _ in range(ring_size)]
+        self._latest = None
+        self._frame_cond = threading.Condition()
+        self._seq = 0
+        self._capture_stop = threading.Event()
+        self._capture_thread = threading.Thread(target=self._capture_loop, name="CameraCapture", daemon=True)
+        self._capture_thread.start()
+        self.logger.info("相機擷取執行緒已啟動 / Camera capture thread started")
     
     def _initialize_camera(self):
         """
         強化的相機初始化，支援多種方法並處理超時問題
         Enhanced camera initialization supporting multiple methods and handling timeout issues
+        
+        CSI 相機（picamera2、libcamera）與 USB 相機分成兩組並行探測，組內依序嘗試；
+        USB 組只開啟 USB 匯流排上的裝置節點，且必須等 CSI 組失敗後才能取得相機
+        CSI backends (picamera2, libcamera) and USB backends are probed as two groups in parallel,
+        in order within each group; the USB group only opens nodes on the USB bus and may claim
+        the camera only after the CSI group has failed
         """
+        # 沒有任何相機裝置節點時重試也沒用，直接進入模擬模式 / With no camera device nodes at all, retrying cannot help
+        if not glob.glob('/dev/video*') and not glob.glob('/dev/media*'):
+            self._claim_backend("simulation")
+            self.logger.warning("❌ 找不到相機裝置，使用模擬模式 / No camera device found, using simulation mode")
+            return
+        
+        # 硬體只檢測一次，結果傳給兩個 CSI 後端 / Check the hardware once and hand the result to both CSI backends
+        hardware_ok = self._check_camera_hardware()
+        
+        # 共用同一裝置的後端必須依序嘗試，避免互相搶佔 / Backends sharing a device are tried in order so they don't fight over it
+        csi_probes = [lambda: self._try_libcamera_gstreamer_safe(hardware_ok)]
+        if PICAMERA2_AVAILABLE:
+            csi_probes.insert(0, lambda: self._try_picamera2(hardware_ok))
+        usb_probes = [self._try_v4l2_gstreamer, self._try_opencv]
         
         for attempt in range(self.retry_count):
-            self.logger.info(f"相機初始化嘗試 {attempt + 1}/{self.retry_count} / Camera initialization attempt {attempt + 1}/{self.retry_count}")
+            self.logger.info("相機初始化嘗試 %s/%s / Camera initialization attempt %s/%s", attempt + 1, self.retry_count, attempt + 1, self.retry_count)
             
             if attempt > 0:
-                self.logger.info("等待硬體穩定... / Waiting for hardware to stabilize...")
-                time.sleep(3)  # 增加等待時間 / Increase wait time
-            
-            # 方法1: 嘗試 picamera2 (如果可用) - 最穩定 / Method 1: Try picamera2 (if available) - most stable
-            if PICAMERA2_AVAILABLE and self._try_picamera2():
-                self.method_used = "picamera2"
-                self.logger.info("✅ 使用 picamera2 / Using picamera2")
-                return
+                # 指數退避加隨機抖動 / Exponential backoff with jitter
+                delay = min(30, 1.0 * (2 ** attempt)) * (1 + random.uniform(0, 0.5))
+                self.logger.info("等待硬體穩定 %.1f 秒... / Waiting %.1fs for hardware to stabilize...", delay, delay)
+                time.sleep(delay)
             
-            # 方法2: 嘗試 libcamera + GStreamer - 降低超時風險 / Method 2: Try libcamera + GStreamer - reduce timeout risk
-            if self._try_libcamera_gstreamer_safe():
-                self.method_used = "libcamera_gstreamer"
-                self.logger.info("✅ 使用 libcamera + GStreamer (安全模式) / Using libcamera + GStreamer (safe mode)")
-                return
-            
-            # 方法3: 嘗試 V4L2 + GStreamer / Method 3: Try V4L2 + GStreamer
-            if self._try_v4l2_gstreamer():
-                self.method_used = "v4l2_gstreamer"
-                self.logger.info("✅ 使用 V4L2 + GStreamer / Using V4L2 + GStreamer")
-                return
+            self._probe_done.clear()
+            self._csi_settled.clear()
+            executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="CameraProbe")
+            try:
+                futures = [
+                    executor.submit(self._probe_group, csi_probes, self._csi_settled),
+                    executor.submit(self._probe_group, usb_probes),
+                ]
+                for future in as_completed(futures):
+                    if future.result():
+                        break
+            finally:
+                # 停止落後的探測並等待它們釋放裝置，返回時不會有探測仍佔用 /dev/video*
+                # Stop the slower probes and wait for them to release their devices, so none still holds /dev/video* after we return
+                self._probe_done.set()
+                executor.shutdown(wait=True)
             
-            # 方法4: 嘗試 OpenCV / Method 4: Try OpenCV
-            if self._try_opencv():
-                self.method_used = "opencv"
-                self.logger.info("✅ 使用 OpenCV / Using OpenCV")
+            if self.method_used != "none":
+                self.logger.info("✅ 使用 %s / Using %s", self.method_used, self.method_used)
                 return
                 
-            self.logger.warning(f"第 {attempt + 1} 次嘗試失敗 / Attempt {attempt + 1} failed")
+            self.logger.warning("第 %s 次嘗試失敗 / Attempt %s failed", attempt + 1, attempt + 1)
         
         # 所有方法都失敗，使用模擬模式 / All methods failed, use simulation mode
-        self.method_used = "simulation"
+        self._claim_backend("simulation")
         self.logger.warning("❌ 所有相機方法都失敗，使用模擬模式 / All camera methods failed, using simulation mode")
     
+    def _probe_group(self, probes, finished=None):
+        """
+        依序嘗試一組共用裝置的後端 / Try a group of device-sharing backends in order
+        
+        Args:
+            probes: 探測函數列表 / List of probe functions
+            finished: 本組結束時設定的事件（若有）/ Event set when this group is done, if any
+            
+        Returns:
+            bool: 本組是否取得相機 / Whether this group claimed the camera
+        """
+        try:
+            for probe in probes:
+                if self._probe_done.is_set():
+                    return False
+                try:
+                    if probe():
+                        return True
+                except Exception as e:
+                    self.logger.warning("相機探測錯誤: %s / Camera probe error: %s", e, e)
+            return False
+        finally:
+            if finished is not None:
+                finished.set()
+    
+    def _claim_usb_backend(self, method, cap):
+        """
+        USB 後端測試成功後，等 CSI 組結束再登記，CSI 相機優先 / After a USB backend passes its test, wait for the CSI group before registering, so a CSI camera takes priority
+        
+        Args:
+            method: 後端名稱 / Backend name
+            cap: OpenCV VideoCapture
+            
+        Returns:
+            bool: 是否取得相機；失敗時呼叫者須釋放自己的裝置 / Whether the camera was claimed; on False the caller must release its device
+        """
+        self._csi_settled.wait()
+        return self._claim_backend(method, cap)
+    
+    def _usb_video_nodes(self, limit=2):
+        """
+        列出 USB 匯流排上的 /dev/video* 節點，略過 libcamera 使用的 CSI/ISP 節點 / List /dev/video* nodes on the USB bus, skipping the CSI/ISP nodes libcamera owns
+        
+        Args:
+            limit: 最多返回的節點數 / Maximum number of nodes to return
+            
+        Returns:
+            list: 裝置節點路徑 / Device node paths
+        """
+        sysfs = '/sys/class/video4linux'
+        if not os.path.isdir(sysfs):
+            # 沒有 sysfs 資訊時無法分辨，退回前兩個節點 / Without sysfs we cannot tell them apart, fall back to the first two nodes
+            return ['/dev/video0', '/dev/video1'][:limit]
+        nodes = []
+        for name in sorted(os.listdir(sysfs), key=lambda n: int(n[5:]) if n[5:].isdigit() else 1 << 30):
+            if not name.startswith('video'):
+                continue
+            device = os.path.realpath(os.path.join(sysfs, name, 'device'))
+            if '/usb' in device:
+                nodes.append(os.path.join('/dev', name))
+                if len(nodes) >= limit:
+                    break
+        return nodes
+    
+    def _claim_backend(self, method, cap=None):
+        """
+        登記成功的相機後端，只有第一個呼叫者成功 / Register a working backend, only the first caller wins
+        
+        Args:
+            method: 後端名稱 / Backend name
+            cap: OpenCV VideoCapture（若有）/ OpenCV VideoCapture, if any
+            
+        Returns:
+            bool: 是否取得相機；失敗時呼叫者須釋放自己的裝置 / Whether the camera was claimed; on False the caller must release its device
+        """
+        with self._claim_lock:
+            if self.method_used != "none":
+                return False
+            self.method_used = method
+            if cap is not None:
+                self.cap = cap
+            # 依後端綁定讀取函數，每幀不再比較字串 / Bind the backend's read function once instead of comparing strings every frame
+            self._read_frame = {
+                'picamera2': self._read_frame_picam2,
+                'simulation': self._get_simulated_frame,
+            }.get(method, self._read_frame_cv)
+            self._probe_done.set()
+            return True
+    
+    def _probe_cap(self, cap, need=2, timeout=2.0, poll=0.05):
+        """
+        測試 VideoCapture 是否穩定出圖 / Test whether a VideoCapture delivers frames reliably
+        
+        在期限內反覆讀取，一旦串流開始就立即返回，不必固定等待最壞情況
+        Reads repeatedly until the deadline and returns as soon as the stream is flowing, instead of always waiting out the worst case
+        
+        Args:
+            cap: OpenCV VideoCapture
+            need: 需要成功的次數 / Number of reads that must succeed
+            timeout: 最長等待秒數 / Maximum seconds to wait
+            poll: 失敗讀取之間的間隔 / Pause between failed reads
+            
+        Returns:
+            bool: 是否通過測試 / Whether the test passed
+        """
+        success_count = 0
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            ret, frame = cap.read()
+            if ret and frame is not None and frame.size > 0:
+                success_count += 1
+                if success_count >= need:
+                    return True
+            else:
+                time.sleep(poll)
+        return False
+    
     def _check_camera_hardware(self):
         """
         檢查相機硬體連線（增強版）/ Check camera hardware connection (enhanced version)
         
+        結果會快取 hw_check_ttl 秒，期間內的呼叫不再啟動子行程
+        The result is cached for hw_check_ttl seconds; calls within that window spawn no subprocess
+        
         Returns:
             bool: 硬體是否正常 / Whether hardware is normal
         """
+        if self.libcamera_tools_missing:
+            return False
+        
+        if self._hw_check_cache is not None and time.monotonic() - self._hw_check_ts < self.hw_check_ttl:
+            return self._hw_check_cache
+        
+        result = self._run_hardware_check()
+        self._hw_check_cache = result
+        self._hw_check_ts = time.monotonic()
+        return result
+    
+    def _run_hardware_check(self):
+        """
+        執行 libcamera-hello --list-cameras / Run libcamera-hello --list-cameras
+        
+        Returns:
+            bool: 是否偵測到 imx708 / Whether an imx708 was detected
+        """
         try:
             # 使用更短的超時時間，避免長時間阻塞 / Use shorter timeout to avoid long blocking
-            result = subprocess.run(
-                ['libcamera-hello', '--list-cameras'], 
-                capture_output=True, text=True, timeout=3
+            proc = subprocess.Popen(
+                ['libcamera-hello', '--list-cameras'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
             )
+            try:
+                stdout, _ = proc.communicate(timeout=1.5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                raise
             
-            if result.returncode == 0 and 'imx708' in result.stdout:
+            if proc.returncode == 0 and 'imx708' in stdout:
                 self.logger.info("相機硬體檢測正常 / Camera hardware detection normal")
                 return True
             else:
@@ -120,14 +354,22 @@ class Camera:
         except subprocess.TimeoutExpired:
             self.logger.warning("硬體檢測超時 / Hardware detection timeout")
             return False
+        except FileNotFoundError:
+            # 工具未安裝屬於不可恢復的錯誤 / A missing tool is not recoverable
+            self.libcamera_tools_missing = True
+            self.logger.warning("找不到 libcamera-hello，之後不再檢測 / libcamera-hello not found, skipping further checks")
+            return False
         except Exception as e:
-            self.logger.warning(f"硬體檢測失敗: {e} / Hardware detection failed: {e}")
+            self.logger.warning("硬體檢測失敗: %s / Hardware detection failed: %s", e, e)
             return False
     
-    def _try_picamera2(self):
+    def _try_picamera2(self, hardware_ok=None):
         """
         嘗試使用 picamera2（增強版，處理超時）/ Try using picamera2 (enhanced version, handles timeout)
         
+        Args:
+            hardware_ok: 已完成的硬體檢測結果，None 表示自行檢測 / Result of an earlier hardware check, None to check here
+            
         Returns:
             bool: 是否成功 / Whether successful
         """
@@ -135,15 +377,19 @@ class Camera:
             self.logger.info("嘗試 picamera2... / Trying picamera2...")
             
             # 檢查硬體（但不強制要求）/ Check hardware (but not mandatory)
-            hardware_ok = self._check_camera_hardware()
+            if hardware_ok is None:
+                hardware_ok = self._check_camera_hardware()
             if not hardware_ok:
                 self.logger.warning("硬體檢測異常，但仍嘗試 picamera2 / Hardware detection abnormal, but still trying picamera2")
             
             self.picam2 = Picamera2()
             
             # 使用更保守的配置 / Use more conservative configuration
+            # buffer_count=2：只保留最新影格，避免讀到過時畫面 / buffer_count=2: keep only the freshest frames to avoid stale reads
+            # "RGB888" 在 picamera2 中的記憶體順序是 B,G,R，即 OpenCV 的 BGR，由 ISP 直接輸出目標尺寸 / picamera2's "RGB888" is laid out B,G,R in memory (OpenCV BGR), scaled to the target size by the ISP
             preview_config = self.picam2.create_preview_configuration(
-                main={"size": (self.config.frame_width, self.config.frame_height)}
+                main={"size": (self.config.frame_width, self.config.frame_height), "format": "RGB888"},
+                buffer_count=2
             )
             self.picam2.configure(preview_config)
             
@@ -159,47 +405,58 @@ class Camera:
                     frame = self.picam2.capture_array()
                     if frame is not None and frame.size > 0:
                         self.logger.info("picamera2 測試成功 / picamera2 test successful")
-                        return True
+                        if self._claim_backend("picamera2"):
+                            return True
+                        break  # 其他後端已先成功 / Another backend already won
                 except Exception as e:
-                    self.logger.warning(f"picamera2 測試 {test+1} 失敗: {e} / picamera2 test {test+1} failed: {e}")
+                    self.logger.warning("picamera2 測試 %s 失敗: %s / picamera2 test %s failed: %s", test+1, e, test+1, e)
                 time.sleep(1)
             
-            # 測試失敗，清理資源 / Test failed, clean up resources
+            # 測試失敗或其他後端已成功，關閉相機以釋放裝置 / Test failed or another backend won, close the camera to release the device
             self.picam2.stop()
+            self.picam2.close()
             self.picam2 = None
             return False
             
         except Exception as e:
-            self.logger.warning(f"picamera2 初始化失敗: {e} / picamera2 initialization failed: {e}")
+            self.logger.warning("picamera2 初始化失敗: %s / picamera2 initialization failed: %s", e, e)
             if self.picam2:
                 try:
                     self.picam2.stop()
+                    self.picam2.close()
                 except:
                     pass
                 self.picam2 = None
             return False
     
-    def _try_libcamera_gstreamer_safe(self):
+    def _try_libcamera_gstreamer_safe(self, hardware_ok=None):
         """
         嘗試安全的 libcamera + GStreamer 配置 / Try safe libcamera + GStreamer configuration
         
+        Args:
+            hardware_ok: 已完成的硬體檢測結果，None 表示自行檢測 / Result of an earlier hardware check, None to check here
+            
         Returns:
             bool: 是否成功 / Whether successful
         """
         
         # 不強制要求硬體檢測通過 / Don't require hardware detection to pass
-        hardware_ok = self._check_camera_hardware()
+        if hardware_ok is None:
+            hardware_ok = self._check_camera_hardware()
         if not hardware_ok:
             self.logger.warning("硬體檢測異常，跳過 GStreamer / Hardware detection abnormal, skipping GStreamer")
             return False
         
         # 使用最簡單的配置，減少超時風險 / Use simplest configuration to reduce timeout risk
+        # 目標尺寸與 BGR 格式寫進 caps，影格送到 Python 時已可直接使用 / Target size and BGR format are baked into the caps, so frames arrive ready to use
+        width, height = self.config.frame_width, self.config.frame_height
         pipelines = [
             # 最簡配置，最少的處理 / Simplest configuration, minimal processing
             (
                 "libcamerasrc ! "
-                "video/x-raw,width=640,height=480,framerate=10/1 ! "
+                f"video/x-raw,width={width},height={height},framerate=10/1 ! "
                 "videoconvert ! "
+                "video/x-raw,format=BGR ! "
                 "appsink max-buffers=1 drop=true sync=false emit-signals=false"
             ),
             # 備用配置 / Backup configuration
@@ -207,40 +464,35 @@ class Camera:
                 "libcamerasrc ! "
                 "videoconvert ! "
                 "videoscale ! "
-                "video/x-raw,width=320,height=240 ! "
+                f"video/x-raw,format=BGR,width={width},height={height} ! "
                 "appsink max-buffers=1 drop=true"
             )
         ]
         
         for i, pipeline in enumerate(pipelines):
             try:
-                self.logger.info(f"嘗試安全 libcamera pipeline {i+1}/{len(pipelines)}... / Trying safe libcamera pipeline {i+1}/{len(pipelines)}...")
+                self.logger.info("嘗試安全 libcamera pipeline %s/%s... / Trying safe libcamera pipeline %s/%s...", i+1, len(pipelines), i+1, len(pipelines))
                 cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
                 
                 if cap.isOpened():
-                    # 給相機時間初始化，但不要太長 / Give camera time to initialize, but not too long
-                    time.sleep(1.5)
-                    
-                    # 快速測試，不要過度測試 / Quick test, don't over-test
-                    success_count = 0
-                    for test in range(3):  # 減少測試次數 / Reduce test count
-                        ret, frame = cap.read()
-                        if ret and frame is not None and frame.size > 0:
-                            success_count += 1
-                        time.sleep(0.2)
+                    # 只緩衝一幀，避免延遲 / Buffer only one frame to avoid latency
+                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                     
-                    if success_count >= 2:  # 至少 2 次成功 / At least 2 successful
-                        self.cap = cap
-                        self.logger.info(f"libcamera pipeline {i+1} 成功 / libcamera pipeline {i+1} successful")
-                        return True
+                    # 串流一開始出圖就通過，最多等 2 秒 / Pass as soon as the stream delivers frames, waiting at most 2 s
+                    if self._probe_cap(cap):
+                        self.logger.info("libcamera pipeline %s 成功 / libcamera pipeline %s successful", i+1, i+1)
+                        if self._claim_backend("libcamera_gstreamer", cap):
+                            return True
+                        cap.release()  # 其他後端已先成功 / Another backend already won
+                        return False
                     else:
                         cap.release()
-                        self.logger.warning(f"libcamera pipeline {i+1} 測試失敗 / libcamera pipeline {i+1} test failed")
+                        self.logger.warning("libcamera pipeline %s 測試失敗 / libcamera pipeline %s test failed", i+1, i+1)
                 else:
-                    self.logger.warning(f"libcamera pipeline {i+1} 無法開啟 / libcamera pipeline {i+1} cannot open")
+                    self.logger.warning("libcamera pipeline %s 無法開啟 / libcamera pipeline %s cannot open", i+1, i+1)
                     
             except Exception as e:
-                self.logger.warning(f"libcamera pipeline {i+1} 錯誤: {e} / libcamera pipeline {i+1} error: {e}")
+                self.logger.warning("libcamera pipeline %s 錯誤: %s / libcamera pipeline %s error: %s", i+1, e, i+1, e)
                 if cap:
                     cap.release()
         
@@ -253,44 +505,50 @@ class Camera:
         Returns:
             bool: 是否成功 / Whether successful
         """
-        v4l_devices = ['/dev/video0', '/dev/video1']  # 減少測試設備 / Reduce test devices
+        v4l_devices = self._usb_video_nodes()  # 只測試 USB 節點，不與 libcamera 搶 CSI / Only USB nodes, so we never fight libcamera for the CSI sensor
+        
+        # 優先要求 MJPEG：相機端壓縮，USB 頻寬約少 5 倍，由 jpegdec (libjpeg-turbo) 解碼；不支援時退回原始格式
+        # Prefer MJPEG: compressed by the camera, ~5x less USB bandwidth, decoded by jpegdec (libjpeg-turbo); fall back to raw when unsupported
+        sources = [
+            ("MJPEG", "image/jpeg,framerate=10/1 ! jpegdec"),
+            ("raw", "video/x-raw,framerate=10/1"),
+        ]
         
         for device in v4l_devices:
             if not os.path.exists(device):
                 continue
-                
-            try:
-                self.logger.info(f"嘗試 V4L2 設備: {device} / Trying V4L2 device: {device}")
-                
-                # 使用較低的解析度和幀率 / Use lower resolution and frame rate
-                pipeline = (
-                    f"v4l2src device={device} ! "
-                    "video/x-raw,width=640,height=480,framerate=10/1 ! "
-                    "videoconvert ! "
-                    "appsink max-buffers=1 drop=true"
-                )
-                
-                cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
-                
-                if cap.isOpened():
-                    time.sleep(0.5)
+            
+            for source_name, source_caps in sources:
+                try:
+                    self.logger.info("嘗試 V4L2 設備: %s (%s) / Trying V4L2 device: %s (%s)", device, source_name, device, source_name)
                     
-                    success_count = 0
-                    for test in range(3):  # 減少測試次數 / Reduce test count
-                        ret, frame = cap.read()
-                        if ret and frame is not None and frame.size > 0:
-                            success_count += 1
-                        time.sleep(0.2)
+                    # 使用較低的幀率，縮放與轉色在 pipeline 中完成 / Use a lower frame rate; scaling and color conversion happen in the pipeline
+                    pipeline = (
+                        f"v4l2src device={device} ! "
+                        f"{source_caps} ! "
+                        "videoconvert ! "
+                        "videoscale ! "
+                        f"video/x-raw,format=BGR,width={self.config.frame_width},height={self.config.frame_height} ! "
+                        "appsink max-buffers=1 drop=true"
+                    )
                     
-                    if success_count >= 2:
-                        self.cap = cap
-                        self.logger.info(f"V4L2 {device} 成功 / V4L2 {device} successful")
-                        return True
-                    else:
-                        cap.release()
+                    cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+                    
+                    if cap.isOpened():
+                        # 只緩衝一幀，避免延遲 / Buffer only one frame to avoid latency
+                        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                         
-            except Exception as e:
-                self.logger.warning(f"V4L2 {device} 異常: {e} / V4L2 {device} error: {e}")
+                        if self._probe_cap(cap):
+                            self.logger.info("V4L2 %s (%s) 成功 / V4L2 %s (%s) successful", device, source_name, device, source_name)
+                            if self._claim_usb_backend("v4l2_gstreamer", cap):
+                                return True
+                            cap.release()  # 其他後端已先成功 / Another backend already won
+                            return False
+                        else:
+                            cap.release()
+                            
+                except Exception as e:
+                    self.logger.warning("V4L2 %s (%s) 異常: %s / V4L2 %s (%s) error: %s", device, source_name, e, device, source_name, e)
         
         return False
     
@@ -301,19 +559,24 @@ class Camera:
         Returns:
             bool: 是否成功 / Whether successful
         """
-        camera_indices = [0, 1]  # 減少測試索引 / Reduce test indices
+        # 只測試 USB 節點的索引，不與 libcamera 搶 CSI / Only indices of USB nodes, so we never fight libcamera for the CSI sensor
+        camera_indices = [int(node[len('/dev/video'):]) for node in self._usb_video_nodes()]
         
         for index in camera_indices:
             try:
-                self.logger.info(f"嘗試 OpenCV 索引 {index}... / Trying OpenCV index {index}...")
+                self.logger.info("嘗試 OpenCV 索引 %s... / Trying OpenCV index %s...", index, index)
                 cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
                 
                 if cap.isOpened():
+                    # 只緩衝一幀，必須在第一次 read() 前設定 / Buffer only one frame, must be set before the first read()
+                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                    # 要求 MJPG，USB 傳輸的是壓縮影格 / Request MJPG so frames cross USB compressed
+                    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+                    
                     # 設置較低的參數 / Set lower parameters
                     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
                     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                     cap.set(cv2.CAP_PROP_FPS, 10)
-                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                     
                     time.sleep(1)
                     
@@ -322,110 +585,190 @@ class Camera:
                         cap.read()
                     
                     # 簡化測試 / Simplified test
-                    success_count = 0
-                    for test in range(3):
-                        ret, frame = cap.read()
-                        if ret and frame is not None and frame.size > 0:
-                            success_count += 1
-                        time.sleep(0.2)
-                    
-                    if success_count >= 2:
-                        self.cap = cap
-                        self.logger.info(f"OpenCV 索引 {index} 成功 / OpenCV index {index} successful")
-                        return True
+                    if self._probe_cap(cap):
+                        self.logger.info("OpenCV 索引 %s 成功 / OpenCV index %s successful", index, index)
+                        if self._claim_usb_backend("opencv", cap):
+                            return True
+                        cap.release()  # 其他後端已先成功 / Another backend already won
+                        return False
                     else:
                         cap.release()
                         
             except Exception as e:
-                self.logger.warning(f"OpenCV 索引 {index} 異常: {e} / OpenCV index {index} error: {e}")
+                self.logger.warning("OpenCV 索引 %s 異常: %s / OpenCV index %s error: %s", index, e, index, e)
         
         return False
 
+    def _capture_loop(self):
+        """
+        背景擷取迴圈 / Background capture loop
+        """
+        frame_cond = self._frame_cond
+        min_interval = self.capture_min_interval
+        bufs = self._bufs
+        ring_size = len(bufs)
+        idx = 0
+        while not self._capture_stop.is_set():
+            started = time.monotonic()
+            try:
+                frame = self.read_frame(out=bufs[idx])
+                idx = (idx + 1) % ring_size
+            except Exception as e:
+                self.logger.warning("擷取執行緒錯誤: %s / Capture thread error: %s", e, e)
+                frame = None
+            if frame is not None:
+                with frame_cond:
+                    self._latest = frame
+                    self._seq += 1
+                    frame_cond.notify_all()
+            
+            # 真實相機的 read() 會自行阻塞；模擬畫面需要節流 / Real camera reads block on their own; simulated frames need throttling
+            remaining = min_interval - (time.monotonic() - started)
+            if remaining > 0:
+                self._capture_stop.wait(remaining)
+    
     def get_frame(self):
         """
-        獲取一幀圖像（增強錯誤處理）/ Get a frame (enhanced error handling)
+        獲取最新影格（不阻塞）/ Get the latest frame (non-blocking)
         
         Returns:
-            numpy.ndarray: 圖像幀 / Image frame
+            numpy.ndarray: 最新影格；背景執行緒尚未擷取時直接讀取一幀 / Latest frame; reads one directly if the capture thread has produced nothing yet
         """
-        current_time = time.time()
+        frame = self._latest
+        if frame is None:
+            return self.read_frame()
+        return frame
+    
+    def wait_frame(self, timeout=1.0):
+        """
+        等待下一幀新影格 / Wait for the next new frame
         
-        # 如果在錯誤冷卻期內，返回模擬畫面 / If in error cooldown period, return simulated frame
-        if current_time - self.last_error_time < self.error_cooldown:
-            if self.method_used != "simulation":
-                return self._get_simulated_frame()
+        Args:
+            timeout: 最長等待秒數 / Maximum seconds to wait
+            
+        Returns:
+            numpy.ndarray: 新影格，逾時則為 None / New frame, None on timeout
+        """
+        with self._frame_cond:
+            seq = self._seq
+            if self._frame_cond.wait_for(lambda: self._seq != seq or self._capture_stop.is_set(), timeout):
+                return self._latest
+        return None
+    
+    def read_frame(self, out=None):
+        """
+        直接從相機讀取一幀（會等待相機 I/O）/ Read a frame straight from the camera (waits on camera I/O)
         
-        if self.method_used == "simulation":
-            return self._get_simulated_frame()
+        Args:
+            out: 可選的預先配置緩衝區 (H, W, 3) uint8，真實相機影格會直接寫入 / Optional preallocated (H, W, 3) uint8 buffer that real camera frames are written into
+            
+        Returns:
+            numpy.ndarray: 圖像幀（尺寸相符時就是 out，否則為新陣列）/ Image frame (out itself when the shape matches, otherwise a new array)
+            
+        未提供 out 且需要縮放時，回傳的是共用的內部緩衝區，下次讀取會被覆寫；呼叫者應視為唯讀，需保存時自行複製
+        Without out, a frame that needed resizing is returned in a shared internal buffer that the next read
+        overwrites; callers must treat it as read-only and copy it if they keep it
+        """
+        with self._lock:
+            return self._read_frame(out)
+    
+    def _read_frame_picam2(self, out=None):
+        """
+        從 picamera2 讀取一幀 / Read a frame from picamera2
         
-        if self.method_used == "picamera2":
-            try:
-                if self.picam2:
-                    # 捕捉 RGB 格式的影格 / Capture frame in RGB format
-                    frame = self.picam2.capture_array()
-                    # 轉換為 BGR (OpenCV 格式) / Convert to BGR (OpenCV format)
-                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    
-                    # 調整到目標解析度 / Resize to target resolution
-                    if frame.shape[:2] != (self.config.frame_height, self.config.frame_width):
-                        frame = cv2.resize(frame, (self.config.frame_width, self.config.frame_height))
-                    
-                    return frame
-            except Exception as e:
-                self.logger.error(f"使用 picamera2 獲取影格失敗: {e} / Failed to get frame using picamera2: {e}")
-                self.last_error_time = current_time
-                # 不立即重新初始化，避免累積錯誤 / Don't reinitialize immediately to avoid cumulative errors
-                return self._get_simulated_frame()
+        Args:
+            out: 可選的預先配置緩衝區 / Optional preallocated buffer
+            
+        Returns:
+            numpy.ndarray: 圖像幀 / Image frame
+        """
+        # 冷卻期內返回模擬畫面 / In the error cooldown period, return simulated frame
+        if time.monotonic() < self._cooldown_until or not self.picam2:
+            return self._get_simulated_frame(out)
         
-        else:
-            # 使用 OpenCV/GStreamer / Use OpenCV/GStreamer
-            if not self.cap or not self.cap.isOpened():
-                self.logger.warning("相機連接中斷 / Camera connection interrupted")
-                self.last_error_time = current_time
-                return self._get_simulated_frame()
+        try:
+            # 相機已輸出目標尺寸的 BGR 影格，不需再轉色或縮放 / The camera already delivers BGR at the target size, no conversion or resize needed
+            # 直接映射 DMA 緩衝區，只複製一次到輸出緩衝區後立即歸還請求 / Map the DMA buffer directly, copy once into the output buffer, then hand the request back
+            with self.picam2.captured_request() as request:
+                with MappedArray(request, 'main') as mapped:
+                    frame = mapped.array
+                    if out is not None and out.shape == frame.shape:
+                        np.copyto(out, frame)
+                        return out
+                    return frame.copy()
+        except Exception as e:
+            self.logger.error("使用 picamera2 獲取影格失敗: %s / Failed to get frame using picamera2: %s", e, e)
+            self._cooldown_until = time.monotonic() + self.error_cooldown
+            # 不立即重新初始化，避免累積錯誤 / Don't reinitialize immediately to avoid cumulative errors
+            return self._get_simulated_frame(out)
+    
+    def _read_frame_cv(self, out=None):
+        """
+        從 OpenCV/GStreamer 讀取一幀 / Read a frame from OpenCV/GStreamer
+        
+        Args:
+            out: 可選的預先配置緩衝區 / Optional preallocated buffer
             
-            try:
-                # 清除緩存但不要太頻繁 / Clear cache but not too frequently
-                if hasattr(self.cap, 'grab'):
-                    self.cap.grab()
+        Returns:
+            numpy.ndarray: 圖像幀 / Image frame
+        """
+        # 冷卻期內返回模擬畫面 / In the error cooldown period, return simulated frame
+        if time.monotonic() < self._cooldown_until:
+            return self._get_simulated_frame(out)
+        
+        if not self.cap or not self.cap.isOpened():
+            self.logger.warning("相機連接中斷 / Camera connection interrupted")
+            self._cooldown_until = time.monotonic() + self.error_cooldown
+            return self._get_simulated_frame(out)
+        
+        try:
+            # appsink drop=true max-buffers=1 與 CAP_PROP_BUFFERSIZE=1 已保證只留最新一幀，單次 read() 即可 / appsink drop=true max-buffers=1 and CAP_PROP_BUFFERSIZE=1 already keep only the freshest frame, so a single read() suffices
+            # 影格尺寸已在初始化測試中驗證，這裡不再檢查 / Frame size was validated by the init probe, not rechecked here
+            ret, frame = self.cap.read(out)
+            if ret and frame is not None:
+                # GStreamer caps 已指定尺寸；僅在相機不支援時（如 OpenCV 後端）才縮放 / GStreamer caps already fix the size; resize only when the device cannot (e.g. the OpenCV backend)
+                target_height, target_width = self.config.frame_height, self.config.frame_width
+                if frame.shape[:2] != (target_height, target_width):
+                    dst = out if out is not None and out.shape == self._frame_out.shape else self._frame_out
+                    frame = cv2.resize(frame, (target_width, target_height), dst=dst, interpolation=cv2.INTER_AREA)
+                return frame
+            else:
+                self._cooldown_until = time.monotonic() + self.error_cooldown
+                return self._get_simulated_frame(out)
                 
-                ret, frame = self.cap.read()
-                if ret and frame is not None and frame.size > 0:
-                    # 調整解析度 / Resize resolution
-                    target_height, target_width = self.config.frame_height, self.config.frame_width
-                    if frame.shape[:2] != (target_height, target_width):
-                        frame = cv2.resize(frame, (target_width, target_height))
-                    return frame
-                else:
-                    self.last_error_time = current_time
-                    return self._get_simulated_frame()
-                    
-            except Exception as e:
-                self.logger.warning(f"get_frame 異常: {e} / get_frame error: {e}")
-                self.last_error_time = current_time
-                return self._get_simulated_frame()
+        except Exception as e:
+            self.logger.warning("get_frame 異常: %s / get_frame error: %s", e, e)
+            self._cooldown_until = time.monotonic() + self.error_cooldown
+            return self._get_simulated_frame(out)
     
-    def _get_simulated_frame(self):
+    def _get_simulated_frame(self, out=None):
         """
         生成模擬畫面（改善版）/ Generate simulated frame (improved version)
         
+        Args:
+            out: 可選的預先配置緩衝區 / Optional preallocated buffer
+            
         Returns:
             numpy.ndarray: 模擬圖像 / Simulated image
         """
-        frame = np.ones((self.config.frame_height, self.config.frame_width, 3), dtype=np.uint8) * 50
+        # 從預先繪製的背景複製，只重畫動態元素 / Copy from the prerendered background and redraw only the dynamic elements
+        if out is not None and out.shape == self._sim_bg.shape:
+            frame = out
+            np.copyto(frame, self._sim_bg)
+        else:
+            frame = self._sim_bg.copy()
         
         # 動態元素 / Dynamic elements
         current_time = time.time()
-        x = int((np.sin(current_time) + 1) * self.config.frame_width / 4) + self.config.frame_width // 4
-        y = int((np.cos(current_time) + 1) * self.config.frame_height / 4) + self.config.frame_height // 4
+        # 純量三角函數用 math，避免 numpy ufunc 的分派成本 / Scalar trig via math to skip numpy ufunc dispatch
+        x = int((math.sin(current_time) + 1) * self.config.frame_width / 4) + self.config.frame_width // 4
+        y = int((math.cos(current_time) + 1) * self.config.frame_height / 4) + self.config.frame_height // 4
         
         cv2.circle(frame, (x, y), 20, (100, 150, 200), -1)
-        cv2.putText(frame, "Camera Simulation", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(frame, "Timeout recovery mode", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
         
         # 顯示冷卻時間
-        if self.last_error_time > 0:
-            remaining = max(0, self.error_cooldown - (current_time - self.last_error_time))
+        if self._cooldown_until > 0:
+            remaining = self._cooldown_until - time.monotonic()
             if remaining > 0:
                 cv2.putText(frame, f"Cooldown: {remaining:.1f}s", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 100, 100), 1)
             else:
@@ -435,40 +778,44 @@ class Camera:
 
     def capture_photo(self):
         """捕捉照片（增強版）"""
+        with self._lock:
+            return self._capture_photo()
+    
+    def _capture_photo(self):
+        """在持有相機鎖的情況下捕捉照片"""
         if self.method_used == "simulation":
             frame = self._get_simulated_frame()
             cv2.putText(frame, "PHOTO CAPTURED", (50, 120), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
             return frame
         
-        # 優先嘗試 libcamera-still 高質量拍照
-        photo = self._try_libcamera_still()
-        if photo is not None:
-            return photo
+        # picamera2 已開啟時直接在記憶體中拍攝靜態照片，不需外部程序與 JPEG 往返 / With picamera2 open, capture the still in memory without a subprocess or JPEG round-trip
+        if self.method_used == "picamera2" and self.picam2:
+            try:
+                # picamera2 高解析度拍照（RGB888 即 BGR 記憶體順序）
+                still_config = self.picam2.create_still_configuration(
+                    main={"size": (1920, 1080), "format": "RGB888"}
+                )
+                frame = self.picam2.switch_mode_and_capture_array(still_config, "main")
+                self.logger.info("picamera2 高解析度拍照成功")
+                return frame
+            except Exception as e:
+                self.logger.error("picamera2 拍照失敗: %s", e)
+        else:
+            # 沒有 picamera2 時才使用 libcamera-still 高質量拍照
+            photo = self._try_libcamera_still()
+            if photo is not None:
+                return photo
         
         # 回退到串流拍照
         self.logger.info("使用串流模式拍照...")
         
-        if self.method_used == "picamera2":
-            try:
-                if self.picam2:
-                    # picamera2 高解析度拍照
-                    still_config = self.picam2.create_still_configuration(
-                        main={"size": (1920, 1080)}
-                    )
-                    self.picam2.switch_mode_and_capture_image(still_config)
-                    frame = self.picam2.capture_array()
-                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    self.logger.info("picamera2 高解析度拍照成功")
-                    return frame
-            except Exception as e:
-                self.logger.error(f"picamera2 拍照失敗: {e}")
-        
         # 使用串流獲取最佳幀
         best_frame = None
         for attempt in range(3):  # 減少嘗試次數
-            frame = self.get_frame()
+            frame = self._read_frame()
             if frame is not None:
-                best_frame = frame
+                # 共用縮放緩衝區會被下一次讀取覆寫 / The shared resize buffer is overwritten by the next read
+                best_frame = frame.copy() if frame is self._frame_out else frame
                 break
             time.sleep(0.2)
         
@@ -479,6 +826,9 @@ class Camera:
     
     def _try_libcamera_still(self):
         """使用 libcamera-still 拍攝高質量照片（優化版）"""
+        if self.libcamera_tools_missing:
+            return None
+        
         try:
             with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
                 cmd = [
@@ -504,15 +854,18 @@ class Camera:
                         self.logger.info("libcamera-still 拍攝成功")
                         return photo
                 else:
-                    self.logger.warning(f"libcamera-still 失敗: {result.stderr}")
+                    self.logger.warning("libcamera-still 失敗: %s", result.stderr)
                 
                 if os.path.exists(tmp_file.name):
                     os.unlink(tmp_file.name)
                     
         except subprocess.TimeoutExpired:
             self.logger.warning("libcamera-still 超時")
+        except FileNotFoundError:
+            self.libcamera_tools_missing = True
+            self.logger.warning("找不到 libcamera-still，之後不再嘗試")
         except Exception as e:
-            self.logger.warning(f"libcamera-still 異常: {e}")
+            self.logger.warning("libcamera-still 異常: %s", e)
         
         return None
 
@@ -526,29 +879,77 @@ class Camera:
         photo_path = os.path.join(self.config.photo_dir, f"photo_{timestamp}.jpg")
         
         try:
-            success = cv2.imwrite(photo_path, photo, [
-                cv2.IMWRITE_JPEG_QUALITY, 95,
-                cv2.IMWRITE_JPEG_OPTIMIZE, 1
-            ])
-            if success:
-                self.logger.info(f"照片已儲存: {photo_path}")
-                return photo_path
+            # 先在記憶體中編碼 / Encode in memory first
+            # 不使用 JPEG_OPTIMIZE：第二次 Huffman 掃描約使編碼時間加倍，檔案只小不到 5% / No JPEG_OPTIMIZE: the second Huffman pass roughly doubles encode time for <5% smaller files
+            if self._tj is not None:
+                jpeg_bytes = self._tj.encode(photo, quality=95)
             else:
-                self.logger.error("照片儲存失敗")
+                success, buf = cv2.imencode('.jpg', photo, [cv2.IMWRITE_JPEG_QUALITY, 95])
+                if not success:
+                    self.logger.error("照片儲存失敗")
+                    return None
+                jpeg_bytes = buf.tobytes()
+            
+            self._write_atomic(photo_path, jpeg_bytes)
+            self.logger.info("照片已儲存: %s", photo_path)
+            return photo_path
         except Exception as e:
-            self.logger.error(f"儲存照片錯誤: {e}")
+            self.logger.error("儲存照片錯誤: %s", e)
         
         return None
+    
+    def _write_atomic(self, path, data):
+        """
+        原子寫入檔案：寫入同目錄暫存檔、fsync 後再改名 / Write a file atomically: temp file in the same directory, fsync, then rename
+        
+        讀取者只會看到完整的舊檔或新檔，不會讀到寫到一半的 JPEG
+        Readers see either nothing or the complete file, never a half-written JPEG
+        
+        Args:
+            path: 目標路徑 / Destination path
+            data: 檔案內容 / File contents
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.photo_', suffix='.tmp')
+        try:
+            try:
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+                os.fchmod(fd, PHOTO_FILE_MODE)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
 
     def release(self):
         """釋放相機資源"""
+        # 先停止擷取執行緒，再釋放硬體 / Stop the capture thread before releasing the hardware
+        self._capture_stop.set()
+        with self._frame_cond:
+            self._frame_cond.notify_all()
+        if self._capture_thread.is_alive():
+            self._capture_thread.join(timeout=2)
+        self.logger.info("相機擷取執行緒已停止 / Camera capture thread stopped")
+        
+        with self._lock:
+            self._release()
+    
+    def _release(self):
+        """在持有相機鎖的情況下釋放資源"""
         if self.method_used == "picamera2" and self.picam2:
             try:
                 self.picam2.stop()
                 self.picam2 = None
                 self.logger.info("picamera2 資源已釋放")
             except Exception as e:
-                self.logger.error(f"picamera2 釋放失敗: {e}")
+                self.logger.error("picamera2 釋放失敗: %s", e)
         
         if self.cap:
             try:
@@ -556,9 +957,9 @@ class Camera:
                 self.cap = None
                 self.logger.info("OpenCV 相機資源已釋放")
             except Exception as e:
-                self.logger.error(f"OpenCV 相機釋放失敗: {e}")
+                self.logger.error("OpenCV 相機釋放失敗: %s", e)
         
-        self.logger.info(f"相機資源已釋放 (方法: {self.method_used})")
+        self.logger.info("相機資源已釋放 (方法: %s)", self.method_used)
     
     def get_camera_info(self):
         """獲取相機資訊"""
@@ -567,6 +968,6 @@ class Camera:
             'available': self.method_used != "simulation",
             'resolution': (self.config.frame_width, self.config.frame_height),
             'hardware': 'Camera Module 3 (imx708)' if self.method_used != "simulation" else 'Simulation',
-            'last_error': self.last_error_time,
+            'cooldown_remaining': max(0.0, self._cooldown_until - time.monotonic()),
             'error_cooldown': self.error_cooldown
         }
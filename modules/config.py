@@ -1,10 +1,49 @@
 import sys
 import os
+import threading
+import functools
+import logging
+from logging.handlers import RotatingFileHandler
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# 全域變數，確保只載入一次 / Global variables to ensure loading only once
-_env_loaded = False
-_config_instance = None
+logger = logging.getLogger(__name__)
+
+# 環境變數預設值，模組載入時建立一次 / Environment variable defaults, built once at import
+_DEFAULTS = {
+    'CAMERA_INDEX': 0,
+    'FRAME_WIDTH': 800,
+    'FRAME_HEIGHT': 600,
+    'BUTTON_PIN': 16,
+    'LED_PIN': 13,
+    'BUZZER_PIN': 5,
+    'PRINTER_DEV': "/dev/usblp0",
+    'PRINTER_WIDTH': 58,
+    'PRINTER_ENCODING': 'GB18030',
+    'LOG_LEVEL': 'INFO',
+    'OPENAI_API_KEY': None,
+    'OPENAI_MODEL': "gpt-4o-mini",
+    'DEEPSEEK_API_KEY': None,
+    'DEEPSEEK_MODEL': "deepseek-chat",
+    'API_RETRIES': 3,
+    'API_RETRY_DELAY': 2,
+    'POEM_CACHE_THRESHOLD': 0.92,
+    'POEM_CACHE_MAX': 256,
+    'LOCAL_POET_MODEL': "",
+    'PREFER_LOCAL_POET': 'False',
+    'GESTURE_CONFIDENCE_THRESHOLD': 95.0,
+    'GESTURE_DETECTION_FRAMES': 3,
+    'TFLITE_NUM_THREADS': 0,
+    'DISPLAY_HZ': 60,
+    'DEBUG': 'False',
+}
+
+# 已確認存在的目錄 / Directories already known to exist
+_dir_cache = set()
+
+# 日誌檔案輪替：單檔上限與保留份數 / Log rotation: size limit per file and number of backups kept
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+_logging_configured = False
 
 # 嘗試導入 python-dotenv / Try to import python-dotenv
 try:
@@ -15,124 +54,159 @@ except ImportError:
     print("警告: python-dotenv 未安裝，請執行: pip install python-dotenv / Warning: python-dotenv not installed, please run: pip install python-dotenv")
     print("將使用配置文件中的預設值 / Will use default values from config file")
 
+@functools.lru_cache(maxsize=None)
+def _ensure_env_loaded(base_dir):
+    """
+    載入環境變數檔案，每個目錄只載入一次 / Load the environment file, once per base directory
+    
+    Args:
+        base_dir: 專案根目錄 / Project root directory
+        
+    Returns:
+        bool: 是否已載入 .env / Whether a .env file was loaded
+    """
+    if not DOTENV_AVAILABLE:
+        print("⚠️ python-dotenv 不可用，使用預設值 / python-dotenv not available, using default values")
+        return False
+    
+    env_path = os.path.join(base_dir, '.env')
+    if os.path.exists(env_path):
+        load_dotenv(env_path)
+        print(f"✓ 已載入環境變數配置: {env_path} / Environment variables loaded: {env_path}")
+        return True
+    
+    print(f"⚠️ 未找到 .env 文件: {env_path} / .env file not found: {env_path}")
+    return False
+
 class Config:
     """
     配置管理類別 / Configuration management class
     
     負責載入和管理所有系統配置，包括相機、GPIO、API 等設置
     Responsible for loading and managing all system configurations including camera, GPIO, API settings
+    
+    單例：第一次建構時才載入設定，之後的 Config() 直接回傳同一個實例
+    Singleton: settings are loaded on first construction only, later Config() calls return the same instance
     """
-    def __init__(self):
-        global _env_loaded, _config_instance
-        
-        # 單例模式：如果已經有實例，直接返回 / Singleton pattern: if instance exists, return directly
-        if _config_instance is not None:
-            self.__dict__ = _config_instance.__dict__
-            return
-        
+    _instance = None
+    _lock = threading.Lock()
+    
+    def __new__(cls):
+        # 雙重檢查鎖定，已建立時不必取得鎖 / Double-checked locking, no lock taken once the instance exists
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._init_once()
+                    cls._instance = instance
+                    setup_logging(instance)
+        return cls._instance
+    
+    def _init_once(self):
+        """
+        載入所有設定，每個行程只執行一次 / Load all settings, runs once per process
+        """
         self.base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        # 以下路徑直接以字串組合（目標平台為 Linux）/ Paths below are built as plain strings (the target platform is Linux)
         
         # 載入環境變數（只載入一次）/ Load environment variables (only once)
-        if not _env_loaded:
-            self._load_environment()
-            _env_loaded = True
+        _ensure_env_loaded(self.base_dir)
+        
+        # 一次取得環境變數快照，之後只查 Python 字典 / Snapshot the environment once, then look up a plain Python dict
+        env = os.environ.copy()
+        
+        def _g(key):
+            return env.get(key, _DEFAULTS[key])
         
         # 相機設置 / Camera settings
-        self.camera_index = int(os.getenv('CAMERA_INDEX', 0))
-        self.frame_width = int(os.getenv('FRAME_WIDTH', 800))
-        self.frame_height = int(os.getenv('FRAME_HEIGHT', 600))
-        self.photo_dir = os.path.join(self.base_dir, "photos")
+        self.camera_index = int(_g('CAMERA_INDEX'))
+        self.frame_width = int(_g('FRAME_WIDTH'))
+        self.frame_height = int(_g('FRAME_HEIGHT'))
+        self.photo_dir = f"{self.base_dir}/photos"
         
         # 模型設置 / Model settings
-        self.model_path = os.path.join(self.base_dir, "models", "model_unquant.tflite")
-        self.labels_path = os.path.join(self.base_dir, "models", "labels.txt")
+        self.model_path = f"{self.base_dir}/models/model_unquant.tflite"
+        self.labels_path = f"{self.base_dir}/models/labels.txt"
         
         # GPIO 設置 / GPIO settings
-        self.button_pin = int(os.getenv('BUTTON_PIN', 16))
-        self.led_pin = int(os.getenv('LED_PIN', 13))
-        self.buzzer_pin = int(os.getenv('BUZZER_PIN', 5))
+        self.button_pin = int(_g('BUTTON_PIN'))
+        self.led_pin = int(_g('LED_PIN'))
+        self.buzzer_pin = int(_g('BUZZER_PIN'))
         
         # 印表機設置 / Printer settings
-        self.printer_dev = os.getenv('PRINTER_DEV', "/dev/usblp0")
-        self.printer_width = int(os.getenv('PRINTER_WIDTH', 58))
-        self.printer_encoding = os.getenv('PRINTER_ENCODING', 'GB18030')
+        self.printer_dev = _g('PRINTER_DEV')
+        self.printer_width = int(_g('PRINTER_WIDTH'))
+        self.printer_encoding = _g('PRINTER_ENCODING')
         self.chinese_mode = "default"
-        self.poem_dir = os.path.join(self.base_dir, "photos", "poems")
+        self.poem_dir = f"{self.base_dir}/photos/poems"
         
         # 顯示設置 / Display settings
         self.screen_width = 1920
         self.screen_height = 1080
+        # 觸控事件輪詢頻率上限 / Upper bound on the touch event polling rate
+        self.display_hz = max(1, int(_g('DISPLAY_HZ')))
         
         # 日誌設置 / Logging settings
-        self.log_dir = os.path.join(self.base_dir, "logs")
-        self.log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+        self.log_dir = f"{self.base_dir}/logs"
+        self.log_level = _g('LOG_LEVEL').upper()
         
         # OpenAI API 設置 - 優先使用環境變數 / OpenAI API settings - prioritize environment variables
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
+        self.openai_api_key = _g('OPENAI_API_KEY')
         if not self.openai_api_key:
             print("警告: 未在環境變數中找到 OPENAI_API_KEY / Warning: OPENAI_API_KEY not found in environment variables")
             self.openai_api_key = ""
         
-        self.openai_model = os.getenv('OPENAI_MODEL', "gpt-4o-mini")
+        self.openai_model = _g('OPENAI_MODEL')
         
         # DeepSeek API 設置 - 優先使用環境變數 / DeepSeek API settings - prioritize environment variables
-        self.deepseek_api_key = os.getenv('DEEPSEEK_API_KEY')
+        self.deepseek_api_key = _g('DEEPSEEK_API_KEY')
         if not self.deepseek_api_key:
             print("警告: 未在環境變數中找到 DEEPSEEK_API_KEY / Warning: DEEPSEEK_API_KEY not found in environment variables")
             self.deepseek_api_key = ""
         
-        self.deepseek_model = os.getenv('DEEPSEEK_MODEL', "deepseek-chat")
+        self.deepseek_model = _g('DEEPSEEK_MODEL')
         
         # API 重試設置 / API retry settings
-        self.api_retries = int(os.getenv('API_RETRIES', 3))
-        self.api_retry_delay = int(os.getenv('API_RETRY_DELAY', 2))
+        self.api_retries = int(_g('API_RETRIES'))
+        self.api_retry_delay = int(_g('API_RETRY_DELAY'))
+        
+        # 詩歌語義快取：相似度門檻與最大項目數，門檻大於 1 表示停用 / Poem semantic cache: similarity threshold and max entries, a threshold above 1 disables it
+        self.poem_cache_threshold = float(_g('POEM_CACHE_THRESHOLD'))
+        self.poem_cache_max = int(_g('POEM_CACHE_MAX'))
+        
+        # 本地詩人模型（llama.cpp GGUF），DeepSeek 不可用時使用；優先模式下完全不呼叫 DeepSeek
+        # Local poet model (llama.cpp GGUF), used when DeepSeek is unavailable; preferred mode skips DeepSeek entirely
+        self.local_poet_model = _g('LOCAL_POET_MODEL') or f"{self.base_dir}/models/qwen2.5-0.5b-instruct-q4_k_m.gguf"
+        self.prefer_local_poet = _g('PREFER_LOCAL_POET').lower() in ('true', '1', 'yes', 'on')
         
         # 手勢識別設置 / Gesture recognition settings
-        self.gesture_confidence_threshold = float(os.getenv('GESTURE_CONFIDENCE_THRESHOLD', 95.0))
-        self.gesture_detection_frames = int(os.getenv('GESTURE_DETECTION_FRAMES', 3))
+        self.gesture_confidence_threshold = float(_g('GESTURE_CONFIDENCE_THRESHOLD'))
+        self.gesture_detection_frames = int(_g('GESTURE_DETECTION_FRAMES'))
+        # TFLite 推論執行緒數，0 表示使用所有核心 / TFLite inference threads, 0 means use every core
+        self.tflite_num_threads = int(_g('TFLITE_NUM_THREADS')) or os.cpu_count() or 4
         
         # 調試模式 / Debug mode
-        self.debug = os.getenv('DEBUG', 'False').lower() in ('true', '1', 'yes', 'on')
+        self.debug = _g('DEBUG').lower() in ('true', '1', 'yes', 'on')
         
         # 確保目錄存在 / Ensure directories exist
         self._create_directories()
         
         # 驗證配置 / Validate configuration
         self._validate_config()
-        
-        # 儲存單例實例 / Store singleton instance
-        _config_instance = self
-    
-    def _load_environment(self):
-        """
-        載入環境變數檔案（只載入一次）/ Load environment variables file (only once)
-        """
-        if DOTENV_AVAILABLE:
-            env_path = os.path.join(self.base_dir, '.env')
-            if os.path.exists(env_path):
-                load_dotenv(env_path)
-                print(f"✓ 已載入環境變數配置: {env_path} / Environment variables loaded: {env_path}")
-            else:
-                print(f"⚠️ 未找到 .env 文件: {env_path} / .env file not found: {env_path}")
-        else:
-            print("⚠️ python-dotenv 不可用，使用預設值 / python-dotenv not available, using default values")
     
     def _create_directories(self):
         """
         建立必要目錄 / Create necessary directories
         """
-        directories = [
-            self.photo_dir,
-            self.poem_dir, 
-            self.log_dir
-        ]
+        # 靜態文件目錄設置 / Static files directory setup
+        self.static_dir = f"{self.base_dir}/static"
         
-        for directory in directories:
+        # 已確認的目錄不再 stat / Directories already confirmed are not stat'ed again
+        for directory in (self.photo_dir, self.poem_dir, self.log_dir, self.static_dir):
+            if directory in _dir_cache:
+                continue
             os.makedirs(directory, exist_ok=True)
-        
-        # 靜態文件目錄設置 / Static files directory setup
-        self.static_dir = os.path.join(self.base_dir, "static")
-        os.makedirs(self.static_dir, exist_ok=True)
+            _dir_cache.add(directory)
     
     def _validate_config(self):
         """
@@ -148,18 +222,23 @@ class Config:
             missing_keys.append("DEEPSEEK_API_KEY")
         
         if missing_keys:
-            print("=" * 60)
-            print("⚠️  重要：缺少 API 金鑰設置 / Important: Missing API key configuration")
-            print("=" * 60)
-            print("缺少以下 API 金鑰: / Missing the following API keys:")
-            for key in missing_keys:
-                print(f"  - {key}")
-            print("\n請執行以下步驟: / Please follow these steps:")
-            print("1. 複製 .env.example 為 .env / Copy .env.example to .env")
-            print("2. 在 .env 文件中填入您的 API 金鑰 / Fill in your API keys in .env file")
-            print("3. 確保 .env 文件在專案根目錄 / Ensure .env file is in project root directory")
-            print("4. 安裝 python-dotenv: pip install python-dotenv / Install python-dotenv: pip install python-dotenv")
-            print("=" * 60)
+            # 只有缺少金鑰時才組出提示，一次輸出 / Build the notice only when keys are missing, and print it in one go
+            lines = [
+                "=" * 60,
+                "⚠️  重要：缺少 API 金鑰設置 / Important: Missing API key configuration",
+                "=" * 60,
+                "缺少以下 API 金鑰: / Missing the following API keys:",
+            ]
+            lines.extend("  - " + key for key in missing_keys)
+            lines.extend([
+                "\n請執行以下步驟: / Please follow these steps:",
+                "1. 複製 .env.example 為 .env / Copy .env.example to .env",
+                "2. 在 .env 文件中填入您的 API 金鑰 / Fill in your API keys in .env file",
+                "3. 確保 .env 文件在專案根目錄 / Ensure .env file is in project root directory",
+                "4. 安裝 python-dotenv: pip install python-dotenv / Install python-dotenv: pip install python-dotenv",
+                "=" * 60,
+            ])
+            print("\n".join(lines))
         else:
             print("✓ API 金鑰配置完成 / API key configuration completed")
         
@@ -179,7 +258,7 @@ class Config:
         """
         info = {
             "DOTENV_AVAILABLE": DOTENV_AVAILABLE,
-            "ENV_FILE_EXISTS": os.path.exists(os.path.join(self.base_dir, '.env')),
+            "ENV_FILE_EXISTS": os.path.exists(f"{self.base_dir}/.env"),
             "OPENAI_API_KEY_SET": bool(self.openai_api_key),
             "DEEPSEEK_API_KEY_SET": bool(self.deepseek_api_key),
             "DEBUG_MODE": self.debug,
@@ -194,24 +273,43 @@ class Config:
         if not self.debug:
             return
             
-        print("\n" + "=" * 50)
-        print("🔧 配置摘要 / Configuration Summary")
-        print("=" * 50)
-        print(f"基礎目錄: {self.base_dir} / Base directory: {self.base_dir}")
-        print(f"相機解析度: {self.frame_width}x{self.frame_height} / Camera resolution: {self.frame_width}x{self.frame_height}")
-        print(f"GPIO 針腳: 按鈕={self.button_pin}, LED={self.led_pin}, 蜂鳴器={self.buzzer_pin} / GPIO pins: Button={self.button_pin}, LED={self.led_pin}, Buzzer={self.buzzer_pin}")
-        print(f"手勢識別閾值: {self.gesture_confidence_threshold}% / Gesture recognition threshold: {self.gesture_confidence_threshold}%")
-        print(f"OpenAI 模型: {self.openai_model} / OpenAI model: {self.openai_model}")
-        print(f"DeepSeek 模型: {self.deepseek_model} / DeepSeek model: {self.deepseek_model}")
-        print(f"API 重試次數: {self.api_retries} / API retry count: {self.api_retries}")
-        print(f"日誌級別: {self.log_level} / Log level: {self.log_level}")
-        
-        env_info = self.get_env_info()
-        print("\n🌍 環境狀態: / Environment Status:")
-        for key, value in env_info.items():
-            status = "✓" if value else "✗"
-            print(f"  {status} {key}: {value}")
-        print("=" * 50 + "\n")
+        # 延遲格式化，日誌級別高於 INFO 時不組字串 / Lazy formatting, nothing is built when the level is above INFO
+        logger.info("=" * 50)
+        logger.info("🔧 配置摘要 / Configuration Summary")
+        logger.info("基礎目錄 / Base directory: %s", self.base_dir)
+        logger.info("相機解析度 / Camera resolution: %dx%d", self.frame_width, self.frame_height)
+        logger.info("GPIO 針腳 / GPIO pins: 按鈕/Button=%d, LED=%d, 蜂鳴器/Buzzer=%d", self.button_pin, self.led_pin, self.buzzer_pin)
+        logger.info("手勢識別閾值 / Gesture recognition threshold: %s%%", self.gesture_confidence_threshold)
+        logger.info("OpenAI 模型 / OpenAI model: %s", self.openai_model)
+        logger.info("DeepSeek 模型 / DeepSeek model: %s", self.deepseek_model)
+        logger.info("API 重試次數 / API retry count: %d", self.api_retries)
+        logger.info("日誌級別 / Log level: %s", self.log_level)
+        
+        logger.info("🌍 環境狀態 / Environment Status:")
+        for key, value in self.get_env_info().items():
+            logger.info("  %s %s: %s", "✓" if value else "✗", key, value)
+        logger.info("=" * 50)
+
+def setup_logging(cfg):
+    """
+    設置根日誌：輪替的 app.log，只執行一次 / Configure the root logger with a rotating app.log, runs once
+    
+    Args:
+        cfg: 配置物件 / Configuration object
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    
+    handler = RotatingFileHandler(
+        os.path.join(cfg.log_dir, 'app.log'),
+        maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, cfg.log_level, logging.INFO))
 
 # 單例模式便利函數 / Singleton pattern convenience function
 def get_config():
@@ -221,7 +319,4 @@ def get_config():
     Returns:
         Config: 配置實例 / Configuration instance
     """
-    global _config_instance
-    if _config_instance is None:
-        _config_instance = Config()
-    return _config_instance
+    return Config()
@@ -2,32 +2,98 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import numpy as np
-import cv2
 import logging
+import threading
 from modules.config import Config
 
-# 嘗試導入 tflite_runtime / Try to import tflite_runtime
-try:
-    import tflite_runtime.interpreter as tflite
-    TFLITE_AVAILABLE = True
-except ImportError:
-    TFLITE_AVAILABLE = False
-    logging.error("無法導入 tflite_runtime，請安裝: pip install tflite_runtime / Cannot import tflite_runtime, please install: pip install tflite_runtime")
+# cv2、numpy、tflite_runtime 延遲到第一次建立識別器時才導入 / cv2, numpy and tflite_runtime are imported on first recognizer construction
+cv2 = None
+np = None
+tflite = None
+TFLITE_AVAILABLE = None
+_heavy_imported = False
+
+def _import_heavy_modules():
+    """
+    導入推論所需的重量級模組（只執行一次）/ Import the heavy modules inference needs (runs once)
+    
+    Returns:
+        bool: tflite_runtime 是否可用 / Whether tflite_runtime is available
+    """
+    global cv2, np, tflite, TFLITE_AVAILABLE, _heavy_imported
+    if _heavy_imported:
+        return TFLITE_AVAILABLE
+    
+    import cv2
+    import numpy as np
+    
+    # 嘗試導入 tflite_runtime / Try to import tflite_runtime
+    try:
+        import tflite_runtime.interpreter as tflite
+        TFLITE_AVAILABLE = True
+    except ImportError:
+        TFLITE_AVAILABLE = False
+        logger.error("無法導入 tflite_runtime，請安裝: pip install tflite_runtime / Cannot import tflite_runtime, please install: pip install tflite_runtime")
+    
+    _heavy_imported = True
+    return TFLITE_AVAILABLE
 
-logging.basicConfig(
-    filename=os.path.join(Config().log_dir, 'app.log'),
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# 已載入的 (直譯器, 標籤, 直譯器鎖)，以路徑、修改時間與執行緒數為鍵 / Loaded (interpreter, labels, interpreter lock), keyed by paths, modification times and thread count
+# 同一個直譯器由所有共用它的識別器共享，而 tflite.Interpreter 不是執行緒安全的，set_tensor/invoke/get_tensor 必須持鎖
+# Every recognizer sharing an interpreter shares the same object, and tflite.Interpreter is not thread-safe, so set_tensor/invoke/get_tensor must hold the lock
+_interp_cache = {}
+
+def _load_model(model_path, labels_path, num_threads):
+    """
+    載入 TFLite 模型與標籤，檔案未變更時重用 / Load the TFLite model and labels, reused while the files are unchanged
+    
+    Args:
+        model_path: 模型路徑 / Model path
+        labels_path: 標籤路徑 / Labels path
+        num_threads: 推論執行緒數 / Inference thread count
+        
+    Returns:
+        tuple: (直譯器, 標籤列表, 直譯器鎖) / (interpreter, label list, interpreter lock)
+    """
+    key = (model_path, labels_path, os.path.getmtime(model_path), os.path.getmtime(labels_path), num_threads)
+    cached = _interp_cache.get(key)
+    if cached is not None:
+        logger.info("重用已載入的模型 / Reusing loaded model")
+        return cached
+    
+    # 載入 TensorFlow Lite 模型，多執行緒 XNNPACK 核心 / Load TensorFlow Lite model with multi-threaded XNNPACK kernels
+    interpreter = tflite.Interpreter(model_path=model_path, num_threads=num_threads)
+    interpreter.allocate_tensors()
+    
+    try:
+        # 載入標籤文件 / Load label file
+        # 單次走訪："0 OK" 取空格後的名稱，沒有編號的行保持原樣 / Single pass: "0 OK" keeps the name after the space, lines without an index are kept as is
+        with open(labels_path, 'r') as f:
+            labels = [line.strip().split(' ', 1)[-1] for line in f if line.strip()]
+        logger.info(f"載入標籤: {labels} / Loaded labels: {labels}")
+    except Exception as e:
+        logger.warning(f"載入標籤文件失敗: {e}，使用默認標籤 / Failed to load label file: {e}, using default labels")
+        labels = ["OK", "YA", "None"]  # 更新默認標籤 / Updated default labels
+    
+    cached = (interpreter, labels, threading.Lock())
+    _interp_cache[key] = cached
+    return cached
+
 class GestureRecognizer:
     """
     Teachable Machine 手勢識別器 / Teachable Machine gesture recognizer
     
     使用 TensorFlow Lite 模型進行手勢識別，支援 OK、YA、None 三種手勢
     Uses TensorFlow Lite model for gesture recognition, supports OK, YA, None gestures
+    
+    同時支援浮點模型與 uint8 全量化模型；量化模型可由 Teachable Machine 匯出，或以
+    tf.lite.TFLiteConverter 搭配 optimizations=[tf.lite.Optimize.DEFAULT]、代表性資料集與
+    inference_input_type=tf.uint8 轉換。量化模型直接吃 uint8 影格，省去浮點正規化
+    Supports both float models and fully quantized uint8 models. A quantized model can be exported from
+    Teachable Machine or converted with tf.lite.TFLiteConverter using optimizations=[tf.lite.Optimize.DEFAULT],
+    a representative dataset and inference_input_type=tf.uint8; it takes uint8 frames directly, skipping float normalization
     """
     def __init__(self, config: Config):
         """
@@ -41,7 +107,7 @@ class GestureRecognizer:
             FileNotFoundError: 模型或標籤文件不存在時拋出 / Raised when model or label files don't exist
         """
         self.config = config
-        if not TFLITE_AVAILABLE:
+        if not _import_heavy_modules():
             raise ImportError("tflite_runtime 未安裝，無法初始化手勢識別器 / tflite_runtime not installed, cannot initialize gesture recognizer")
             
         try:
@@ -50,24 +116,41 @@ class GestureRecognizer:
             if not os.path.exists(config.labels_path):
                 raise FileNotFoundError(f"找不到標籤文件: {config.labels_path} / Label file not found: {config.labels_path}")
             
-            # 載入 TensorFlow Lite 模型 / Load TensorFlow Lite model
-            self.interpreter = tflite.Interpreter(model_path=config.model_path)
-            self.interpreter.allocate_tensors()
+            # 載入模型與標籤（同一檔案只載入一次）/ Load model and labels (once per unchanged file)
+            self.interpreter, self.labels, self._interp_lock = _load_model(config.model_path, config.labels_path, config.tflite_num_threads)
             self.input_details = self.interpreter.get_input_details()
             self.output_details = self.interpreter.get_output_details()
             
             logger.info(f"模型輸入形狀: {self.input_details[0]['shape']} / Model input shape: {self.input_details[0]['shape']}")
             
-            try:
-                # 載入標籤文件 / Load label file
-                with open(config.labels_path, 'r') as f:
-                    raw_labels = [line.strip() for line in f.readlines()]
-                    self.labels = [label.split(' ', 1)[1] if ' ' in label else label 
-                                  for label in raw_labels]
-                logger.info(f"載入標籤: {self.labels} / Loaded labels: {self.labels}")
-            except Exception as e:
-                logger.warning(f"載入標籤文件失敗: {e}，使用默認標籤 / Failed to load label file: {e}, using default labels")
-                self.labels = ["OK", "YA", "None"]  # 更新默認標籤 / Updated default labels
+            # 預先配置縮放與輸入緩衝區，每幀不再配置記憶體 / Preallocate resize and input buffers so no memory is allocated per frame
+            input_shape = self.input_details[0]['shape']
+            self._in_h, self._in_w = int(input_shape[1]), int(input_shape[2])
+            # 縮小時 INTER_AREA 走盒狀濾波，品質更好也更快 / When downscaling, INTER_AREA takes the box-filter path, better quality and faster
+            downscale = config.frame_width > self._in_w and config.frame_height > self._in_h
+            self._resize_interp = cv2.INTER_AREA if downscale else cv2.INTER_LINEAR
+            self._quantized = self.input_details[0]['dtype'] == np.uint8
+            if self._quantized:
+                # 量化模型：縮放結果直接就是輸入張量 / Quantized model: the resize output is the input tensor
+                self._input_buf = np.empty((1, self._in_h, self._in_w, 3), dtype=np.uint8)
+                self._resized = self._input_buf[0]
+            else:
+                self._resized = np.empty((self._in_h, self._in_w, 3), dtype=np.uint8)
+                self._input_buf = np.empty((1, self._in_h, self._in_w, 3), dtype=np.float32)
+            
+            # 量化輸出需要反量化才能換算百分比 / Quantized outputs must be dequantized before converting to percentages
+            out_scale, out_zero_point = self.output_details[0]['quantization']
+            self._out_quant = (out_scale, out_zero_point) if out_scale else None
+            logger.info(f"模型量化輸入: {self._quantized} / Quantized model input: {self._quantized}")
+            
+            # 標籤與張量索引在初始化時解析一次 / Resolve label and tensor indices once at init
+            label_to_idx = {label: i for i, label in enumerate(self.labels)}
+            self._ok_idx = label_to_idx.get("OK", 0)
+            self._ya_idx = label_to_idx.get("YA", 1)
+            self._none_idx = label_to_idx.get("None", 2)
+            self._idx_map = {"OK": self._ok_idx, "YA": self._ya_idx, "None": self._none_idx}
+            self._in_idx = self.input_details[0]['index']
+            self._out_idx = self.output_details[0]['index']
                 
             logger.info(f"手勢識別器初始化成功，類別數: {len(self.labels)} / Gesture recognizer initialized successfully, class count: {len(self.labels)}")
             
@@ -83,23 +166,61 @@ class GestureRecognizer:
             frame: 輸入影格 / Input frame
             
         Returns:
-            numpy.ndarray: 預處理後的影格 / Preprocessed frame
+            numpy.ndarray: 預處理後的影格（共用緩衝區，下次呼叫會被覆寫）/ Preprocessed frame (shared buffer, overwritten by the next call)
             
         Raises:
             Exception: 預處理失敗時拋出 / Raised when preprocessing fails
         """
         try:
-            input_shape = self.input_details[0]['shape']
-            input_height, input_width = input_shape[1], input_shape[2]
             # 調整影格大小 / Resize frame
-            frame_resized = cv2.resize(frame, (input_width, input_height))
-            # 正規化像素值 / Normalize pixel values
-            frame_normalized = frame_resized.astype(np.float32) / 255.0
-            return np.expand_dims(frame_normalized, axis=0)
+            cv2.resize(frame, (self._in_w, self._in_h), dst=self._resized, interpolation=self._resize_interp)
+            if not self._quantized:
+                # 正規化像素值，直接寫入輸入緩衝區 / Normalize pixel values straight into the input buffer
+                np.multiply(self._resized, np.float32(1 / 255.0), out=self._input_buf[0])
+            return self._input_buf
         except Exception as e:
             logger.error(f"預處理影格失敗: {e} / Failed to preprocess frame: {e}")
             raise
 
+    def predict_vector(self, frame):
+        """
+        對影格進行手勢預測，回傳所有類別的信心度向量 / Perform gesture prediction, returning the confidence vector for every class
+        
+        Args:
+            frame: 輸入影格 / Input frame
+            
+        Returns:
+            tuple: (信心度百分比向量, 標籤索引對照)，直譯器失敗時向量為 None；可直接 np.argmax / (confidence percentage vector, label index map), vector is None when the interpreter fails; suitable for np.argmax
+            
+        Raises:
+            Exception: 預處理失敗時拋出，由呼叫端（推論執行緒）處理 / Raised when preprocessing fails, handled by the caller (inference worker)
+        """
+        # 預處理影格 / Preprocess frame
+        input_data = self.preprocess_frame(frame)
+        
+        # 只有直譯器呼叫包在 try 中 / Only the interpreter calls are wrapped in try
+        try:
+            # 直譯器可能與其他識別器共用 / The interpreter may be shared with other recognizers
+            with self._interp_lock:
+                # 設置輸入張量 / Set input tensor
+                self.interpreter.set_tensor(self._in_idx, input_data)
+                # 執行推理 / Run inference
+                self.interpreter.invoke()
+                # 獲取輸出結果 / Get output results
+                output_data = self.interpreter.get_tensor(self._out_idx)
+        except Exception as e:
+            logger.error("手勢預測失敗: %s / Gesture prediction failed: %s", e, e)
+            return None, self._idx_map
+        
+        # 一次乘法換算整個向量的百分比（量化輸出一併反量化）/ Convert the whole vector to percentages in one multiply (dequantizing quantized outputs on the way)
+        confidences = output_data[0]
+        if self._out_quant is not None:
+            scale, zero_point = self._out_quant
+            scaled = np.multiply(np.subtract(confidences, zero_point, dtype=np.float32), scale * 100.0, dtype=np.float32)
+        else:
+            scaled = np.multiply(confidences, 100.0, dtype=np.float32)
+        return scaled, self._idx_map
+    
     def predict(self, frame):
         """
         對影格進行手勢預測 / Perform gesture prediction on frame
@@ -110,30 +231,14 @@ class GestureRecognizer:
         Returns:
             tuple: (OK信心度, YA信心度, None信心度) / (OK confidence, YA confidence, None confidence)
         """
-        try:
-            # 預處理影格 / Preprocess frame
-            input_data = self.preprocess_frame(frame)
-            # 設置輸入張量 / Set input tensor
-            self.interpreter.set_tensor(self.input_details[0]['index'], input_data)
-            # 執行推理 / Run inference
-            self.interpreter.invoke()
-            # 獲取輸出結果 / Get output results
-            output_data = self.interpreter.get_tensor(self.output_details[0]['index'])
-            confidences = output_data[0]
-            
-            # 獲取各手勢的索引 / Get indices for each gesture
-            ok_idx = self.labels.index("OK") if "OK" in self.labels else 0
-            ya_idx = self.labels.index("YA") if "YA" in self.labels else 1
-            none_idx = self.labels.index("None") if "None" in self.labels else 2
-            
-            # 計算信心度百分比 / Calculate confidence percentages
-            ok_confidence = confidences[ok_idx] * 100
-            ya_confidence = confidences[ya_idx] * 100
-            none_confidence = confidences[none_idx] * 100
-            
-            logger.debug(f"手勢預測: OK={ok_confidence:.1f}%, YA={ya_confidence:.1f}%, None={none_confidence:.1f}% / Gesture prediction: OK={ok_confidence:.1f}%, YA={ya_confidence:.1f}%, None={none_confidence:.1f}%")
-            return ok_confidence, ya_confidence, none_confidence
-            
-        except Exception as e:
-            logger.error(f"手勢預測失敗: {e} / Gesture prediction failed: {e}")
+        scaled, _ = self.predict_vector(frame)
+        if scaled is None:
             return 0, 0, 0
+        
+        ok_confidence = float(scaled[self._ok_idx])
+        ya_confidence = float(scaled[self._ya_idx])
+        none_confidence = float(scaled[self._none_idx])
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("手勢預測 / Gesture prediction: OK=%.1f%%, YA=%.1f%%, None=%.1f%%", ok_confidence, ya_confidence, none_confidence)
+        return ok_confidence, ya_confidence, none_confidence
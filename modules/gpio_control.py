@@ -1,43 +1,75 @@
 import time
 import threading
 import logging
+import select
+import queue
+import importlib.util
+from functools import partial
 
-# 嘗試導入 GPIO 庫（按優先順序）/ Try to import GPIO libraries (in priority order)
-GPIO_METHOD = "none"
-GPIO_AVAILABLE = False
+def _module_available(name):
+    """
+    檢查模組是否已安裝，但不導入 / Check whether a module is installed without importing it
+    
+    Args:
+        name: 模組名稱 / Module name
+        
+    Returns:
+        bool: 是否可用 / Whether it is available
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # 父套件不存在（如 RPi）/ The parent package is missing (e.g. RPi)
+        return False
 
-# 方法1: 嘗試 lgpio (Raspberry Pi 5) / Method 1: Try lgpio (Raspberry Pi 5)
-try:
-    import lgpio
-    GPIO_METHOD = "lgpio"
-    GPIO_AVAILABLE = True
-    print("✅ 使用 lgpio (Raspberry Pi 5) / Using lgpio (Raspberry Pi 5)")
-except ImportError:
-    pass
+# GPIO 後端代碼，以小整數比較取代字串比較 / GPIO backend codes, compared as small ints instead of strings
+LGPIO, GPIOZERO, RPI_GPIO, SIMULATION = range(4)
+GPIO_METHOD_NAMES = ("lgpio", "gpiozero", "rpi_gpio", "simulation")
 
-# 方法2: 嘗試 gpiozero (高級抽象) / Method 2: Try gpiozero (high-level abstraction)
-if GPIO_METHOD == "none":
-    try:
-        from gpiozero import LED, Buzzer, Button
-        from gpiozero.pins.lgpio import LGPIOFactory
-        from gpiozero import Device
-        GPIO_METHOD = "gpiozero"
-        GPIO_AVAILABLE = True
+def _detect_backend():
+    """
+    依優先順序偵測 GPIO 後端；真正的導入延遲到 _setup_* / Detect the GPIO backend in priority order; the actual import is deferred to _setup_*
+    
+    Returns:
+        int: 後端代碼 / Backend code
+    """
+    # 方法1: lgpio (Raspberry Pi 5) / Method 1: lgpio (Raspberry Pi 5)
+    if _module_available("lgpio"):
+        print("✅ 使用 lgpio (Raspberry Pi 5) / Using lgpio (Raspberry Pi 5)")
+        return LGPIO
+    # 方法2: gpiozero (高級抽象) / Method 2: gpiozero (high-level abstraction)
+    if _module_available("gpiozero"):
         print("✅ 使用 gpiozero / Using gpiozero")
-    except ImportError:
-        pass
-
-# 方法3: 嘗試傳統 RPi.GPIO / Method 3: Try traditional RPi.GPIO
-if GPIO_METHOD == "none":
-    try:
-        import RPi.GPIO as GPIO
-        GPIO_METHOD = "rpi_gpio"
-        GPIO_AVAILABLE = True
+        return GPIOZERO
+    # 方法3: 傳統 RPi.GPIO / Method 3: traditional RPi.GPIO
+    if _module_available("RPi.GPIO"):
         print("✅ 使用 RPi.GPIO / Using RPi.GPIO")
-    except ImportError:
-        GPIO_METHOD = "simulation"
-        GPIO_AVAILABLE = False
-        print("⚠️ GPIO 模擬模式 / GPIO simulation mode")
+        return RPI_GPIO
+    print("⚠️ GPIO 模擬模式 / GPIO simulation mode")
+    return SIMULATION
+
+# 音符序號與頻率 (Hz)，旋律可直接以序號索引 / Note ordinals and frequencies (Hz), melodies can index by ordinal
+NOTE_C4, NOTE_D4, NOTE_E4, NOTE_F4, NOTE_G4, NOTE_A4, NOTE_B4, NOTE_C5, NOTE_D5, NOTE_E5, NOTE_REST = range(11)
+NOTE_NAMES = ('C4', 'D4', 'E4', 'F4', 'G4', 'A4', 'B4', 'C5', 'D5', 'E5', 'REST')
+NOTE_FREQ = (
+    261.63,  # Do
+    293.66,  # Re
+    329.63,  # Mi
+    349.23,  # Fa
+    392.00,  # Sol
+    440.00,  # La
+    493.88,  # Ti
+    523.25,  # 高音Do / High Do
+    587.33,  # 高音Re / High Re
+    659.25,  # 高音Mi / High Mi
+    0,       # 休止符 / Rest
+)
+
+GPIO_METHOD = _detect_backend()
+GPIO_AVAILABLE = GPIO_METHOD != SIMULATION
+
+# libgpiod 用於核心邊緣事件的按鈕偵測，使用時才導入 / libgpiod for kernel edge-event button detection, imported on use
+GPIOD_AVAILABLE = _module_available("gpiod")
 
 class GPIOControl:
     """
@@ -70,25 +102,45 @@ class GPIOControl:
         # 按鈕監控 / Button monitoring
         self.button_callback = None
         self.button_thread = None
+        self.button_line = None
+        self._lgpio_cb = None
+        self._last_tick = None
+        # 回調執行期間（倒數、拍照、列印）累積的按鍵事件在此時間之前發生，回調結束後丟棄 / Presses queued while the callback ran (countdown, capture, print) happened before this time and are dropped once it returns
+        self._ignore_before_ns = 0
+        # 邊緣回調送出的按下事件，供 wait_for_button_press 阻塞等待 / Press event set by the edge callback so wait_for_button_press can block on it
+        self._press_event = threading.Event()
+        # 按鈕讀值快取 / Cached button reading
+        self._last_read_ns = 0
+        self._last_read_val = False
+        
+        # LED 閃爍請求佇列與常駐執行緒 / LED blink request queue and long-lived thread
+        self._blink_q = queue.SimpleQueue()
+        self._blink_thread = None
         self.running = True
         
-        # 定義音階頻率 (Hz) / Define note frequencies (Hz)
-        self.notes = {
-            'C4': 261.63,   # Do
-            'D4': 293.66,   # Re
-            'E4': 329.63,   # Mi
-            'F4': 349.23,   # Fa
-            'G4': 392.00,   # Sol
-            'A4': 440.00,   # La
-            'B4': 493.88,   # Ti
-            'C5': 523.25,   # 高音Do / High Do
-            'D5': 587.33,   # 高音Re / High Re
-            'E5': 659.25,   # 高音Mi / High Mi
-            'REST': 0       # 休止符 / Rest
-        }
+        # 音名對應頻率 (Hz)，保留字串介面 / Note name to frequency (Hz), kept for the string API
+        self.notes = dict(zip(NOTE_NAMES, NOTE_FREQ))
+        
+        # 每個音高的 (高電位微秒, 低電位微秒) 半週期只計算一次 / Compute each pitch's (on µs, off µs) half-periods once
+        self._note_periods = {}
+        for frequency in self.notes.values():
+            if frequency > 0:
+                period_us = 1_000_000 / frequency
+                on_us = max(1, int(period_us / 2))
+                self._note_periods[frequency] = (on_us, max(1, int(period_us) - on_us))
+        # 各音效的 lgpio 脈衝與總長度快取 / Cache of each sound's lgpio pulses and total length
+        self._pulse_cache = {}
+        self._pulse_seconds = {}
         
         # 初始化 GPIO / Initialize GPIO
         self._initialize_gpio()
+        
+        # 依實際後端綁定 LED、蜂鳴器與按鈕操作，每次呼叫不再比較字串 / Bind LED, buzzer and button operations to the actual backend so calls skip string comparisons
+        self._bind_backend()
+        
+        # 預先編譯所有音效並綁定播放後端，避免每次播放時重新查表 / Precompile all sounds and bind the tone backend once so playback skips per-call lookups
+        self._play_tone = self._select_tone_player()
+        self._sounds = self._build_sounds()
     
     def _initialize_gpio(self):
         """
@@ -98,11 +150,11 @@ class GPIOControl:
         Choose appropriate initialization method based on available GPIO library
         """
         
-        if GPIO_METHOD == "lgpio":
+        if GPIO_METHOD == LGPIO:
             self._setup_lgpio()
-        elif GPIO_METHOD == "gpiozero":
+        elif GPIO_METHOD == GPIOZERO:
             self._setup_gpiozero()
-        elif GPIO_METHOD == "rpi_gpio":
+        elif GPIO_METHOD == RPI_GPIO:
             self._setup_rpi_gpio()
         else:
             self._setup_simulation()
@@ -123,7 +175,8 @@ class GPIOControl:
             # 設置引腳 / Setup pins
             lgpio.gpio_claim_output(self.chip, self.led_pin)
             lgpio.gpio_claim_output(self.chip, self.buzzer_pin) 
-            lgpio.gpio_claim_input(self.chip, self.button_pin, lgpio.SET_PULL_UP)
+            # 按鈕以警示模式取得，核心會回報下降沿事件 / Claim the button for alerts so the kernel reports falling edges
+            lgpio.gpio_claim_alert(self.chip, self.button_pin, lgpio.FALLING_EDGE, lgpio.SET_PULL_UP)
             
             # 儲存 lgpio 模組 / Store lgpio module
             self.lgpio = lgpio
@@ -131,7 +184,7 @@ class GPIOControl:
             self.logger.info("lgpio 初始化成功 / lgpio initialized successfully")
             
         except Exception as e:
-            self.logger.error(f"lgpio 初始化失敗: {e} / lgpio initialization failed: {e}")
+            self.logger.error("lgpio 初始化失敗: %s / lgpio initialization failed: %s", e, e)
             self._setup_simulation()
     
     def _setup_gpiozero(self):
@@ -142,7 +195,7 @@ class GPIOControl:
         Initialize GPIO devices using gpiozero library (high-level abstraction)
         """
         try:
-            from gpiozero import LED, Buzzer, Button
+            from gpiozero import LED, PWMOutputDevice, Button
             from gpiozero.pins.lgpio import LGPIOFactory
             from gpiozero import Device
             
@@ -150,14 +203,15 @@ class GPIOControl:
             Device.pin_factory = LGPIOFactory()
             
             # 建立 GPIO 物件 / Create GPIO objects
+            # 蜂鳴器用 PWM 裝置，音高由 PWM 頻率決定 / The buzzer is a PWM device so the pitch comes from the PWM frequency
             self.gpio_led = LED(self.led_pin)
-            self.gpio_buzzer = Buzzer(self.buzzer_pin)
+            self.gpio_buzzer = PWMOutputDevice(self.buzzer_pin)
             self.gpio_button = Button(self.button_pin, pull_up=True)
             
             self.logger.info("gpiozero 初始化成功 / gpiozero initialized successfully")
             
         except Exception as e:
-            self.logger.error(f"gpiozero 初始化失敗: {e} / gpiozero initialization failed: {e}")
+            self.logger.error("gpiozero 初始化失敗: %s / gpiozero initialization failed: %s", e, e)
             self._setup_simulation()
     
     def _setup_rpi_gpio(self):
@@ -186,7 +240,7 @@ class GPIOControl:
             self.logger.info("RPi.GPIO 初始化成功 / RPi.GPIO initialized successfully")
             
         except Exception as e:
-            self.logger.error(f"RPi.GPIO 初始化失敗: {e} / RPi.GPIO initialization failed: {e}")
+            self.logger.error("RPi.GPIO 初始化失敗: %s / RPi.GPIO initialization failed: %s", e, e)
             self._setup_simulation()
     
     def _setup_simulation(self):
@@ -197,9 +251,66 @@ class GPIOControl:
         Use simulation mode when all GPIO libraries are unavailable
         """
         global GPIO_METHOD
-        GPIO_METHOD = "simulation"
+        GPIO_METHOD = SIMULATION
         self.logger.warning("使用 GPIO 模擬模式 / Using GPIO simulation mode")
     
+    def _bind_backend(self):
+        """
+        綁定目前 GPIO 後端的操作函數 / Bind the operations of the current GPIO backend
+        
+        在初始化完成後執行一次（初始化失敗時 GPIO_METHOD 可能已改為 simulation）
+        Runs once after initialization (GPIO_METHOD may have fallen back to simulation by then)
+        """
+        led_pin, buzzer_pin, button_pin = self.led_pin, self.buzzer_pin, self.button_pin
+        
+        if GPIO_METHOD == LGPIO:
+            write, read, chip = self.lgpio.gpio_write, self.lgpio.gpio_read, self.chip
+            # partial 直接呼叫 C 擴充函數，不多一層 Python 框架 / partial calls straight into the C extension without an extra Python frame
+            self._led_on = partial(write, chip, led_pin, 1)
+            self._led_off = partial(write, chip, led_pin, 0)
+            self._buzzer_on = partial(write, chip, buzzer_pin, 1)
+            self._buzzer_off = partial(write, chip, buzzer_pin, 0)
+            self._read_button = lambda: not read(chip, button_pin)
+            self._play_freq = self._play_note_lgpio
+            self._play_steps = self._play_steps_lgpio
+        elif GPIO_METHOD == GPIOZERO:
+            led, buzzer, button = self.gpio_led, self.gpio_buzzer, self.gpio_button
+            self._led_on = led.on
+            self._led_off = led.off
+            self._buzzer_on = buzzer.on
+            self._buzzer_off = buzzer.off
+            self._read_button = lambda: button.is_pressed
+            self._play_freq = self._play_note_gpiozero
+        elif GPIO_METHOD == RPI_GPIO:
+            GPIO = self.GPIO
+            output, read, pwm = GPIO.output, GPIO.input, self.buzzer_pwm
+            
+            def buzzer_on():
+                if pwm:
+                    pwm.start(50)
+                    pwm.ChangeFrequency(1000)
+            
+            def buzzer_off():
+                if pwm:
+                    pwm.stop()
+            
+            self._led_on = partial(output, led_pin, GPIO.HIGH)
+            self._led_off = partial(output, led_pin, GPIO.LOW)
+            self._buzzer_on = buzzer_on
+            self._buzzer_off = buzzer_off
+            self._read_button = lambda: not read(button_pin)
+            self._play_freq = self._play_note_rpi_gpio
+        else:
+            self._led_on = lambda: print("💡 LED 開啟 (模擬) / LED on (simulation)")
+            self._led_off = lambda: print("💡 LED 關閉 (模擬) / LED off (simulation)")
+            self._buzzer_on = lambda: print("🔊 蜂鳴器開啟 (模擬)")
+            self._buzzer_off = lambda: print("🔊 蜂鳴器關閉 (模擬)")
+            self._read_button = lambda: False
+            self._play_freq = lambda frequency, duration, duty_cycle: print(f"🎵 播放音調 ({frequency}Hz, {duration}s)")
+        
+        if GPIO_METHOD != LGPIO:
+            self._play_steps = self._play_steps_timed
+    
     def led_on(self):
         """
         LED 開啟 / Turn on LED
@@ -207,25 +318,10 @@ class GPIOControl:
         根據當前 GPIO 方法開啟 LED
         Turn on LED according to current GPIO method
         """
-        if GPIO_METHOD == "lgpio":
-            try:
-                self.lgpio.gpio_write(self.chip, self.led_pin, 1)
-            except Exception as e:
-                self.logger.error(f"LED 開啟失敗: {e} / LED turn on failed: {e}")
-                
-        elif GPIO_METHOD == "gpiozero":
-            try:
-                self.gpio_led.on()
-            except Exception as e:
-                self.logger.error(f"LED 開啟失敗: {e} / LED turn on failed: {e}")
-                
-        elif GPIO_METHOD == "rpi_gpio":
-            try:
-                self.GPIO.output(self.led_pin, self.GPIO.HIGH)
-            except Exception as e:
-                self.logger.error(f"LED 開啟失敗: {e} / LED turn on failed: {e}")
-        else:
-            print("💡 LED 開啟 (模擬) / LED on (simulation)")
+        try:
+            self._led_on()
+        except Exception as e:
+            self.logger.error("LED 開啟失敗: %s / LED turn on failed: %s", e, e)
     
     def led_off(self):
         """
@@ -234,86 +330,89 @@ class GPIOControl:
         根據當前 GPIO 方法關閉 LED
         Turn off LED according to current GPIO method
         """
-        if GPIO_METHOD == "lgpio":
-            try:
-                self.lgpio.gpio_write(self.chip, self.led_pin, 0)
-            except Exception as e:
-                self.logger.error(f"LED 關閉失敗: {e} / LED turn off failed: {e}")
-                
-        elif GPIO_METHOD == "gpiozero":
-            try:
-                self.gpio_led.off()
-            except Exception as e:
-                self.logger.error(f"LED 關閉失敗: {e} / LED turn off failed: {e}")
-                
-        elif GPIO_METHOD == "rpi_gpio":
-            try:
-                self.GPIO.output(self.led_pin, self.GPIO.LOW)
-            except Exception as e:
-                self.logger.error(f"LED 關閉失敗: {e} / LED turn off failed: {e}")
-        else:
-            print("💡 LED 關閉 (模擬) / LED off (simulation)")
+        try:
+            self._led_off()
+        except Exception as e:
+            self.logger.error("LED 關閉失敗: %s / LED turn off failed: %s", e, e)
     
     def led_blink(self, times, delay=0.2):
         """LED 閃爍"""
-        def blink():
+        # 交給常駐的閃爍執行緒，不再每次建立新執行緒 / Hand off to the long-lived blink thread instead of starting a new one each call
+        if self._blink_thread is None:
+            self._blink_thread = threading.Thread(target=self._blink_worker, name="LEDBlink", daemon=True)
+            self._blink_thread.start()
+        self._blink_q.put((times, delay))
+    
+    def _blink_worker(self):
+        """
+        LED 閃爍工作迴圈 / LED blink worker loop
+        
+        佇列中累積多個請求時只執行最新的一個
+        When several requests have piled up only the newest one is played
+        """
+        q = self._blink_q
+        while self.running:
+            request = q.get()
+            while not q.empty():
+                request = q.get()
+            if request is None:
+                break
+            times, delay = request
             for _ in range(times):
                 self.led_on()
                 time.sleep(delay)
                 self.led_off()
                 time.sleep(delay)
-        
-        thread = threading.Thread(target=blink, daemon=True)
-        thread.start()
     
     def play_note(self, note, duration=0.3, duty_cycle=50):
-        """播放單個音符"""
-        if note in self.notes and self.notes[note] > 0:
-            frequency = self.notes[note]
-            
-            if GPIO_METHOD == "lgpio":
-                self._play_note_lgpio(frequency, duration, duty_cycle)
-            elif GPIO_METHOD == "gpiozero":
-                self._play_note_gpiozero(frequency, duration)
-            elif GPIO_METHOD == "rpi_gpio":
-                self._play_note_rpi_gpio(frequency, duration, duty_cycle)
-            else:
-                print(f"🎵 播放音符 {note} ({frequency}Hz, {duration}s)")
-        elif note == 'REST':
+        """
+        播放單個音符 / Play a single note
+        
+        Args:
+            note: 音名（如 'C4'）或 NOTE_* 序號 / Note name (e.g. 'C4') or NOTE_* ordinal
+            duration: 持續時間（秒）/ Duration in seconds
+            duty_cycle: 責任週期 (%) / Duty cycle (%)
+        """
+        if note.__class__ is int:
+            frequency = NOTE_FREQ[note]
+            is_rest = note == NOTE_REST
+        else:
+            frequency = self.notes.get(note, 0)
+            is_rest = note == 'REST'
+        if frequency > 0:
+            self._play_freq(frequency, duration, duty_cycle)
+        elif is_rest:
             time.sleep(duration)
     
     def _play_note_lgpio(self, frequency, duration, duty_cycle):
         """使用 lgpio 播放音符"""
         try:
-            # 簡單的方波生成
-            period = 1.0 / frequency
-            half_period = period / 2
-            cycles = int(frequency * duration)
-            
-            for _ in range(cycles):
-                self.lgpio.gpio_write(self.chip, self.buzzer_pin, 1)
-                time.sleep(half_period * duty_cycle / 100)
-                self.lgpio.gpio_write(self.chip, self.buzzer_pin, 0)
-                time.sleep(half_period * (100 - duty_cycle) / 100)
-                
+            # 波形交給 lgpio 的 PWM 產生，不在 Python 中逐週期切換 / The waveform is generated by lgpio's PWM instead of toggling every cycle in Python
+            self.lgpio.tx_pwm(self.chip, self.buzzer_pin, frequency, duty_cycle)
+            time.sleep(duration)
         except Exception as e:
-            self.logger.error(f"lgpio 播放音符失敗: {e}")
+            self.logger.error("lgpio 播放音符失敗: %s", e)
+        finally:
+            # 無論如何都要靜音 / Always silence the buzzer
+            try:
+                self.lgpio.tx_pwm(self.chip, self.buzzer_pin, 0, 0)
+            except Exception:
+                pass
     
-    def _play_note_gpiozero(self, frequency, duration):
+    def _play_note_gpiozero(self, frequency, duration, duty_cycle=50):
         """使用 gpiozero 播放音符"""
         try:
-            # gpiozero 的 Buzzer 不支援頻率，使用簡單的開關
-            on_time = 1.0 / frequency / 2
-            cycles = int(frequency * duration)
-            
-            for _ in range(cycles):
-                self.gpio_buzzer.on()
-                time.sleep(on_time)
-                self.gpio_buzzer.off()
-                time.sleep(on_time)
-                
+            # PWMOutputDevice 的頻率即音高，value 為責任週期 / PWMOutputDevice frequency is the pitch, value is the duty cycle
+            self.gpio_buzzer.frequency = frequency
+            self.gpio_buzzer.value = duty_cycle / 100
+            time.sleep(duration)
         except Exception as e:
-            self.logger.error(f"gpiozero 播放音符失敗: {e}")
+            self.logger.error("gpiozero 播放音符失敗: %s", e)
+        finally:
+            try:
+                self.gpio_buzzer.value = 0
+            except Exception:
+                pass
     
     def _play_note_rpi_gpio(self, frequency, duration, duty_cycle):
         """使用 RPi.GPIO 播放音符"""
@@ -324,205 +423,453 @@ class GPIOControl:
                 time.sleep(duration)
                 self.buzzer_pwm.stop()
         except Exception as e:
-            self.logger.error(f"RPi.GPIO 播放音符失敗: {e}")
+            self.logger.error("RPi.GPIO 播放音符失敗: %s", e)
     
     def play_melody(self, melody, note_duration=0.3):
         """播放旋律"""
-        for note in melody:
-            self.play_note(note, note_duration)
-            time.sleep(0.05)  # 音符間的小間隔
+        # 音符間保留 0.05 秒的小間隔 / Keep a 0.05s gap between notes
+        notes = self.notes
+        self._play_steps(tuple((notes[note], note_duration, 0.05) for note in melody if note in notes))
+    
+    def _select_tone_player(self):
+        """
+        選擇音調播放後端 / Select tone playback backend
+        
+        Returns:
+            callable: 接受 (頻率, 持續時間) 的播放函數 / Playback function taking (frequency, duration)
+        """
+        play_freq = self._play_freq
+        return lambda frequency, duration: play_freq(frequency, duration, 50)
+    
+    def _build_sounds(self):
+        """
+        預先建立音效表 / Build the sound table once
+        
+        將每個音效的音符解析成 (頻率, 持續時間, 音符後間隔) 序列
+        Resolves every sound's notes into (frequency, duration, pause after) steps
+        
+        Returns:
+            dict: 音效名稱對應步驟序列 / Mapping of sound name to step tuple
+        """
+        def melody(notes, duration, pause=0.05):
+            return tuple((self.notes[note], duration, pause) for note in notes)
+        
+        return {
+            # 開機提示音 - Do Re Mi 上升音階 / Startup - rising Do Re Mi scale
+            'startup': melody(['C4', 'D4', 'E4', 'F4', 'G4'], 0.2),
+            # 倒數計時提示音 - 短促的中音 / Countdown - short mid tone
+            'countdown': melody(['G4'], 0.15, 0),
+            # 拍照提示音 - 快門聲模擬 / Capture - shutter imitation
+            'capture': ((self.notes['C5'], 0.1, 0.05), (self.notes['E5'], 0.1, 0)),
+            # 成功提示音 - 愉快的上升三和弦 / Success - cheerful rising triad
+            'success': melody(['C4', 'E4', 'G4', 'C5'], 0.25),
+            # 錯誤提示音 - 下降音階 / Error - falling scale
+            'error': melody(['B4', 'A4', 'G4', 'F4'], 0.2),
+            # 處理中提示音 - 輕柔的雙音循環 / Processing - soft two-tone loop
+            'processing': melody(['F4', 'A4', 'F4', 'A4'], 0.3),
+            # 手勢識別提示音 - 兩個快速音符 / Gesture detected - two quick notes
+            'gesture_detected': melody(['E4', 'G4'], 0.15),
+            # 開始列印提示音 - 機械感音效 / Print start - mechanical clicks
+            'print_start': tuple(
+                (self.notes[note], duration, 0)
+                for note, duration in zip(['D4', 'REST', 'D4', 'REST', 'D4'], [0.1, 0.05, 0.1, 0.05, 0.1])
+            ),
+            # 列印完成提示音 - 完成鈴聲 / Print complete - completion chime
+            'print_complete': melody(['G4', 'C5', 'E5', 'G4', 'C5'], 0.2),
+            # 模式切換提示音 - 簡短的音階 / Mode switch - short scale
+            'mode_switch': melody(['C4', 'E4', 'C4'], 0.15),
+            # 按鈕按下提示音 - 單音確認 / Button press - single confirmation tone
+            'button_press': melody(['A4'], 0.1, 0),
+            # 系統就緒提示音 - 無法送出和弦波形時的快速琶音 / System ready - quick arpeggio when no chord waveform can be sent
+            'system_ready': melody(['C4', 'E4', 'G4'], 0.17, 0),
+        }
+    
+    def _play_sound(self, name):
+        """
+        播放預先建立的音效 / Play a prebuilt sound
+        
+        Args:
+            name: 音效名稱 / Sound name
+        """
+        self._play_steps(self._sounds[name])
+    
+    def _play_steps_timed(self, steps):
+        """
+        逐音符播放步驟序列 / Play a step sequence note by note
+        
+        Args:
+            steps: (頻率, 持續時間, 音符後間隔) 序列 / Sequence of (frequency, duration, pause after)
+        """
+        play_tone = self._play_tone
+        sleep = time.sleep
+        for frequency, duration, pause in steps:
+            if frequency > 0:
+                play_tone(frequency, duration)
+            else:
+                sleep(duration)  # 休止符 / Rest
+            if pause:
+                sleep(pause)
+    
+    def _build_pulses(self, steps):
+        """
+        將步驟序列轉為 lgpio 脈衝 / Convert a step sequence into lgpio pulses
+        
+        同時記錄整段脈衝的總長度，之後播放時不必重算
+        Also records the total length of the pulse train so playback does not recompute it
+        
+        Args:
+            steps: (頻率, 持續時間, 音符後間隔) 序列 / Sequence of (frequency, duration, pause after)
+            
+        Returns:
+            tuple: (高電位微秒, 低電位微秒, 週期數) 序列 / Sequence of (on µs, off µs, cycles)
+        """
+        pulses = []
+        for frequency, duration, pause in steps:
+            if frequency > 0:
+                on_us, off_us = self._note_periods[frequency]
+                pulses.append((on_us, off_us, max(1, round(frequency * duration))))
+            elif duration > 0:
+                pulses.append((0, int(duration * 1_000_000), 1))  # 休止符 / Rest
+            if pause:
+                pulses.append((0, int(pause * 1_000_000), 1))
+        pulses = tuple(pulses)
+        self._pulse_seconds[pulses] = sum((on_us + off_us) * cycles for on_us, off_us, cycles in pulses) / 1_000_000
+        return pulses
+    
+    def _play_steps_lgpio(self, steps):
+        """
+        以單一 lgpio 脈衝佇列播放整段旋律 / Play a whole melody as one queued lgpio pulse train
+        
+        每個音符、休止符與間隔各佔一個 tx_pulse 佇列項目，由 lgpio 依序計時輸出，
+        Python 只需等待整段播放結束，音符之間不會因 sleep 而漂移。
+        佇列空間不足或排入失敗時退回逐音符播放
+        Every note, rest and gap becomes one tx_pulse queue entry that lgpio times back to back;
+        Python only waits for the whole melody, so notes no longer drift apart through sleep.
+        Falls back to per-note playback when the queue is too small or queueing fails
+        
+        Args:
+            steps: (頻率, 持續時間, 音符後間隔) 序列 / Sequence of (frequency, duration, pause after)
+        """
+        pulses = self._pulse_cache.get(steps)
+        if pulses is None:
+            pulses = self._pulse_cache[steps] = self._build_pulses(steps)
+        if not pulses:
+            return
+        
+        lgpio, chip, pin = self.lgpio, self.chip, self.buzzer_pin
+        try:
+            if lgpio.tx_room(chip, pin, lgpio.TX_PWM) < len(pulses):
+                self._play_steps_timed(steps)
+                return
+            for on_us, off_us, cycles in pulses:
+                lgpio.tx_pulse(chip, pin, on_us, off_us, 0, cycles)
+        except Exception as e:
+            self.logger.warning("lgpio 脈衝佇列失敗，改為逐音符播放: %s / lgpio pulse queue failed, playing note by note: %s", e, e)
+            try:
+                lgpio.tx_pulse(chip, pin, 0, 0)
+            except Exception:
+                pass
+            self._play_steps_timed(steps)
+            return
+        
+        # 一次睡到預計結束，再確認佇列已清空 / Sleep once until the expected end, then confirm the queue drained
+        time.sleep(self._pulse_seconds[pulses])
+        try:
+            while lgpio.tx_busy(chip, pin, lgpio.TX_PWM):
+                time.sleep(0.005)
+        except Exception:
+            pass
     
     # 音效方法（保持與您原版本相容）
     def startup_sound(self):
         """開機提示音 - Do Re Mi 上升音階"""
-        melody = ['C4', 'D4', 'E4', 'F4', 'G4']
-        self.play_melody(melody, 0.2)
+        self._play_sound('startup')
     
     def countdown_sound(self):
         """倒數計時提示音 - 短促的中音"""
-        self.play_note('G4', 0.15)
+        self._play_sound('countdown')
     
     def capture_sound(self):
         """拍照提示音 - 快門聲模擬"""
-        self.play_note('C5', 0.1)
-        time.sleep(0.05)
-        self.play_note('E5', 0.1)
+        self._play_sound('capture')
     
     def success_sound(self):
         """成功提示音 - 愉快的上升三和弦"""
-        melody = ['C4', 'E4', 'G4', 'C5']
-        self.play_melody(melody, 0.25)
+        self._play_sound('success')
     
     def error_sound(self):
         """錯誤提示音 - 下降音階"""
-        melody = ['B4', 'A4', 'G4', 'F4']
-        self.play_melody(melody, 0.2)
+        self._play_sound('error')
     
     def processing_sound(self):
         """處理中提示音 - 輕柔的雙音循環"""
-        melody = ['F4', 'A4', 'F4', 'A4']
-        self.play_melody(melody, 0.3)
+        self._play_sound('processing')
     
     def gesture_detected_sound(self):
         """手勢識別提示音 - 兩個快速音符"""
-        melody = ['E4', 'G4']
-        self.play_melody(melody, 0.15)
+        self._play_sound('gesture_detected')
     
     def print_start_sound(self):
         """開始列印提示音 - 機械感音效"""
-        melody = ['D4', 'REST', 'D4', 'REST', 'D4']
-        durations = [0.1, 0.05, 0.1, 0.05, 0.1]
-        for note, duration in zip(melody, durations):
-            self.play_note(note, duration)
+        self._play_sound('print_start')
     
     def print_complete_sound(self):
         """列印完成提示音 - 完成鈴聲"""
-        melody = ['G4', 'C5', 'E5', 'G4', 'C5']
-        self.play_melody(melody, 0.2)
+        self._play_sound('print_complete')
     
     def mode_switch_sound(self):
         """模式切換提示音 - 簡短的音階"""
-        melody = ['C4', 'E4', 'C4']
-        self.play_melody(melody, 0.15)
+        self._play_sound('mode_switch')
     
     def button_press_sound(self):
         """按鈕按下提示音 - 單音確認"""
-        self.play_note('A4', 0.1)
+        self._play_sound('button_press')
     
     def system_ready_sound(self):
         """系統就緒提示音 - 和諧的和弦"""
-        melody = ['C4', 'E4', 'G4']
-        # 同時播放和弦效果（快速連續播放）
-        for note in melody:
-            threading.Thread(target=self.play_note, args=(note, 0.5), daemon=True).start()
-            time.sleep(0.02)
-        time.sleep(0.5)
+        # 單一蜂鳴器無法由多個執行緒疊出和弦，lgpio 下改送預先混合的波形 / A single buzzer cannot layer threads into a chord, so lgpio sends a premixed waveform
+        if GPIO_METHOD == LGPIO and self._play_chord_lgpio(('C4', 'E4', 'G4'), 0.5):
+            return
+        self._play_sound('system_ready')
+    
+    def _chord_pulses(self, notes, duration, sample_rate=20000):
+        """
+        預先計算和弦的混合方波脈衝 / Precompute the mixed square-wave pulses of a chord
+        
+        將各音的 ±1 方波相加後取正負號，再以遊程編碼轉成 lgpio 脈衝
+        Sums the ±1 square waves of every note, keeps the sign, then run-length encodes it into lgpio pulses
+        
+        Args:
+            notes: 音符名稱序列 / Sequence of note names
+            duration: 持續時間（秒）/ Duration in seconds
+            sample_rate: 取樣率 (Hz) / Sample rate (Hz)
+            
+        Returns:
+            list: (電位, 微秒) 遊程 / (level, µs) runs
+        """
+        key = (notes, duration, sample_rate)
+        runs = self._pulse_cache.get(key)
+        if runs is not None:
+            return runs
+        
+        frequencies = [self.notes[note] for note in notes]
+        sample_us = 1_000_000 / sample_rate
+        runs = []
+        level, length = None, 0
+        for i in range(int(duration * sample_rate)):
+            t = i / sample_rate
+            total = sum(1 if (t * f) % 1.0 < 0.5 else -1 for f in frequencies)
+            bit = 1 if total > 0 else 0
+            if bit == level:
+                length += 1
+            else:
+                if level is not None:
+                    runs.append((level, max(1, round(length * sample_us))))
+                level, length = bit, 1
+        if level is not None:
+            runs.append((level, max(1, round(length * sample_us))))
+        runs.append((0, 1))  # 結束時保持低電位 / Finish low
+        
+        self._pulse_cache[key] = runs
+        return runs
+    
+    def _play_chord_lgpio(self, notes, duration):
+        """
+        以 lgpio 波形播放和弦 / Play a chord as an lgpio waveform
+        
+        Args:
+            notes: 音符名稱序列 / Sequence of note names
+            duration: 持續時間（秒）/ Duration in seconds
+            
+        Returns:
+            bool: 是否成功送出波形 / Whether the waveform was sent
+        """
+        lgpio, chip, pin = self.lgpio, self.chip, self.buzzer_pin
+        try:
+            # 單一腳位的佔用本身就是以它為首的群組，位元 0 對應蜂鳴器 / A single-pin claim is a group led by that pin, bit 0 is the buzzer
+            pulses = [lgpio.pulse(level, 1, delay) for level, delay in self._chord_pulses(notes, duration)]
+            lgpio.tx_wave(chip, pin, pulses)
+        except Exception as e:
+            self.logger.warning("lgpio 和弦波形失敗，改為琶音: %s / lgpio chord waveform failed, playing an arpeggio: %s", e, e)
+            return False
+        
+        time.sleep(duration)
+        try:
+            while lgpio.tx_busy(chip, pin, lgpio.TX_WAVE):
+                time.sleep(0.005)
+        except Exception:
+            pass
+        return True
     
     # 保留原有的基本功能
     def buzzer_on(self):
         """開啟蜂鳴器（基本音）"""
-        if GPIO_METHOD == "lgpio":
-            try:
-                self.lgpio.gpio_write(self.chip, self.buzzer_pin, 1)
-            except Exception as e:
-                self.logger.error(f"蜂鳴器開啟失敗: {e}")
-        elif GPIO_METHOD == "gpiozero":
-            try:
-                self.gpio_buzzer.on()
-            except Exception as e:
-                self.logger.error(f"蜂鳴器開啟失敗: {e}")
-        elif GPIO_METHOD == "rpi_gpio":
-            try:
-                if self.buzzer_pwm:
-                    self.buzzer_pwm.start(50)
-                    self.buzzer_pwm.ChangeFrequency(1000)
-            except Exception as e:
-                self.logger.error(f"蜂鳴器開啟失敗: {e}")
-        else:
-            print("🔊 蜂鳴器開啟 (模擬)")
+        try:
+            self._buzzer_on()
+        except Exception as e:
+            self.logger.error("蜂鳴器開啟失敗: %s", e)
     
     def buzzer_off(self):
         """關閉蜂鳴器"""
-        if GPIO_METHOD == "lgpio":
-            try:
-                self.lgpio.gpio_write(self.chip, self.buzzer_pin, 0)
-            except Exception as e:
-                self.logger.error(f"蜂鳴器關閉失敗: {e}")
-        elif GPIO_METHOD == "gpiozero":
-            try:
-                self.gpio_buzzer.off()
-            except Exception as e:
-                self.logger.error(f"蜂鳴器關閉失敗: {e}")
-        elif GPIO_METHOD == "rpi_gpio":
-            try:
-                if self.buzzer_pwm:
-                    self.buzzer_pwm.stop()
-            except Exception as e:
-                self.logger.error(f"蜂鳴器關閉失敗: {e}")
-        else:
-            print("🔊 蜂鳴器關閉 (模擬)")
+        try:
+            self._buzzer_off()
+        except Exception as e:
+            self.logger.error("蜂鳴器關閉失敗: %s", e)
     
     def buzz(self, duration):
         """使蜂鳴器發聲一段時間"""
+        if GPIO_METHOD == LGPIO and self._beep_lgpio(1, duration, 0):
+            return
         self.buzzer_on()
         time.sleep(duration)
         self.buzzer_off()
     
     def beep(self, times=1, duration=0.1, interval=0.1):
         """發出嗶嗶聲"""
+        if GPIO_METHOD == LGPIO and self._beep_lgpio(times, duration, interval):
+            return
         for i in range(times):
             self.buzz(duration)
             if i < times - 1:
                 time.sleep(interval)
     
-    def is_button_pressed(self):
-        """檢查按鈕是否被按下"""
-        if GPIO_METHOD == "lgpio":
-            try:
-                return not self.lgpio.gpio_read(self.chip, self.button_pin)
-            except:
-                return False
-        elif GPIO_METHOD == "gpiozero":
-            try:
-                return self.gpio_button.is_pressed
-            except:
-                return False
-        elif GPIO_METHOD == "rpi_gpio":
-            try:
-                return not self.GPIO.input(self.button_pin)
-            except:
-                return False
-        else:
+    def _beep_lgpio(self, times, duration, interval):
+        """
+        以單一 lgpio 脈衝播放整組嗶聲 / Play a whole beep pattern as one lgpio pulse
+        
+        tx_pulse 的週期數即嗶聲次數，lgpio 自行計時高低電位，Python 只等待一次
+        tx_pulse's cycle count is the number of beeps; lgpio times the on/off phases and Python waits once
+        
+        Args:
+            times: 嗶聲次數 / Number of beeps
+            duration: 每聲持續時間（秒）/ Length of each beep in seconds
+            interval: 嗶聲間隔（秒）/ Gap between beeps in seconds
+            
+        Returns:
+            bool: 是否成功送出 / Whether the pulse was sent
+        """
+        if times < 1:
+            return True
+        on_us = max(1, int(duration * 1_000_000))
+        # 最後一聲後的低電位不影響聲音，仍給予至少 1 微秒 / The low phase after the last beep is silent, still give it at least 1 µs
+        off_us = max(1, int(interval * 1_000_000))
+        try:
+            self.lgpio.tx_pulse(self.chip, self.buzzer_pin, on_us, off_us, 0, times)
+        except Exception as e:
+            self.logger.warning("lgpio 嗶聲脈衝失敗: %s / lgpio beep pulse failed: %s", e, e)
             return False
+        # 等到最後一聲結束，保持原本的阻塞語意 / Wait until the last beep ends to keep the original blocking behavior
+        time.sleep(times * duration + (times - 1) * interval)
+        return True
+    
+    def is_button_pressed(self, cache_read=True):
+        """
+        檢查按鈕是否被按下 / Check whether the button is pressed
+        
+        0.5 毫秒內的重複查詢直接回傳上次讀值，緊密輪詢時不會每次都進核心
+        Repeated queries within 0.5 ms return the previous reading, so tight polling does not hit the kernel every time
+        
+        Args:
+            cache_read: 是否允許使用快取讀值 / Whether a cached reading may be returned
+            
+        Returns:
+            bool: 是否按下 / Whether the button is pressed
+        """
+        now = time.monotonic_ns()
+        if cache_read and now - self._last_read_ns < 500_000:
+            return self._last_read_val
+        try:
+            value = self._read_button()
+        except:
+            value = False
+        self._last_read_ns, self._last_read_val = now, value
+        return value
     
     def wait_for_button_press(self, timeout=None):
-        """等待按鈕按下"""
-        if timeout:
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                if self.is_button_pressed():
-                    return True
-                time.sleep(0.1)
-            return False
-        else:
-            while not self.is_button_pressed():
-                time.sleep(0.1)
-            return True
+        """
+        等待按鈕按下 / Wait for a button press
+        
+        lgpio 與 gpiozero 阻塞等待邊緣事件，其餘後端以單調時鐘期限輪詢
+        lgpio and gpiozero block on edge events, other backends poll against a monotonic deadline
+        
+        Args:
+            timeout: 逾時秒數，None 表示一直等待 / Timeout in seconds, None waits forever
+            
+        Returns:
+            bool: 逾時前是否按下 / Whether the button was pressed before the timeout
+        """
+        timeout = timeout or None
+        
+        if GPIO_METHOD == LGPIO:
+            # 先清除再檢查目前狀態，避免漏掉兩者之間的按下 / Clear before checking the current level so a press in between is not lost
+            self._press_event.clear()
+            if self.is_button_pressed(cache_read=False):
+                return True
+            self._setup_lgpio_callback()
+            if self._lgpio_cb is not None:
+                return self._press_event.wait(timeout)
+        elif GPIO_METHOD == GPIOZERO:
+            try:
+                return bool(self.gpio_button.wait_for_press(timeout))
+            except Exception as e:
+                self.logger.error("gpiozero 等待按鈕失敗: %s", e)
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_button_pressed():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+        return True
     
     def setup_button_callback(self, callback_function):
         """設置按鈕的中斷回調函數"""
         self.button_callback = callback_function
         
-        if GPIO_METHOD == "lgpio":
+        if GPIO_METHOD == LGPIO:
             self._setup_lgpio_callback()
-        elif GPIO_METHOD == "gpiozero":
+        elif GPIO_METHOD == GPIOZERO:
             self._setup_gpiozero_callback()
-        elif GPIO_METHOD == "rpi_gpio":
+        elif GPIO_METHOD == RPI_GPIO:
             self._setup_rpi_gpio_callback()
         else:
             self._setup_simulation_callback()
     
     def _setup_lgpio_callback(self):
-        """設置 lgpio 按鈕回調"""
-        def monitor_button():
-            last_state = 1  # 按鈕預設為高電平（上拉）
-            while self.running:
-                try:
-                    current_state = self.lgpio.gpio_read(self.chip, self.button_pin)
-                    if current_state == 0 and last_state == 1:  # 按下（下降沿）
-                        self.logger.info("按鈕被按下 (lgpio)")
-                        if self.button_callback:
-                            self.button_callback(self.button_pin)
-                        time.sleep(0.3)  # 防抖動
-                    last_state = current_state
-                    time.sleep(0.01)  # 10ms 輪詢
-                except Exception as e:
-                    self.logger.error(f"按鈕監控錯誤: {e}")
-                    break
+        """設置 lgpio 按鈕回調（核心邊緣事件，不輪詢）/ Set up the lgpio button callback (kernel edge events, no polling)"""
+        if self._lgpio_cb is not None:
+            return
+        try:
+            self._lgpio_cb = self.lgpio.callback(self.chip, self.button_pin, self.lgpio.FALLING_EDGE, self._on_button_edge)
+            self.logger.info("lgpio 按鈕回調已設置")
+        except Exception as e:
+            self.logger.error("lgpio 按鈕回調設置失敗: %s", e)
+    
+    def _on_button_edge(self, chip, gpio, level, tick):
+        """
+        lgpio 下降沿回調 / lgpio falling-edge callback
         
-        self.button_thread = threading.Thread(target=monitor_button, daemon=True)
-        self.button_thread.start()
-        self.logger.info("lgpio 按鈕監控已啟動")
+        Args:
+            chip: GPIO chip 代碼 / GPIO chip handle
+            gpio: 引腳編號 / Pin number
+            level: 電位 / Level
+            tick: 事件時間（開機後奈秒）/ Event time (nanoseconds since boot)
+        """
+        # lgpio 只有一個回調執行緒，回調執行期間的按鍵會排隊，回調結束後才送達；這些舊按鍵不應觸發新的倒數
+        # lgpio has a single callback thread, so presses made while the callback runs are queued and delivered afterwards; those stale presses must not start a new countdown
+        if tick < self._ignore_before_ns:
+            return
+        # 300ms 防抖動 / 300 ms debounce
+        if self._last_tick is not None and tick - self._last_tick < 300_000_000:
+            return
+        self._last_tick = tick
+        self._press_event.set()
+        self.logger.info("按鈕被按下 (lgpio)")
+        if self.button_callback:
+            try:
+                self.button_callback(self.button_pin)
+            finally:
+                # tick 與 time.monotonic_ns() 同為 CLOCK_MONOTONIC / tick and time.monotonic_ns() are both CLOCK_MONOTONIC
+                self._ignore_before_ns = time.monotonic_ns()
     
     def _setup_gpiozero_callback(self):
         """設置 gpiozero 按鈕回調"""
@@ -535,10 +882,70 @@ class GPIOControl:
             self.gpio_button.when_pressed = button_pressed
             self.logger.info("gpiozero 按鈕回調已設置")
         except Exception as e:
-            self.logger.error(f"gpiozero 按鈕回調設置失敗: {e}")
+            self.logger.error("gpiozero 按鈕回調設置失敗: %s", e)
+    
+    def _setup_gpiod_callback(self):
+        """
+        使用 libgpiod 邊緣事件監控按鈕 / Monitor the button with libgpiod edge events
+        
+        執行緒在 select() 中阻塞等待核心送出的下降沿事件，閒置時不耗用 CPU
+        The thread blocks in select() on falling-edge events from the kernel, so it costs no CPU while idle
+        
+        Returns:
+            bool: 是否設置成功 / Whether setup succeeded
+        """
+        if not GPIOD_AVAILABLE:
+            return False
+        
+        try:
+            import gpiod
+            chip = gpiod.Chip('gpiochip0')
+            line = chip.get_line(self.button_pin)
+            line.request(consumer='gesture_camera', type=gpiod.LINE_REQ_EV_FALLING_EDGE)
+            self.button_line = line
+        except Exception as e:
+            self.logger.warning("libgpiod 按鈕設置失敗，改用 RPi.GPIO: %s / libgpiod button setup failed, falling back to RPi.GPIO: %s", e, e)
+            return False
+        
+        def monitor_button():
+            fd = line.event_get_fd()
+            debounce = 0.05  # 50ms 軟體防抖動 / 50 ms software debounce
+            last_press = 0.0
+            while self.running:
+                try:
+                    # 逾時只用來檢查是否該結束 / The timeout only serves to check for shutdown
+                    readable, _, _ = select.select([fd], [], [], 0.5)
+                    if not readable:
+                        continue
+                    event = line.event_read()
+                    # 回調執行期間排隊的舊事件直接丟棄（核心時間戳為 CLOCK_MONOTONIC）/ Drop stale events queued while the callback ran (kernel timestamps are CLOCK_MONOTONIC)
+                    if event.sec * 1_000_000_000 + event.nsec < self._ignore_before_ns:
+                        continue
+                    now = time.monotonic()
+                    if now - last_press < debounce:
+                        continue
+                    last_press = now
+                    self.logger.info("按鈕被按下 (libgpiod)")
+                    if self.button_callback:
+                        try:
+                            self.button_callback(self.button_pin)
+                        finally:
+                            self._ignore_before_ns = time.monotonic_ns()
+                except Exception as e:
+                    self.logger.error("按鈕監控錯誤: %s", e)
+                    break
+        
+        self.button_thread = threading.Thread(target=monitor_button, daemon=True)
+        self.button_thread.start()
+        self.logger.info("libgpiod 按鈕監控已啟動")
+        return True
     
     def _setup_rpi_gpio_callback(self):
         """設置 RPi.GPIO 按鈕回調"""
+        # 優先使用核心邊緣事件，不可用時改用 RPi.GPIO 的事件偵測 / Prefer kernel edge events, fall back to RPi.GPIO event detection
+        if self._setup_gpiod_callback():
+            return
+        
         try:
             self.GPIO.add_event_detect(
                 self.button_pin, 
@@ -548,7 +955,7 @@ class GPIOControl:
             )
             self.logger.info("RPi.GPIO 按鈕回調已設置")
         except Exception as e:
-            self.logger.error(f"設置按鈕回調時出錯: {e}")
+            self.logger.error("設置按鈕回調時出錯: %s", e)
     
     def _setup_simulation_callback(self):
         """設置模擬按鈕回調"""
@@ -570,19 +977,41 @@ class GPIOControl:
         """清理 GPIO 資源"""
         self.running = False
         
+        # 喚醒並結束閃爍執行緒 / Wake and stop the blink thread
+        if self._blink_thread is not None:
+            self._blink_q.put(None)
+            self._blink_thread.join(timeout=1)
+            self._blink_thread = None
+        
         # 等待按鈕監控線程結束
         if self.button_thread and self.button_thread.is_alive():
             self.button_thread.join(timeout=1)
         
-        if GPIO_METHOD == "lgpio":
+        # 取消 lgpio 邊緣回調 / Cancel the lgpio edge callback
+        if self._lgpio_cb is not None:
+            try:
+                self._lgpio_cb.cancel()
+            except Exception as e:
+                self.logger.error("lgpio 回調取消失敗: %s", e)
+            self._lgpio_cb = None
+        
+        # 釋放 libgpiod 按鈕線路 / Release the libgpiod button line
+        if self.button_line is not None:
+            try:
+                self.button_line.release()
+            except Exception as e:
+                self.logger.error("libgpiod 線路釋放失敗: %s", e)
+            self.button_line = None
+        
+        if GPIO_METHOD == LGPIO:
             try:
                 if self.chip is not None:
                     self.lgpio.gpiochip_close(self.chip)
                 self.logger.info("lgpio 資源已清理")
             except Exception as e:
-                self.logger.error(f"lgpio 清理失敗: {e}")
+                self.logger.error("lgpio 清理失敗: %s", e)
                 
-        elif GPIO_METHOD == "gpiozero":
+        elif GPIO_METHOD == GPIOZERO:
             try:
                 if self.gpio_led:
                     self.gpio_led.close()
@@ -592,23 +1021,23 @@ class GPIOControl:
                     self.gpio_button.close()
                 self.logger.info("gpiozero 資源已清理")
             except Exception as e:
-                self.logger.error(f"gpiozero 清理失敗: {e}")
+                self.logger.error("gpiozero 清理失敗: %s", e)
                 
-        elif GPIO_METHOD == "rpi_gpio":
+        elif GPIO_METHOD == RPI_GPIO:
             try:
                 if self.buzzer_pwm:
                     self.buzzer_pwm.stop()
                 self.GPIO.cleanup([self.led_pin, self.buzzer_pin, self.button_pin])
                 self.logger.info("RPi.GPIO 資源已清理")
             except Exception as e:
-                self.logger.error(f"RPi.GPIO 清理失敗: {e}")
+                self.logger.error("RPi.GPIO 清理失敗: %s", e)
         
         print("🧹 GPIO 資源已清理")
     
     def get_status(self):
         """獲取 GPIO 狀態"""
         return {
-            'method': GPIO_METHOD,
+            'method': GPIO_METHOD_NAMES[GPIO_METHOD],
             'available': GPIO_AVAILABLE,
             'hardware_mode': GPIO_AVAILABLE,
             'simulation_mode': not GPIO_AVAILABLE
@@ -0,0 +1,126 @@
+import logging
+import threading
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def average_hash(frame):
+    """
+    計算影格的 64 位元平均雜湊 / Compute a 64-bit average hash of a frame
+    
+    縮小成 8x8 灰階後與平均值比較，成本約數百微秒
+    Downsamples to 8x8 grayscale and compares against the mean, costing a few hundred microseconds
+    
+    Args:
+        frame: BGR 影格 / BGR frame
+        
+    Returns:
+        int: 64 位元雜湊值 / 64-bit hash value
+    """
+    small = cv2.resize(frame, (8, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = np.packbits(gray > gray.mean())
+    return int.from_bytes(bits.tobytes(), "big")
+
+def hamming_distance(hash_a, hash_b):
+    """
+    計算兩個雜湊值的相異位元數 / Count differing bits between two hashes
+    
+    Args:
+        hash_a: 雜湊值 / Hash value
+        hash_b: 雜湊值 / Hash value
+        
+    Returns:
+        int: 相異位元數 / Number of differing bits
+    """
+    return bin(hash_a ^ hash_b).count("1")
+
+class InferenceWorker:
+    """
+    推論工作執行緒 / Inference worker thread
+    
+    從相機擷取執行緒取得最新影格，在背景執行手勢推論，並將結果寫入單槽結果區（新結果覆寫舊結果）。
+    主迴圈只讀取結果，不會被模型推論阻塞
+    Takes the newest frame from the camera capture thread, runs gesture inference in the background
+    and publishes into a single-slot result area (new results overwrite old ones).
+    The main loop only reads results and is never blocked by model inference
+    """
+    def __init__(self, frame_source, predict_fn):
+        """
+        初始化推論工作執行緒 / Initialize inference worker thread
+        
+        Args:
+            frame_source: 提供 wait_frame(timeout) 的影格來源 / Frame source providing wait_frame(timeout)
+            predict_fn: 推論函數，輸入影格回傳結果，回傳 None 表示略過 / Inference function taking a frame, returns a result or None to skip
+        """
+        self.frame_source = frame_source
+        self.predict_fn = predict_fn
+        
+        # 單槽結果區：(序號, 結果) / Single-slot result area: (sequence, result)
+        self._result = (0, None)
+        self._stop = threading.Event()
+        self._thread = None
+        # 推論專用的雙影格緩衝區，避免相機環形緩衝區在推論期間被覆寫；
+        # 輪流使用，上一次推論交出的影格在下一次推論期間保持不變
+        # Private double frame buffer so the camera ring cannot overwrite a frame mid-inference;
+        # used alternately, so the frame handed out by one inference stays intact during the next
+        self._bufs = [None, None]
+        self._buf_index = 0
+    
+    def start(self):
+        """
+        啟動推論執行緒 / Start inference thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="InferenceWorker", daemon=True)
+        self._thread.start()
+        logger.info("推論工作執行緒已啟動 / Inference worker thread started")
+    
+    def _run(self):
+        """
+        推論迴圈 / Inference loop
+        """
+        wait_frame = self.frame_source.wait_frame
+        predict_fn = self.predict_fn
+        while not self._stop.is_set():
+            frame = wait_frame(timeout=0.5)
+            if frame is None:
+                continue
+            
+            # 複製到自己的緩衝區，尺寸不變時不重新配置 / Copy into our own buffer, reallocating only when the shape changes
+            index = self._buf_index = self._buf_index ^ 1
+            buf = self._bufs[index]
+            if buf is None or buf.shape != frame.shape:
+                buf = self._bufs[index] = np.empty_like(frame)
+            np.copyto(buf, frame)
+            
+            try:
+                result = predict_fn(buf)
+            except Exception as e:
+                logger.warning("背景推論錯誤: %s / Background inference error: %s", e, e)
+                continue
+            if result is not None:
+                # 元組賦值在 CPython 中是原子的 / Tuple assignment is atomic in CPython
+                self._result = (self._result[0] + 1, result)
+    
+    def latest(self):
+        """
+        獲取最新推論結果（不阻塞）/ Get the latest inference result (non-blocking)
+        
+        Returns:
+            tuple: (序號, 結果)，序號遞增表示有新結果 / (sequence, result), an increasing sequence means a new result
+        """
+        return self._result
+    
+    def stop(self):
+        """
+        停止推論執行緒 / Stop inference thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        logger.info("推論工作執行緒已停止 / Inference worker thread stopped")
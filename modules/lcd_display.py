@@ -4,19 +4,49 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import logging
 import time
+import threading
 import cv2
 import numpy as np
 import pygame
 from pygame.locals import *
 from modules.config import Config
 
-logging.basicConfig(
-    filename=os.path.join(Config().log_dir, 'app.log'),
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# 觸控介面處理的事件類型 / Event types handled by the touch interface
+HANDLED_EVENTS = [QUIT, MOUSEBUTTONDOWN, KEYDOWN]
+
+# 文字表面快取上限 / Maximum number of cached text surfaces
+TEXT_CACHE_SIZE = 128
+
+# 模式代碼，切換模式時解析一次，取代每影格的字串比對 / Mode ids, decoded once on mode switch instead of substring tests per frame
+MODE_MANUAL = 0
+MODE_TM = 1
+MODE_MP = 2
+
+# 模式代碼對應的模式名稱 / Mode name for each mode id
+MODE_NAMES = {
+    MODE_MANUAL: "Manual Mode",
+    MODE_TM: "Teachable Machine",
+    MODE_MP: "MediaPipe",
+}
+
+def decode_mode_id(mode_text):
+    """
+    將模式文字解碼為模式代碼 / Decode mode text into a mode id
+    
+    Args:
+        mode_text: 模式文字 / Mode text
+        
+    Returns:
+        int: MODE_TM、MODE_MP 或 MODE_MANUAL / MODE_TM, MODE_MP or MODE_MANUAL
+    """
+    if "Teachable Machine" in mode_text:
+        return MODE_TM
+    if "MediaPipe" in mode_text:
+        return MODE_MP
+    return MODE_MANUAL
+
 class LCDDisplay:
     """
     LCD 顯示控制類別 / LCD display control class
@@ -37,6 +67,10 @@ class LCDDisplay:
             self.screen = pygame.display.set_mode((config.screen_width, config.screen_height))
             pygame.display.set_caption("詩歌相機系統 / Poetry Camera System")  # 雙語標題 / Bilingual title
             
+            # 只讓需要處理的事件進入佇列（滑鼠移動、視窗焦點等直接在 SDL 層丟棄）/ Only queue events we handle (mouse motion, focus etc. are dropped inside SDL)
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(HANDLED_EVENTS)
+            
             # 初始化中文字體 / Initialize Chinese fonts
             self._setup_chinese_fonts()
             
@@ -50,28 +84,41 @@ class LCDDisplay:
             self.SUCCESS_COLOR = (100, 255, 100)  # 成功訊息顏色 / Success message color
             
             self.frame = None
+            # 已轉換好、可直接 blit 的相機畫面 / Camera frame converted and ready to blit
+            self._frame_surface = None
+            
+            # 有 OpenCL 時以 T-API (UMat) 在 GPU 上縮放與轉色 / With OpenCL, resize and convert on the GPU through the T-API (UMat)
+            self._use_umat = cv2.ocl.haveOpenCL()
+            if self._use_umat:
+                cv2.ocl.setUseOpenCL(True)
+                logger.info("啟用 OpenCL 畫面轉換 / OpenCL frame conversion enabled")
+            
             self.status_text = "系統就緒 / System Ready"
             self.ok_confidence = 0
             self.ya_confidence = 0
             self.none_confidence = 0
             self.current_mode = "手動模式 / Manual Mode"  # 預設模式改為雙語 / Default mode as bilingual
+            self.mode_id = MODE_MANUAL
             
             # 按鈕定義（雙語）/ Button definitions (bilingual)
             self.buttons = [
                 {
                     "name": "Teachable Machine", 
+                    "mode_id": MODE_TM,
                     "chinese": "Teachable Machine 手勢偵測", 
                     "english": "Teachable Machine Gesture Detection",
                     "rect": pygame.Rect(1100, 100, 600, 80)
                 },
                 {
                     "name": "MediaPipe", 
+                    "mode_id": MODE_MP,
                     "chinese": "MediaPipe 手勢偵測", 
                     "english": "MediaPipe Gesture Detection",
                     "rect": pygame.Rect(1100, 220, 600, 80)
                 },
                 {
                     "name": "Manual Mode", 
+                    "mode_id": MODE_MANUAL,
                     "chinese": "手動模式", 
                     "english": "Manual Mode",
                     "rect": pygame.Rect(1100, 340, 600, 80)
@@ -104,10 +151,61 @@ class LCDDisplay:
                 "處理失敗": "Processing Failed"
             }
             
+            # 預先組好的雙語狀態文字 / Prebuilt bilingual status strings
+            self._bilingual = {chinese: f"{chinese} / {english}" for chinese, english in self.status_messages.items()}
+            
+            # 左下角操作提示 / Operation tips in the bottom left
+            self.help_texts = [
+                "操作說明 / Instructions:",
+                "• 點擊右側按鈕切換模式 / Click right buttons to switch modes",
+                "• 手動模式下按空白鍵拍照 / Press spacebar in manual mode to take photo",
+                "• 按 ESC 鍵退出程式 / Press ESC to exit program"
+            ]
+            
+            # 文字表面快取，並預先渲染所有靜態文字 / Text surface cache, prewarmed with every static string
+            self._text_cache = {}
+            self._safe_render_text("等待相機畫面... / Waiting for camera...", self.font_medium, self.TEXT_COLOR)
+            for button in self.buttons:
+                self._safe_render_text(button["chinese"], self.font_medium, self.TEXT_COLOR)
+                self._safe_render_text(button["english"], self.font_small, self.TEXT_COLOR)
+            for help_text in self.help_texts:
+                self._safe_render_text(help_text, self.font_small, self.TEXT_COLOR)
+            
+            # 畫面區域與其繪製函數，只重繪標記為髒的區域 / Screen regions and their draw functions; only dirty regions are redrawn
+            width = config.screen_width
+            self._regions = {
+                'frame': pygame.Rect(46, 46, 808, 608),
+                'mode': pygame.Rect(856, 40, width - 856, 56),
+                'buttons': pygame.Rect(1100, 100, width - 1100, 370),
+                'status': pygame.Rect(0, 846, width, 108),
+            }
+            self._region_draw = {
+                'frame': self._draw_frame,
+                'mode': None,  # 模式文字已在靜態圖層中 / Mode text lives in the static layer
+                'buttons': self._draw_confidence,
+                'status': self._draw_status,
+            }
+            self._dirty = set(self._regions)
+            
+            # 事件輪詢節流：每個顯示週期最多處理一次 / Event polling throttle: at most once per display period
+            self._last_pump = 0.0
+            self._frame_period = 1.0 / getattr(config, 'display_hz', 60)
+            # 靜態背景與各模式的靜態圖層在第一次使用時建立 / The static background and per-mode static layers are built on first use
+            self._background = None
+            self._static_layers = {}
+            
+            # 背景轉換執行緒：縮放與轉色不佔用主執行緒 / Background conversion thread: resize and color conversion stay off the main thread
+            self._pending_frame = None
+            self._ready_surface = None
+            self._frame_event = threading.Event()
+            self._running = True
+            self._render_thread = threading.Thread(target=self._render_loop, name="LCDRender", daemon=True)
+            self._render_thread.start()
+            
             logger.info("LCD 顯示模組初始化成功 / LCD display module initialized successfully")
             
         except Exception as e:
-            logger.error(f"初始化 LCD 顯示模組時出錯: {e} / Error initializing LCD display module: {e}")
+            logger.error("初始化 LCD 顯示模組時出錯: %s / Error initializing LCD display module: %s", e, e)
             pygame.quit()
             raise
     
@@ -136,7 +234,7 @@ class LCDDisplay:
         for path in chinese_font_paths:
             if os.path.exists(path):
                 font_path = path
-                logger.info(f"找到中文字體: {path} / Found Chinese font: {path}")
+                logger.info("找到中文字體: %s / Found Chinese font: %s", path, path)
                 break
         
         try:
@@ -146,17 +244,19 @@ class LCDDisplay:
                 self.font_medium = pygame.font.Font(font_path, 36)
                 self.font_small = pygame.font.Font(font_path, 24)
                 self.font_tiny = pygame.font.Font(font_path, 18)
-                logger.info(f"成功載入中文字體: {os.path.basename(font_path)} / Successfully loaded Chinese font: {os.path.basename(font_path)}")
+                logger.info("成功載入中文字體: %s / Successfully loaded Chinese font: %s", os.path.basename(font_path), os.path.basename(font_path))
             else:
                 # 後備方案：使用系統字體 / Fallback: use system fonts
                 logger.warning("未找到中文字體，使用系統預設字體 / Chinese font not found, using system default fonts")
-                self.font_large = pygame.font.SysFont(['SimHei', 'WenQuanYi Zen Hei', 'Noto Sans CJK TC', 'DejaVu Sans'], 60)
-                self.font_medium = pygame.font.SysFont(['SimHei', 'WenQuanYi Zen Hei', 'Noto Sans CJK TC', 'DejaVu Sans'], 36)
-                self.font_small = pygame.font.SysFont(['SimHei', 'WenQuanYi Zen Hei', 'Noto Sans CJK TC', 'DejaVu Sans'], 24)
-                self.font_tiny = pygame.font.SysFont(['SimHei', 'WenQuanYi Zen Hei', 'Noto Sans CJK TC', 'DejaVu Sans'], 18)
+                # 只查詢一次系統字體資料庫，四種大小共用結果（找不到時為 None，即 pygame 預設字體）/ Query the system font database once and share the result across all four sizes (None, the pygame default, if nothing matches)
+                font_path = pygame.font.match_font(['SimHei', 'WenQuanYi Zen Hei', 'Noto Sans CJK TC', 'DejaVu Sans'])
+                self.font_large = pygame.font.Font(font_path, 60)
+                self.font_medium = pygame.font.Font(font_path, 36)
+                self.font_small = pygame.font.Font(font_path, 24)
+                self.font_tiny = pygame.font.Font(font_path, 18)
                 
         except Exception as e:
-            logger.error(f"載入中文字體失敗: {e} / Failed to load Chinese font: {e}")
+            logger.error("載入中文字體失敗: %s / Failed to load Chinese font: %s", e, e)
             # 最後後備方案 / Final fallback
             self.font_large = pygame.font.Font(None, 60)
             self.font_medium = pygame.font.Font(None, 36)
@@ -167,6 +267,32 @@ class LCDDisplay:
         """
         安全地渲染文字，處理中文顯示問題 / Safely render text, handle Chinese display issues
         
+        相同字體、文字與顏色的結果會被快取，靜態標籤只需光柵化一次
+        Results are cached per font, text and color, so static labels are rasterized only once
+        
+        Args:
+            text: 要渲染的文字 / Text to render
+            font: 字體 / Font
+            color: 顏色 / Color
+            
+        Returns:
+            pygame.Surface: 渲染後的文字表面 / Rendered text surface
+        """
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is not None:
+            return surface
+        surface = self._render_text_uncached(text, font, color)
+        # 超過上限時丟棄最早加入的項目 / Drop the oldest entry once the cache is full
+        if len(self._text_cache) >= TEXT_CACHE_SIZE:
+            del self._text_cache[next(iter(self._text_cache))]
+        self._text_cache[key] = surface
+        return surface
+    
+    def _render_text_uncached(self, text, font, color):
+        """
+        實際渲染文字 / Actually render the text
+        
         Args:
             text: 要渲染的文字 / Text to render
             font: 字體 / Font
@@ -188,7 +314,7 @@ class LCDDisplay:
             except:
                 return font.render("Display Error", True, color)
         except Exception as e:
-            logger.error(f"文字渲染錯誤: {e} / Text rendering error: {e}")
+            logger.error("文字渲染錯誤: %s / Text rendering error: %s", e, e)
             return font.render("Error", True, color)
     
     def _get_bilingual_text(self, chinese_text):
@@ -201,19 +327,88 @@ class LCDDisplay:
         Returns:
             str: 雙語文字 / Bilingual text
         """
-        english_text = self.status_messages.get(chinese_text, chinese_text)
-        return f"{chinese_text} / {english_text}"
+        text = self._bilingual.get(chinese_text)
+        if text is None:
+            text = f"{chinese_text} / {chinese_text}"
+        return text
+    
+    def _prepare_surface(self, frame):
+        """
+        將 BGR 影格轉成顯示用的 Surface / Convert a BGR frame into a display surface
+        
+        Args:
+            frame: BGR 相機影格 / BGR camera frame
+            
+        Returns:
+            pygame.Surface: 800x600 的畫面 / 800x600 surface
+        """
+        # 先縮放再轉色，減少轉換的像素數 / Resize before converting so fewer pixels are converted
+        if self._use_umat:
+            try:
+                # pygame 需要主記憶體陣列，因此轉換完才 get() / pygame needs a host array, so get() only after both steps
+                umat = cv2.resize(cv2.UMat(frame), (800, 600))
+                frame_rgb = cv2.cvtColor(umat, cv2.COLOR_BGR2RGB).get()
+                return pygame.image.frombuffer(frame_rgb, (800, 600), 'RGB')
+            except cv2.error as e:
+                # OpenCL 執行失敗時改回 CPU，不再重試 / If OpenCL fails, fall back to the CPU for good
+                self._use_umat = False
+                logger.warning("OpenCL 轉換失敗，改用 CPU: %s / OpenCL conversion failed, using CPU: %s", e, e)
+        frame_resized = cv2.resize(frame, (800, 600))
+        frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
+        # 列優先的 RGB 直接包成 Surface（共用記憶體），不需 swapaxes 轉置再複製 / Wrap the row-major RGB as a Surface (shared memory), no swapaxes transpose and copy
+        return pygame.image.frombuffer(frame_rgb, (800, 600), 'RGB')
+    
+    def _render_loop(self):
+        """
+        背景轉換迴圈，只處理最新影格（較慢時丟棄舊影格）/ Background conversion loop, always handles the newest frame (stale frames are dropped)
+        """
+        while self._running:
+            if not self._frame_event.wait(timeout=0.5):
+                continue
+            self._frame_event.clear()
+            frame = self._pending_frame
+            if frame is None:
+                continue
+            try:
+                self._ready_surface = self._prepare_surface(frame)
+            except Exception as e:
+                logger.warning("畫面轉換錯誤: %s / Frame conversion error: %s", e, e)
     
     def update_frame(self, frame):
         """
-        更新相機畫面 / Update camera frame
+        更新相機畫面（同步轉換）/ Update camera frame (synchronous conversion)
         
         Args:
             frame: 相機影格 / Camera frame
         """
-        self.frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if frame is not None else None
+        self.frame = frame
+        self._frame_surface = self._prepare_surface(frame) if frame is not None else None
+        self._dirty.add('frame')
         self._refresh_display()
     
+    def update_frame_async(self, frame):
+        """
+        更新相機畫面（非同步轉換）/ Update camera frame (asynchronous conversion)
+        
+        只記錄影格並喚醒轉換執行緒；主執行緒只負責貼上已轉換好的畫面
+        Only records the frame and wakes the conversion thread; the main thread just blits surfaces that are already converted
+        
+        Args:
+            frame: 相機影格 / Camera frame
+        """
+        if frame is None:
+            return
+        self.frame = frame
+        self._pending_frame = frame
+        self._frame_event.set()
+        
+        surface = self._ready_surface
+        if surface is not None:
+            self._ready_surface = None
+            self._frame_surface = surface
+            self._dirty.add('frame')
+            self._refresh_display()
+    
     def update_status(self, text):
         """
         更新狀態文字 / Update status text
@@ -222,11 +417,14 @@ class LCDDisplay:
             text: 狀態文字 / Status text
         """
         # 如果是純中文，轉換為雙語 / If pure Chinese, convert to bilingual
-        if '/' not in text and text in self.status_messages:
-            self.status_text = self._get_bilingual_text(text)
-        else:
-            self.status_text = text
-        logger.info(f"Status updated: {self.status_text}")
+        if '/' not in text:
+            text = self._bilingual.get(text, text)
+        # 文字沒變時不重繪 / Skip the redraw when the text is unchanged
+        if text == self.status_text:
+            return
+        self.status_text = text
+        logger.info("Status updated: %s", self.status_text)
+        self._dirty.add('status')
         self._refresh_display()
     
     def update_confidence(self, ok_confidence, ya_confidence, none_confidence):
@@ -238,10 +436,15 @@ class LCDDisplay:
             ya_confidence: YA 手勢信心度 / YA gesture confidence
             none_confidence: 無手勢信心度 / No gesture confidence
         """
+        if (ok_confidence, ya_confidence, none_confidence) == (self.ok_confidence, self.ya_confidence, self.none_confidence):
+            return
         self.ok_confidence = ok_confidence
         self.ya_confidence = ya_confidence
         self.none_confidence = none_confidence
-        self._refresh_display()
+        # 手動模式不顯示信心度 / Manual mode does not show confidence
+        if self.mode_id != MODE_MANUAL:
+            self._dirty.add('buttons')
+            self._refresh_display()
     
     def set_mode(self, mode):
         """
@@ -257,96 +460,173 @@ class LCDDisplay:
             "Manual Mode": "手動模式 / Manual Mode"
         }
         
-        self.current_mode = mode_mapping.get(mode, mode)
-        logger.info(f"Mode switched to: {mode}")
+        current_mode = mode_mapping.get(mode, mode)
+        # 模式沒變時不重繪 / Skip the redraw when the mode is unchanged
+        if current_mode == self.current_mode:
+            return
+        self.current_mode = current_mode
+        self.mode_id = decode_mode_id(self.current_mode)
+        logger.info("Mode switched to: %s", mode)
+        self._dirty.update(('buttons', 'mode'))
         self._refresh_display()
     
-    def _refresh_display(self):
+    def _build_background(self):
         """
-        刷新顯示畫面 / Refresh display
+        預先繪製與模式無關的背景（底色、操作提示、訊息框）/ Pre-render the mode-independent background (fill, operation tips, message box)
+        
+        Returns:
+            pygame.Surface: 與螢幕同尺寸的背景 / Background the size of the screen
         """
-        try:
-            self.screen.fill(self.BACKGROUND)
-            
-            # 左方相機畫面 (800x600) / Left camera frame (800x600)
-            if self.frame is not None:
-                frame_resized = cv2.resize(self.frame, (800, 600))
-                frame_surface = pygame.surfarray.make_surface(frame_resized.swapaxes(0, 1))
-                pos_x = 50
-                pos_y = 50
-                pygame.draw.rect(self.screen, self.FRAME_BORDER, (pos_x-2, pos_y-2, 804, 604), 4)  # 較粗的邊框 / Thicker border
-                self.screen.blit(frame_surface, (pos_x, pos_y))
-            else:
-                # 沒有畫面時顯示提示 / Show prompt when no frame
-                no_frame_rect = pygame.Rect(50, 50, 800, 600)
-                pygame.draw.rect(self.screen, (60, 60, 60), no_frame_rect)
-                pygame.draw.rect(self.screen, self.FRAME_BORDER, no_frame_rect, 4)
-                
-                no_frame_text = self._safe_render_text("等待相機畫面... / Waiting for camera...", self.font_medium, self.TEXT_COLOR)
-                text_rect = no_frame_text.get_rect(center=no_frame_rect.center)
-                self.screen.blit(no_frame_text, text_rect)
-            
-            # 右方按鈕與置信度 / Right buttons and confidence
-            for button in self.buttons:
-                # 檢查是否為當前模式 / Check if current mode
-                is_active = (button["chinese"] in self.current_mode or 
-                           button["english"] in self.current_mode or
-                           button["name"] in self.current_mode)
-                
-                bg_color = self.BUTTON_ACTIVE if is_active else self.BUTTON_INACTIVE
-                pygame.draw.rect(self.screen, bg_color, button["rect"], border_radius=10)  # 圓角按鈕 / Rounded button
-                
-                # 顯示雙語按鈕文字 / Display bilingual button text
-                button_text = self._safe_render_text(button["chinese"], self.font_medium, self.TEXT_COLOR)
-                text_rect = button_text.get_rect(center=button["rect"].center)
-                self.screen.blit(button_text, text_rect)
-                
-                # 顯示英文按鈕文字 / Display English button text
-                button_text_en = self._safe_render_text(button["english"], self.font_small, self.TEXT_COLOR)
-                text_rect_en = button_text_en.get_rect(center=(button["rect"].centerx, button["rect"].centery + 25))
-                self.screen.blit(button_text_en, text_rect_en)
-                
-                # 顯示置信度 / Display confidence
-                if button["name"] == "Teachable Machine" and "Teachable Machine" in self.current_mode:
-                    confidence_text = f"OK: {self.ok_confidence:.1f}% | YA: {self.ya_confidence:.1f}% | 無/None: {self.none_confidence:.1f}%"
-                    confidence_surface = self._safe_render_text(confidence_text, self.font_small, self.TEXT_COLOR)
-                    confidence_rect = confidence_surface.get_rect(topleft=(button["rect"].left, button["rect"].bottom + 10))
-                    self.screen.blit(confidence_surface, confidence_rect)
-                elif button["name"] == "MediaPipe" and "MediaPipe" in self.current_mode:
-                    confidence_text = f"OK: {self.ok_confidence:.1f}% | YA: {self.ya_confidence:.1f}%"
-                    confidence_surface = self._safe_render_text(confidence_text, self.font_small, self.TEXT_COLOR)
-                    confidence_rect = confidence_surface.get_rect(topleft=(button["rect"].left, button["rect"].bottom + 10))
-                    self.screen.blit(confidence_surface, confidence_rect)
+        background = pygame.Surface(self.screen.get_size()).convert()
+        background.fill(self.BACKGROUND)
+        
+        # 左下角顯示操作提示 / Display operation tips in bottom left
+        for i, help_text in enumerate(self.help_texts):
+            help_surface = self._safe_render_text(help_text, self.font_small, self.TEXT_COLOR)
+            help_rect = help_surface.get_rect(topleft=(50, 700 + i * 30))
+            background.blit(help_surface, help_rect)
+        
+        pygame.draw.rect(background, self.FRAME_BORDER, (450, 850, 1020, 100), 4)  # 訊息區背景框 / Message area background
+        return background
+    
+    def _static_layer(self):
+        """
+        獲取目前模式的靜態圖層 / Get the static layer for the current mode
+        
+        背景加上按鈕與模式文字，每種模式只繪製一次
+        Background plus buttons and mode text, drawn only once per mode
+        
+        Returns:
+            pygame.Surface: 靜態圖層 / Static layer
+        """
+        key = (self.mode_id, self.current_mode)
+        layer = self._static_layers.get(key)
+        if layer is None:
+            if self._background is None:
+                self._background = self._build_background()
+            layer = self._background.copy()
+            self._draw_buttons(layer)
+            self._draw_mode(layer)
+            self._static_layers[key] = layer
+        return layer
+    
+    def _draw_frame(self):
+        """
+        繪製左方相機畫面區 (800x600) / Draw the left camera frame region (800x600)
+        """
+        frame_surface = self._frame_surface
+        if frame_surface is not None:
+            pos_x = 50
+            pos_y = 50
+            pygame.draw.rect(self.screen, self.FRAME_BORDER, (pos_x-2, pos_y-2, 804, 604), 4)  # 較粗的邊框 / Thicker border
+            self.screen.blit(frame_surface, (pos_x, pos_y))
+        else:
+            # 沒有畫面時顯示提示 / Show prompt when no frame
+            no_frame_rect = pygame.Rect(50, 50, 800, 600)
+            pygame.draw.rect(self.screen, (60, 60, 60), no_frame_rect)
+            pygame.draw.rect(self.screen, self.FRAME_BORDER, no_frame_rect, 4)
             
-            # 右上角顯示當前模式 / Display current mode in top right
-            mode_text = f"當前模式 / Current Mode: {self.current_mode}"
-            mode_surface = self._safe_render_text(mode_text, self.font_small, self.TEXT_COLOR)
-            mode_rect = mode_surface.get_rect(topright=(self.config.screen_width - 50, 50))
-            self.screen.blit(mode_surface, mode_rect)
+            no_frame_text = self._safe_render_text("等待相機畫面... / Waiting for camera...", self.font_medium, self.TEXT_COLOR)
+            text_rect = no_frame_text.get_rect(center=no_frame_rect.center)
+            self.screen.blit(no_frame_text, text_rect)
+    
+    def _draw_buttons(self, surface):
+        """
+        繪製右方按鈕 / Draw the right buttons
+        
+        Args:
+            surface: 目標圖層 / Target layer
+        """
+        for button in self.buttons:
+            # 檢查是否為當前模式 / Check if current mode
+            is_active = button["mode_id"] == self.mode_id
             
-            # 底部狀態文字 / Bottom status text
-            status_surface = self._safe_render_text(self.status_text, self.font_medium, self.TEXT_COLOR)
-            status_rect = status_surface.get_rect(center=(self.config.screen_width // 2, 900))
-            pygame.draw.rect(self.screen, self.FRAME_BORDER, (450, 850, 1020, 100), 4)  # 訊息區背景框 / Message area background
-            self.screen.blit(status_surface, status_rect)
+            bg_color = self.BUTTON_ACTIVE if is_active else self.BUTTON_INACTIVE
+            pygame.draw.rect(surface, bg_color, button["rect"], border_radius=10)  # 圓角按鈕 / Rounded button
             
-            # 左下角顯示操作提示 / Display operation tips in bottom left
-            help_texts = [
-                "操作說明 / Instructions:",
-                "• 點擊右側按鈕切換模式 / Click right buttons to switch modes",
-                "• 手動模式下按空白鍵拍照 / Press spacebar in manual mode to take photo",
-                "• 按 ESC 鍵退出程式 / Press ESC to exit program"
-            ]
+            # 顯示雙語按鈕文字 / Display bilingual button text
+            button_text = self._safe_render_text(button["chinese"], self.font_medium, self.TEXT_COLOR)
+            text_rect = button_text.get_rect(center=button["rect"].center)
+            surface.blit(button_text, text_rect)
             
-            for i, help_text in enumerate(help_texts):
-                help_surface = self._safe_render_text(help_text, self.font_small, self.TEXT_COLOR)
-                help_rect = help_surface.get_rect(topleft=(50, 700 + i * 30))
-                self.screen.blit(help_surface, help_rect)
+            # 顯示英文按鈕文字 / Display English button text
+            button_text_en = self._safe_render_text(button["english"], self.font_small, self.TEXT_COLOR)
+            text_rect_en = button_text_en.get_rect(center=(button["rect"].centerx, button["rect"].centery + 25))
+            surface.blit(button_text_en, text_rect_en)
+    
+    def _draw_confidence(self):
+        """
+        在當前模式按鈕下方繪製置信度 / Draw the confidence below the active mode button
+        """
+        if self.mode_id == MODE_TM:
+            confidence_text = f"OK: {self.ok_confidence:.1f}% | YA: {self.ya_confidence:.1f}% | 無/None: {self.none_confidence:.1f}%"
+        elif self.mode_id == MODE_MP:
+            confidence_text = f"OK: {self.ok_confidence:.1f}% | YA: {self.ya_confidence:.1f}%"
+        else:
+            return
+        for button in self.buttons:
+            if button["mode_id"] == self.mode_id:
+                confidence_surface = self._safe_render_text(confidence_text, self.font_small, self.TEXT_COLOR)
+                confidence_rect = confidence_surface.get_rect(topleft=(button["rect"].left, button["rect"].bottom + 10))
+                self.screen.blit(confidence_surface, confidence_rect)
+    
+    def _draw_mode(self, surface):
+        """
+        繪製右上角的當前模式 / Draw the current mode in the top right
+        
+        Args:
+            surface: 目標圖層 / Target layer
+        """
+        mode_text = f"當前模式 / Current Mode: {self.current_mode}"
+        mode_surface = self._safe_render_text(mode_text, self.font_small, self.TEXT_COLOR)
+        mode_rect = mode_surface.get_rect(topright=(self.config.screen_width - 50, 50))
+        surface.blit(mode_surface, mode_rect)
+    
+    def _draw_status(self):
+        """
+        繪製底部狀態文字 / Draw the bottom status text
+        """
+        status_surface = self._safe_render_text(self.status_text, self.font_medium, self.TEXT_COLOR)
+        status_rect = status_surface.get_rect(center=(self.config.screen_width // 2, 900))
+        self.screen.blit(status_surface, status_rect)
+    
+    def _refresh_display(self):
+        """
+        刷新顯示畫面，只重繪有變動的區域 / Refresh display, redrawing only the regions that changed
+        
+        每個區域先以目前模式的靜態圖層擦除，再畫上動態內容，最後只把這些矩形送到螢幕
+        Each region is wiped from the current mode's static layer, the dynamic content is drawn on top,
+        then only those rectangles are pushed to the screen
+        """
+        dirty = self._dirty
+        if not dirty:
+            return
+        try:
+            first = self._background is None
+            static = self._static_layer()
+            if first:
+                # 第一次繪製整個畫面 / Draw the whole screen the first time
+                self.screen.blit(static, (0, 0))
+                for draw in self._region_draw.values():
+                    if draw is not None:
+                        draw()
+                dirty.clear()
+                pygame.display.flip()
+                return
             
-            pygame.display.flip()
+            rects = []
+            for name in tuple(dirty):
+                rect = self._regions[name]
+                self.screen.blit(static, rect, rect)
+                draw = self._region_draw[name]
+                if draw is not None:
+                    draw()
+                rects.append(rect)
+            dirty.clear()
+            pygame.display.update(rects)
             
         except Exception as e:
-            logger.error(f"刷新顯示時出錯: {e} / Error refreshing display: {e}")
+            logger.error("刷新顯示時出錯: %s / Error refreshing display: %s", e, e)
     
     def handle_touch_events(self, button_callback=None):
         """
@@ -355,29 +635,42 @@ class LCDDisplay:
         Args:
             button_callback: 按鈕回調函數 / Button callback function
         """
-        for event in pygame.event.get():
+        # 距上次輪詢未滿一個顯示週期就直接返回，事件仍留在佇列中 / Return early within one display period of the last poll; events stay queued
+        now = time.monotonic()
+        if now - self._last_pump < self._frame_period:
+            return
+        self._last_pump = now
+        
+        # 只批次取出處理的事件類型 / Drain only the handled event types in one batch
+        for event in pygame.event.get(HANDLED_EVENTS):
             if event.type == QUIT:
                 pygame.quit()
                 sys.exit()
             elif event.type == MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
+                pos = event.pos  # 移動事件已封鎖，直接使用點擊事件座標 / Motion events are blocked, use the click position itself
                 for button in self.buttons:
                     if button["rect"].collidepoint(pos):
                         self.set_mode(button["name"])
-                        logger.info(f"Clicked button: {button['name']}")
+                        logger.info("Clicked button: %s", button['name'])
             elif event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
                     pygame.quit()
                     sys.exit()
-                elif event.key == K_SPACE and button_callback and ("手動" in self.current_mode or "Manual" in self.current_mode):
+                elif event.key == K_SPACE and button_callback and self.mode_id == MODE_MANUAL:
                     button_callback(None)
     
     def cleanup(self):
         """
         清理資源 / Cleanup resources
         """
+        # 停止背景轉換執行緒 / Stop the background conversion thread
+        self._running = False
+        self._frame_event.set()
+        if self._render_thread.is_alive():
+            self._render_thread.join(timeout=1)
+        
         try:
             pygame.quit()
             logger.info("LCD 顯示模組資源已釋放 / LCD display module resources released")
         except Exception as e:
-            logger.error(f"清理 LCD 顯示模組資源時出錯: {e} / Error cleaning up LCD display module resources: {e}")
+            logger.error("清理 LCD 顯示模組資源時出錯: %s / Error cleaning up LCD display module resources: %s", e, e)
@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import logging
+import threading
+from modules.config import Config
+
+# 嘗試導入 llama-cpp-python / Try to import llama-cpp-python
+try:
+    from llama_cpp import Llama
+    LLAMA_AVAILABLE = True
+except ImportError:
+    LLAMA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 本地模型推論參數：短提示詞只需小上下文，詩歌長度與 DeepSeek 請求相近
+# Local inference parameters: a short prompt needs only a small context, poem length close to the DeepSeek request
+LOCAL_POET_CTX = 512
+LOCAL_POET_BATCH = 64
+LOCAL_POET_MAX_TOKENS = 200
+
+# 已載入的模型，每個行程只載入一次 / Loaded model, loaded once per process
+_llm = None
+_llm_path = None
+# Llama 物件不是執行緒安全的，載入與推論都需持鎖 / Llama objects are not thread-safe, loading and inference both hold the lock
+_llm_lock = threading.Lock()
+
+def is_available(config: Config):
+    """
+    檢查本地詩人模型是否可用 / Check whether the local poet model is usable
+    
+    Args:
+        config: 配置物件 / Configuration object
+    
+    Returns:
+        bool: llama-cpp-python 已安裝且模型檔案存在 / llama-cpp-python is installed and the model file exists
+    """
+    return LLAMA_AVAILABLE and bool(config.local_poet_model) and os.path.exists(config.local_poet_model)
+
+def _get_model(config: Config):
+    """
+    載入 GGUF 量化模型，路徑未變更時重用（呼叫者需持有 _llm_lock）/ Load the quantized GGUF model, reused while the path is unchanged (caller holds _llm_lock)
+    
+    Args:
+        config: 配置物件 / Configuration object
+    
+    Returns:
+        Llama: 模型物件 / Model object
+    """
+    global _llm, _llm_path
+    if _llm is None or _llm_path != config.local_poet_model:
+        logger.info("載入本地詩人模型 / Loading local poet model: %s", config.local_poet_model)
+        _llm = Llama(
+            model_path=config.local_poet_model,
+            n_ctx=LOCAL_POET_CTX,
+            n_threads=os.cpu_count() or 4,
+            n_batch=LOCAL_POET_BATCH,
+            verbose=False,
+        )
+        _llm_path = config.local_poet_model
+    return _llm
+
+def generate(system_prompt, user_prompt, config: Config):
+    """
+    使用本地小模型生成新詩（阻塞，應在執行緒中呼叫）/ Generate a poem with the local small model (blocking, call from a worker thread)
+    
+    Args:
+        system_prompt: 系統提示詞 / System prompt
+        user_prompt: 使用者提示詞（照片分析 JSON）/ User prompt (photo analysis JSON)
+        config: 配置物件 / Configuration object
+    
+    Returns:
+        str: 生成的詩歌，失敗時返回 None / Generated poem, None on failure
+    """
+    if not is_available(config):
+        return None
+    
+    try:
+        with _llm_lock:
+            result = _get_model(config).create_chat_completion(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                max_tokens=LOCAL_POET_MAX_TOKENS,
+            )
+        poem = result['choices'][0]['message']['content'].strip()
+        return poem or None
+    except Exception as e:
+        logger.warning("本地詩人模型生成失敗 / Local poet model generation failed: %s", e)
+        return None
@@ -6,15 +6,27 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import logging
+import math
 from modules.config import Config
 
-logging.basicConfig(
-    filename=os.path.join(Config().log_dir, 'app.log'),
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# OK 手勢拇指與食指的最大距離（正規化座標）/ Maximum thumb-index distance for the OK gesture (normalized coordinates)
+OK_MAX_DIST = 0.05
+OK_MAX_DIST_SQ = OK_MAX_DIST * OK_MAX_DIST
+
+# MediaPipe 輸入寬度上限，高度依比例縮放 / Maximum MediaPipe input width, height follows the aspect ratio
+MP_INPUT_WIDTH = 320
+
+# MediaPipe Hands 關鍵點索引（與 HandLandmark 相同）/ MediaPipe Hands landmark indices (same as HandLandmark)
+NUM_LANDMARKS = 21
+THUMB_TIP = 4
+INDEX_TIP = 8
+# 依序為食指、中指、無名指、小指 / Index, middle, ring and pinky, in that order
+FINGER_TIPS = np.array([8, 12, 16, 20])
+FINGER_PIPS = np.array([6, 10, 14, 18])
+FINGER_MCPS = np.array([5, 9, 13, 17])
+
 class MediaPipeGestureRecognizer:
     """
     MediaPipe 手勢識別器 / MediaPipe gesture recognizer
@@ -32,12 +44,21 @@ class MediaPipeGestureRecognizer:
         self.config = config
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
-        # 初始化手部檢測 / Initialize hand detection
+        # 初始化手部檢測：輕量關鍵點模型，較低的追蹤門檻讓手掌偵測器少跑幾次 /
+        # Initialize hand detection: lite landmark model, a lower tracking threshold keeps the palm detector from rerunning as often
         self.hands = self.mp_hands.Hands(
+            static_image_mode=False,
             max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
+            model_complexity=0,
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.3
         )
+        # 骨骼繪製設定只建立一次 / Skeleton drawing settings are built once
+        self._connections = self.mp_hands.HAND_CONNECTIONS
+        self._landmark_spec = self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=4)
+        self._connection_spec = self.mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2)
+        # 預先配置的 RGB 輸入緩衝區 / Preallocated RGB input buffer
+        self._rgb_buf = None
         logger.info("MediaPipe Hands 初始化成功 / MediaPipe Hands initialized successfully")
 
     def preprocess_frame(self, frame):
@@ -48,36 +69,17 @@ class MediaPipeGestureRecognizer:
             frame: 輸入影格 / Input frame
             
         Returns:
-            numpy.ndarray: RGB 格式的影格 / Frame in RGB format
-        """
-        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-    def calculate_distance(self, point1, point2):
-        """
-        計算兩個關鍵點之間的歐氏距離 / Calculate Euclidean distance between two keypoints
-        
-        Args:
-            point1: 第一個關鍵點 / First keypoint
-            point2: 第二個關鍵點 / Second keypoint
-            
-        Returns:
-            float: 兩點之間的距離 / Distance between two points
+            numpy.ndarray: RGB 格式的影格（共用緩衝區，唯讀）/ Frame in RGB format (shared read-only buffer)
         """
-        return np.sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2)
-
-    def is_finger_extended(self, tip, pip, mcp):
-        """
-        判斷手指是否伸直（基於關鍵點角度）/ Determine if finger is extended (based on keypoint angles)
-        
-        Args:
-            tip: 指尖關鍵點 / Fingertip keypoint
-            pip: 近端指間關節關鍵點 / Proximal interphalangeal joint keypoint
-            mcp: 掌指關節關鍵點 / Metacarpophalangeal joint keypoint
-            
-        Returns:
-            bool: 手指是否伸直 / Whether finger is extended
-        """
-        return (tip.y < pip.y) and (pip.y < mcp.y)
+        # 尺寸不變時重用同一個緩衝區 / Reuse the same buffer while the size is unchanged
+        rgb = self._rgb_buf
+        if rgb is None or rgb.shape != frame.shape:
+            rgb = self._rgb_buf = np.empty_like(frame)
+        rgb.flags.writeable = True
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        # 唯讀時 MediaPipe 直接引用影像而不複製 / MediaPipe references a read-only image instead of copying it
+        rgb.flags.writeable = False
+        return rgb
 
     def predict(self, frame):
         """
@@ -87,61 +89,58 @@ class MediaPipeGestureRecognizer:
             frame: 輸入影格 / Input frame
             
         Returns:
-            tuple: (OK信心度, YA信心度, None信心度, 標記影格) / (OK confidence, YA confidence, None confidence, annotated frame)
+            tuple: (OK信心度, YA信心度, None信心度, 標記影格)，未偵測到手時標記影格即輸入影格 /
+                (OK confidence, YA confidence, None confidence, annotated frame), the annotated frame is the input frame when no hand is found
         """
         try:
-            rgb_frame = self.preprocess_frame(frame)
+            # 縮小後再交給 MediaPipe；關鍵點座標已正規化，與輸入解析度無關 / Downscale before MediaPipe; landmarks are normalized, so they do not depend on input resolution
+            height, width = frame.shape[:2]
+            if width > MP_INPUT_WIDTH:
+                small_size = (MP_INPUT_WIDTH, max(1, round(height * MP_INPUT_WIDTH / width)))
+                small = cv2.resize(frame, small_size, interpolation=cv2.INTER_AREA)
+            else:
+                small = frame
+            rgb_frame = self.preprocess_frame(small)
             results = self.hands.process(rgb_frame)
             ok_confidence, ya_confidence = 0, 0
-            annotated_frame = frame.copy()
+            # 沒偵測到手時不繪製，直接回傳原影格 / Nothing is drawn without a hand, so the input frame is returned as is
+            annotated_frame = frame
 
             if results.multi_hand_landmarks:
+                annotated_frame = frame.copy()
                 for hand_landmarks in results.multi_hand_landmarks:
                     # 繪製骨骼標記 / Draw skeleton landmarks
                     self.mp_drawing.draw_landmarks(
                         annotated_frame,
                         hand_landmarks,
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=4),
-                        self.mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2)
+                        self._connections,
+                        self._landmark_spec,
+                        self._connection_spec
                     )
 
-                    # 獲取關鍵點 / Get keypoints
-                    landmarks = hand_landmarks.landmark
-                    thumb_tip = landmarks[self.mp_hands.HandLandmark.THUMB_TIP]
-                    index_tip = landmarks[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                    middle_tip = landmarks[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-                    ring_tip = landmarks[self.mp_hands.HandLandmark.RING_FINGER_TIP]
-                    pinky_tip = landmarks[self.mp_hands.HandLandmark.PINKY_TIP]
-                    index_pip = landmarks[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]
-                    middle_pip = landmarks[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]
-                    ring_pip = landmarks[self.mp_hands.HandLandmark.RING_FINGER_PIP]
-                    pinky_pip = landmarks[self.mp_hands.HandLandmark.PINKY_PIP]
-                    index_mcp = landmarks[self.mp_hands.HandLandmark.INDEX_FINGER_MCP]
-                    middle_mcp = landmarks[self.mp_hands.HandLandmark.MIDDLE_FINGER_MCP]
-                    ring_mcp = landmarks[self.mp_hands.HandLandmark.RING_FINGER_MCP]
-                    pinky_mcp = landmarks[self.mp_hands.HandLandmark.PINKY_MCP]
-
+                    # 一次把 21 個關鍵點的 (x, y) 複製成陣列 / Copy the (x, y) of all 21 keypoints into one array
+                    pts = np.fromiter(
+                        (v for lm in hand_landmarks.landmark for v in (lm.x, lm.y)),
+                        dtype=np.float32, count=NUM_LANDMARKS * 2
+                    ).reshape(NUM_LANDMARKS, 2)
+                    
+                    # 四指同時判斷是否伸直：[食指, 中指, 無名指, 小指] / Check all four fingers at once: [index, middle, ring, pinky]
+                    tip_y, pip_y, mcp_y = pts[FINGER_TIPS, 1], pts[FINGER_PIPS, 1], pts[FINGER_MCPS, 1]
+                    index_extended, middle_extended, ring_extended, pinky_extended = ((tip_y < pip_y) & (pip_y < mcp_y)).tolist()
+                    
                     # OK 手勢：拇指與食指接近，其他手指伸直 / OK gesture: thumb and index finger close, other fingers extended
-                    thumb_index_dist = self.calculate_distance(thumb_tip, index_tip)
-                    max_dist = 0.05  # 假設影格已正規化 / Assuming frame is normalized
-                    if thumb_index_dist < max_dist:
-                        index_extended = self.is_finger_extended(index_tip, index_pip, index_mcp)
-                        middle_extended = self.is_finger_extended(middle_tip, middle_pip, middle_mcp)
-                        ring_extended = self.is_finger_extended(ring_tip, ring_pip, ring_mcp)
-                        pinky_extended = self.is_finger_extended(pinky_tip, pinky_pip, pinky_mcp)
+                    # 以平方距離比較，只有符合時才開根號 / Compare squared distances and take the root only on a match
+                    dx, dy = (pts[THUMB_TIP] - pts[INDEX_TIP]).tolist()
+                    thumb_index_dist_sq = dx * dx + dy * dy
+                    if thumb_index_dist_sq < OK_MAX_DIST_SQ:
                         if middle_extended and ring_extended and pinky_extended and not index_extended:
-                            ok_confidence = (1 - thumb_index_dist / max_dist) * 100
+                            ok_confidence = (1 - math.sqrt(thumb_index_dist_sq) / OK_MAX_DIST) * 100
                             ya_confidence = 0
                         else:
                             ok_confidence = 0
                             ya_confidence = 0
                     else:
                         # YA 手勢：食指與中指伸直，其他手指捲曲 / YA gesture: index and middle fingers extended, other fingers curled
-                        index_extended = self.is_finger_extended(index_tip, index_pip, index_mcp)
-                        middle_extended = self.is_finger_extended(middle_tip, middle_pip, middle_mcp)
-                        ring_extended = self.is_finger_extended(ring_tip, ring_pip, ring_mcp)
-                        pinky_extended = self.is_finger_extended(pinky_tip, pinky_pip, pinky_mcp)
                         if index_extended and middle_extended and not ring_extended and not pinky_extended:
                             ya_confidence = 100  # 簡單假設 / Simple assumption
                             ok_confidence = 0
@@ -150,11 +149,12 @@ class MediaPipeGestureRecognizer:
                             ya_confidence = 0
 
             none_confidence = 100 - max(ok_confidence, ya_confidence)
-            logger.debug(f"MediaPipe 手勢預測: OK={ok_confidence:.1f}%, YA={ya_confidence:.1f}%, None={none_confidence:.1f}% / MediaPipe gesture prediction: OK={ok_confidence:.1f}%, YA={ya_confidence:.1f}%, None={none_confidence:.1f}%")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("MediaPipe 手勢預測: OK=%.1f%%, YA=%.1f%%, None=%.1f%% / MediaPipe gesture prediction: OK=%.1f%%, YA=%.1f%%, None=%.1f%%", ok_confidence, ya_confidence, none_confidence, ok_confidence, ya_confidence, none_confidence)
             return ok_confidence, ya_confidence, none_confidence, annotated_frame
 
         except Exception as e:
-            logger.error(f"MediaPipe 手勢預測失敗: {e} / MediaPipe gesture prediction failed: {e}")
+            logger.error("MediaPipe 手勢預測失敗: %s / MediaPipe gesture prediction failed: %s", e, e)
             return 0, 0, 100, frame
 
     def cleanup(self):
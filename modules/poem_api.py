@@ -6,21 +6,49 @@ import base64
 import requests
 import json
 import logging
+import asyncio
+import functools
+import random
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import io
 import cv2
 import numpy as np
 from datetime import datetime
 from modules.config import Config
+from modules.inference_worker import average_hash, hamming_distance
+from modules import local_poet
 
 # 嘗試導入 OpenAI 庫，如果不存在則提供模擬函數
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, APIError, APIConnectionError, APIStatusError, RateLimitError
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     print("警告: OpenAI 庫未安裝，將使用模擬模式")
 
+# httpx 隨 openai 一起安裝，用於非同步呼叫 DeepSeek；不存在時改在執行緒中用 requests
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# msgspec 可在 C 中同時完成 JSON 解碼與格式驗證；不存在時使用 json + 手動檢查
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+    
+    class AnalysisResult(msgspec.Struct, forbid_unknown_fields=True):
+        """照片分析結果的格式"""
+        description: str
+        story: str
+        items: list[str]
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
 # 嘗試導入 python-dotenv
 try:
     from dotenv import load_dotenv
@@ -28,9 +56,16 @@ try:
 except ImportError:
     DOTENV_AVAILABLE = False
 
+_logging_ready = False
+
 # 配置日誌
 def setup_logging(config):
-    """設置日誌"""
+    """設置日誌（每個行程只執行一次）"""
+    global _logging_ready
+    if _logging_ready:
+        return
+    _logging_ready = True
+    
     log_levels = {
         'DEBUG': logging.DEBUG,
         'INFO': logging.INFO,
@@ -48,6 +83,212 @@ def setup_logging(config):
 
 logger = logging.getLogger(__name__)
 
+DEEPSEEK_URL = "https://api.deepseek.com/v1/chat/completions"
+
+# 同時進行的 API 請求上限 / Maximum number of API requests in flight
+API_CONCURRENCY = 4
+
+# API 請求可能拋出的錯誤 / Errors an API request may raise
+_HTTP_ERRORS = ((requests.exceptions.RequestException,)
+                + ((httpx.HTTPError,) if HTTPX_AVAILABLE else ())
+                + ((APIError,) if OPENAI_AVAILABLE else ()))
+
+# 分開連線與讀取逾時，連線卡住時能快速失敗 / Separate connect and read timeouts so hung connects fail fast
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 25
+API_TIMEOUT = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT) if HTTPX_AVAILABLE else CONNECT_TIMEOUT + READ_TIMEOUT
+
+# 指數退避上限（秒）/ Exponential backoff cap (seconds)
+RETRY_MAX_DELAY = 30
+
+def _is_retriable(error):
+    """判斷錯誤是否值得重試：逾時、連線錯誤、429 與 5xx 可重試，其他 4xx（金鑰錯誤等）直接失敗"""
+    if OPENAI_AVAILABLE:
+        if isinstance(error, (APIConnectionError, RateLimitError)):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code >= 500
+    if HTTPX_AVAILABLE and isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    # 使用 Structured Outputs 後格式錯誤只會來自拒答或截斷，重試也無用
+    # With Structured Outputs a malformed reply only comes from a refusal or truncation, which a retry won't fix
+    if isinstance(error, ValueError):
+        return False
+    # 其餘網路錯誤都重試 / Other network errors are retried
+    return True
+
+def _backoff_delay(attempt, base_delay):
+    """指數退避加隨機抖動（full jitter）"""
+    return random.uniform(0, min(RETRY_MAX_DELAY, base_delay * 2 ** attempt))
+
+# 照片分析快取：以平均雜湊比對相同或幾乎相同的照片，避免重複呼叫 OpenAI
+# Analysis cache: matches identical or near-identical photos by average hash to skip repeat OpenAI calls
+ANALYSIS_CACHE_FILE = ".analysis_cache.json"
+ANALYSIS_CACHE_MAX_DISTANCE = 6
+ANALYSIS_CACHE_TTL = 7 * 24 * 3600
+ANALYSIS_CACHE_SIZE = 256
+# 修改分析提示詞時需遞增，使舊快取失效 / Bump when the analysis prompt changes to invalidate old entries
+ANALYSIS_PROMPT_VERSION = 2
+
+_analysis_cache = None
+
+# 詩歌語義快取：以分析結果的字元雙字母組向量做餘弦相似度比對，相近的分析重用先前的詩歌
+# Poem semantic cache: cosine similarity over character-bigram vectors of the analysis reuses earlier poems
+POEM_CACHE_FILE = ".poem_cache.npz"
+POEM_EMBED_DIM = 1024
+
+_poem_cache = None
+
+# OpenAI "low" detail 會在伺服器端縮小到 512x512，先在本地縮小以減少編碼與上傳量
+LOW_DETAIL_SIZE = 512
+
+# 固定的系統提示詞放在訊息最前面，每次請求位元組完全相同，讓 OpenAI/DeepSeek 的提示詞快取生效；
+# 變動內容（圖片、分析結果）只放在最後的 user 訊息中
+VISION_SYSTEM_PROMPT = (
+    "你是一個失明的詩人的助手，透過你的眼睛與你的描述感受這個世界。請分析圖片內容並返回以下嚴格 JSON 格式的回應：\n"
+    "{\"description\": \"場景、手勢或情感的描述（4-6 句）\", \"story\": \"圖片背後可能的簡短故事（50-100 字）\", \"items\": [\"物品1\", \"物品2\", ...]}\n"
+    "確保回應是有效的 JSON 格式，且只包含 description、story 和 items 三個鍵，items 必須是字符串列表。不要包含額外的文字或格式。"
+)
+
+# Structured Outputs：保證回應是符合格式的 JSON，不再需要為格式錯誤重試
+ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "description": {"type": "string"},
+                "story": {"type": "string"},
+                "items": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["description", "story", "items"],
+            "additionalProperties": False
+        }
+    }
+}
+
+POEM_SYSTEM_PROMPT = (
+    "你是一個失明的詩人，擅長創作新詩，你透過的助手的眼睛與他對物品、景象的描述來創作新詩，助手所描述的格式:JSON 格式，包含 description、story 和 items。"
+    "你所創作的新要有詩名,行數在5~10行間,詩將印在一張58公分寬的收據上，將作為禮物或紀念品贈與給別人\n"
+    "請根據使用者提供的 JSON 格式照片分析結果，創作一首繁體中文新詩（形式自由）。"
+    "請以新詩形式捕捉照片的情感與意境，返回純文字新詩內容（僅詩歌文字，不包含其他格式）。"
+)
+
+# 背景事件迴圈與共用的非同步客戶端，第一次使用時建立
+_loop = None
+_loop_lock = threading.Lock()
+_semaphore = None
+_last_timestamp = None
+# 單一寫檔執行緒：描述與快取檔案在背景寫入，不佔用 API 流程（SD 卡寫入可能很慢）
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PoemAPIWriter")
+_timestamp_lock = threading.Lock()
+_openai_clients = {}
+_http_client = None
+_session = None
+
+# 共用連線池大小 / Shared connection pool size
+HTTP_MAX_CONNECTIONS = 32
+HTTP_MAX_KEEPALIVE = 16
+
+def _get_loop():
+    """取得背景事件迴圈，所有 API 請求都在這個執行緒中進行"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="PoemAPILoop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+def _run(coro):
+    """在背景事件迴圈中執行協程並等待結果（同步呼叫者使用）"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+def _atomic_write(path, data):
+    """先寫暫存檔再替換，避免讀到寫到一半的檔案"""
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.error(f"寫入檔案失敗 {path}: {e}")
+        raise
+
+def write_file_background(path, data):
+    """交給寫檔執行緒寫入檔案，返回 Future（依提交順序完成）"""
+    return _io_pool.submit(_atomic_write, path, data)
+
+def _get_semaphore():
+    """限制同時進行的 API 請求數（只在背景事件迴圈中呼叫）"""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(API_CONCURRENCY)
+    return _semaphore
+
+def new_timestamp():
+    """
+    產生檔名用的時間戳；同一秒內多次呼叫時加上序號，避免並行生成時檔案互相覆寫
+    """
+    global _last_timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    with _timestamp_lock:
+        if _last_timestamp is not None and _last_timestamp[0] == timestamp:
+            count = _last_timestamp[1] + 1
+            _last_timestamp = (timestamp, count)
+            return f"{timestamp}_{count}"
+        _last_timestamp = (timestamp, 0)
+        return timestamp
+
+def _get_openai_client(api_key):
+    """依 API 金鑰重用 AsyncOpenAI 客戶端，保留連線池"""
+    client = _openai_clients.get(api_key)
+    if client is None:
+        # 關閉 SDK 內建重試，重試只由 analyze_photo_with_openai_async 的退避迴圈負責
+        if HTTPX_AVAILABLE:
+            client = AsyncOpenAI(api_key=api_key, max_retries=0, http_client=httpx.AsyncClient(limits=_http_limits()))
+        else:
+            client = AsyncOpenAI(api_key=api_key, max_retries=0)
+        _openai_clients[api_key] = client
+    return client
+
+def _http_limits():
+    """連線池設定，避免預設池過小造成 PoolTimeout"""
+    return httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+
+def _get_http_client():
+    """共用的 httpx.AsyncClient，跨請求與重試保留 TCP/TLS 連線"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(limits=_http_limits())
+    return _http_client
+
+def _get_session():
+    """沒有 httpx 時使用的共用 requests.Session，同樣保留連線"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+async def _post_deepseek(headers, payload):
+    """送出 DeepSeek 請求並回傳 JSON 結果"""
+    if HTTPX_AVAILABLE:
+        response = await _get_http_client().post(DEEPSEEK_URL, headers=headers, json=payload, timeout=API_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+    
+    # 沒有 httpx 時在執行緒中使用 requests，不阻塞事件迴圈
+    response = await asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(_get_session().post, DEEPSEEK_URL, headers=headers, json=payload,
+                                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+    )
+    response.raise_for_status()
+    return response.json()
+
 def load_environment_variables(config):
     """載入環境變數"""
     if DOTENV_AVAILABLE:
@@ -59,7 +300,12 @@ def load_environment_variables(config):
             logger.warning(f"未找到 .env 文件: {env_path}")
 
 def check_api_keys(config):
-    """檢查 API 金鑰是否可用，優先使用環境變數"""
+    """檢查 API 金鑰是否可用，優先使用環境變數（執行期間金鑰不變，只檢查一次）"""
+    return _check_api_keys_cached(config)
+
+@functools.lru_cache(maxsize=1)
+def _check_api_keys_cached(config):
+    """實際檢查 API 金鑰，結果以配置對象為鍵快取"""
     # 載入環境變數
     load_environment_variables(config)
     
@@ -90,32 +336,103 @@ def check_api_keys(config):
     return openai_key, deepseek_key
 
 def encode_image(image):
-    """將圖像轉換為 base64 字符串"""
-    try:
-        # 如果輸入是 numpy 數組 (OpenCV 圖像)
-        if isinstance(image, np.ndarray):
-            # 確保圖像是 RGB 格式
-            if len(image.shape) == 3 and image.shape[2] == 3:
-                img = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-            else:
-                img = Image.fromarray(image)
-        else:
-            img = image
-            
-        # 將圖像保存到內存緩衝區
-        buffered = io.BytesIO()
-        img.save(buffered, format="JPEG")
-        
-        # 將緩衝區內容編碼為 base64
-        img_str = base64.b64encode(buffered.getvalue()).decode('utf-8')
-        return img_str
-    except Exception as e:
-        logger.error(f"圖像編碼失敗: {e}")
-        print(f"❌ 圖像編碼失敗: {e}")
-        raise
+    """
+    將圖像編碼為 JPEG，只編碼一次並在內存中完成
+    
+    Returns:
+        (JPEG 位元組, base64 字符串)
+    """
+    # 先縮小到 low detail 尺寸（最長邊不超過 LOW_DETAIL_SIZE）
+    if isinstance(image, np.ndarray):
+        height, width = image.shape[:2]
+        scale = LOW_DETAIL_SIZE / max(height, width)
+        if scale < 1:
+            image = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+    else:
+        image = image.copy()
+        image.thumbnail((LOW_DETAIL_SIZE, LOW_DETAIL_SIZE), Image.BILINEAR)
+    
+    if isinstance(image, np.ndarray):
+        # OpenCV 直接從 BGR 陣列編碼 JPEG（libjpeg-turbo），不需 cvtColor 與 PIL 複製
+        ok, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), 75, int(cv2.IMWRITE_JPEG_OPTIMIZE), 0])
+        if not ok:
+            logger.error("圖像編碼失敗")
+            print("❌ 圖像編碼失敗")
+            raise ValueError("無法將圖像編碼為 JPEG")
+        jpeg_bytes = buffer.tobytes()
+    else:
+        try:
+            # PIL 圖像保存到內存緩衝區；不做霍夫曼最佳化，low detail 模式下較小的品質即足夠
+            buffered = io.BytesIO()
+            image.save(buffered, format="JPEG", quality=75, optimize=False)
+            jpeg_bytes = buffered.getvalue()
+        except Exception as e:
+            logger.error(f"圖像編碼失敗: {e}")
+            print(f"❌ 圖像編碼失敗: {e}")
+            raise
+    
+    # 將 JPEG 內容編碼為 base64（只做一次）
+    return jpeg_bytes, base64.b64encode(jpeg_bytes).decode('ascii')
+
+def _load_analysis_cache(config):
+    """載入分析快取（只在第一次使用時讀取磁盤）"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = []
+        cache_path = os.path.join(config.poem_dir, ANALYSIS_CACHE_FILE)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                _analysis_cache = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"分析快取讀取失敗，將重新建立: {e}")
+    return _analysis_cache
+
+def _save_analysis_cache(config):
+    """在背景寫回分析快取（先在呼叫端序列化，避免寫入時內容被修改）"""
+    cache_path = os.path.join(config.poem_dir, ANALYSIS_CACHE_FILE)
+    write_file_background(cache_path, json.dumps(_analysis_cache, ensure_ascii=False))
+
+def lookup_analysis_cache(image_hash, config: Config):
+    """查詢與照片雜湊相近且未過期的分析結果，沒有則返回 None"""
+    now = time.time()
+    best = None
+    best_distance = ANALYSIS_CACHE_MAX_DISTANCE + 1
+    for entry in _load_analysis_cache(config):
+        if (entry['model'] != config.openai_model or entry['prompt_version'] != ANALYSIS_PROMPT_VERSION
+                or now - entry['created'] > ANALYSIS_CACHE_TTL):
+            continue
+        distance = hamming_distance(image_hash, entry['hash'])
+        if distance < best_distance:
+            best, best_distance = entry, distance
+    if best is None:
+        return None
+    logger.info(f"分析快取命中 (漢明距離 {best_distance})")
+    return best['result']
+
+def store_analysis_cache(image_hash, analysis_result, config: Config):
+    """保存分析結果到快取，移除過期與超出上限的舊項目"""
+    global _analysis_cache
+    now = time.time()
+    entries = [entry for entry in _load_analysis_cache(config) if now - entry['created'] <= ANALYSIS_CACHE_TTL]
+    entries.append({
+        'hash': image_hash,
+        'model': config.openai_model,
+        'prompt_version': ANALYSIS_PROMPT_VERSION,
+        'created': now,
+        'result': analysis_result,
+    })
+    _analysis_cache = entries[-ANALYSIS_CACHE_SIZE:]
+    _save_analysis_cache(config)
 
 def analyze_photo_with_openai(image, config: Config):
-    """使用 OpenAI API 分析照片內容"""
+    """使用 OpenAI API 分析照片內容，返回 (分析結果, 時間戳, 是否為真實 API 結果)"""
+    return _run(analyze_photo_with_openai_async(image, config))
+
+async def analyze_photo_with_openai_async(image, config: Config):
+    """使用 OpenAI API 分析照片內容（非同步），返回 (分析結果, 時間戳, 是否為真實 API 結果)"""
     try:
         logger.info("開始使用 OpenAI API 分析照片")
         print("🔍 使用 OpenAI API（GPT-4o Mini）分析照片...")
@@ -123,28 +440,25 @@ def analyze_photo_with_openai(image, config: Config):
         # 檢查 OpenAI 庫是否可用
         if not OPENAI_AVAILABLE:
             print("⚠️ OpenAI 庫未安裝，使用模擬回應")
-            return get_mock_analysis(), datetime.now().strftime("%Y%m%d_%H%M%S")
+            return get_mock_analysis(), new_timestamp(), False
         
         # 檢查 API 金鑰
         openai_key = os.environ.get('OPENAI_API_KEY')
         if not openai_key:
             print("⚠️ OpenAI API 金鑰未設置，使用模擬回應")
-            return get_mock_analysis(), datetime.now().strftime("%Y%m%d_%H%M%S")
+            return get_mock_analysis(), new_timestamp(), False
+        
+        # 相同或幾乎相同的照片直接使用快取結果
+        image_hash = average_hash(image) if isinstance(image, np.ndarray) else None
+        cached = lookup_analysis_cache(image_hash, config) if image_hash is not None else None
+        if cached is not None:
+            print("♻️ 使用快取的照片分析結果")
+            return (*save_analysis(cached, config), True)
         
-        client = OpenAI(api_key=openai_key)
+        client = _get_openai_client(openai_key)
         
         # 將圖像轉為 base64
-        try:
-            image_data = encode_image(image)
-        except Exception as e:
-            logger.error(f"圖像編碼失敗: {e}")
-            print(f"❌ 圖像編碼失敗，使用備用方法: {e}")
-            # 如果編碼失敗，保存圖像到臨時文件並使用 PIL 再次加載
-            temp_image_path = os.path.join(config.photo_dir, "temp_image.jpg")
-            cv2.imwrite(temp_image_path, image)
-            with open(temp_image_path, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode('utf-8')
-            os.remove(temp_image_path)
+        _, image_data = encode_image(image)
         
         print("🤖 正在分析照片內容...")
         logger.info("向 OpenAI API 發送請求")
@@ -155,76 +469,82 @@ def analyze_photo_with_openai(image, config: Config):
         
         for attempt in range(max_retries):
             try:
-                response = client.chat.completions.create(
-                    model=config.openai_model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": (
-                                        "你是一個失明的詩人的助手，透過你的眼睛與你的描述感受這個世界。請分析圖片內容並返回以下嚴格 JSON 格式的回應：\n"
-                                        "{\"description\": \"場景、手勢或情感的描述（4-6 句）\", \"story\": \"圖片背後可能的簡短故事（50-100 字）\", \"items\": [\"物品1\", \"物品2\", ...]}\n"
-                                        "確保回應是有效的 JSON 格式，且只包含 description、story 和 items 三個鍵，items 必須是字符串列表。不要包含額外的文字或格式。"
-                                    )
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{image_data}",
-                                        "detail": "low"
+                async with _get_semaphore():
+                    response = await client.chat.completions.create(
+                        model=config.openai_model,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": VISION_SYSTEM_PROMPT
+                            },
+                            {
+                                "role": "user",
+                                "content": [
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {
+                                            "url": f"data:image/jpeg;base64,{image_data}",
+                                            "detail": "low"
+                                        }
                                     }
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=300,
-                    timeout=30
-                )
+                                ]
+                            }
+                        ],
+                        response_format=ANALYSIS_RESPONSE_FORMAT,
+                        max_tokens=300,
+                        timeout=API_TIMEOUT
+                    )
                 
                 result = response.choices[0].message.content.strip()
                 logger.info(f"OpenAI 原始回應: {result}")
                 
                 # 驗證 JSON 格式
-                analysis_result = json.loads(result)
-                validate_analysis_result(analysis_result)
+                analysis_result = decode_analysis_result(result)
                 
                 print("✅ OpenAI 分析完成")
                 break
                 
-            except (requests.exceptions.RequestException, json.JSONDecodeError, ValueError) as e:
+            except _HTTP_ERRORS + (json.JSONDecodeError, ValueError) as e:
                 logger.warning(f"OpenAI API 請求失敗 (嘗試 {attempt + 1}/{max_retries}): {e}")
                 print(f"⚠️ OpenAI API 請求失敗 (嘗試 {attempt + 1}/{max_retries}): {e}")
                 
-                if attempt < max_retries - 1:
-                    print(f"⏳ {retry_delay} 秒後重試...")
-                    time.sleep(retry_delay)
+                if attempt < max_retries - 1 and _is_retriable(e):
+                    delay = _backoff_delay(attempt, retry_delay)
+                    print(f"⏳ {delay:.1f} 秒後重試...")
+                    await asyncio.sleep(delay)
                 else:
                     print("❌ OpenAI API 請求失敗，使用備用分析")
-                    analysis_result = get_mock_analysis()
-        
-        # 保存分析結果
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        desc_filename = os.path.join(config.poem_dir, f"openai_description_{timestamp}.txt")
+                    return (*save_analysis(get_mock_analysis(), config), False)
         
-        os.makedirs(os.path.dirname(desc_filename), exist_ok=True)
+        # 只快取真正的 API 結果 / Only real API results are cached
+        if image_hash is not None:
+            store_analysis_cache(image_hash, analysis_result, config)
         
-        with open(desc_filename, 'w', encoding='utf-8') as f:
-            f.write(f"描述：{analysis_result['description']}\n故事：{analysis_result['story']}\n物品：{', '.join(analysis_result['items'])}")
-        
-        logger.info(f"描述已保存至: {desc_filename}")
-        print(f"💾 描述已保存至: {desc_filename}")
-        
-        return analysis_result, timestamp
+        return (*save_analysis(analysis_result, config), True)
         
     except Exception as e:
         logger.error(f"整體 OpenAI 分析過程錯誤: {e}")
         print(f"❌ OpenAI 分析過程錯誤: {e}")
         
         # 返回備用分析結果
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return get_mock_analysis(), timestamp
+        timestamp = new_timestamp()
+        return get_mock_analysis(), timestamp, False
+
+def save_analysis(analysis_result, config: Config):
+    """保存分析結果到磁盤，返回 (分析結果, 時間戳)"""
+    timestamp = new_timestamp()
+    desc_filename = os.path.join(config.poem_dir, f"openai_description_{timestamp}.txt")
+    
+    # 描述檔只供紀錄，後續流程不需要，在背景寫入
+    write_file_background(
+        desc_filename,
+        f"描述：{analysis_result['description']}\n故事：{analysis_result['story']}\n物品：{', '.join(analysis_result['items'])}"
+    )
+    
+    logger.info(f"描述已保存至: {desc_filename}")
+    print(f"💾 描述已保存至: {desc_filename}")
+    
+    return analysis_result, timestamp
 
 def get_mock_analysis():
     """獲取模擬分析結果"""
@@ -234,6 +554,23 @@ def get_mock_analysis():
         "items": ["綠色矩形", "藍色背景", "白色文字", "測試圖像"]
     }
 
+def decode_analysis_result(text):
+    """解碼並驗證 OpenAI 回傳的 JSON，格式錯誤時拋出 ValueError"""
+    if MSGSPEC_AVAILABLE:
+        try:
+            return msgspec.to_builtins(msgspec.json.decode(text, type=AnalysisResult))
+        except msgspec.DecodeError as e:
+            raise ValueError(f"JSON 格式不正確：{e}") from e
+    analysis_result = json.loads(text)
+    validate_analysis_result(analysis_result)
+    return analysis_result
+
+def encode_analysis_result(analysis_result):
+    """將分析結果編碼為 JSON 字符串（保留中文字元）"""
+    if MSGSPEC_AVAILABLE:
+        return msgspec.json.encode(analysis_result).decode('utf-8')
+    return json.dumps(analysis_result, ensure_ascii=False)
+
 def validate_analysis_result(analysis_result):
     """驗證分析結果的格式"""
     required_keys = {"description", "story", "items"}
@@ -246,8 +583,80 @@ def validate_analysis_result(analysis_result):
     if not isinstance(analysis_result["items"], list) or not all(isinstance(item, str) for item in analysis_result["items"]):
         raise ValueError("JSON 格式不正確：items 必須是字符串列表")
 
-def generate_newpoetry_with_deepseek(analysis_result, config: Config, timestamp=None):
+def embed_analysis(analysis_result):
+    """
+    將分析結果轉為單位長度的字元雙字母組雜湊向量
+    
+    使用 crc32 而非 hash()，讓存到磁盤的向量在不同行程間保持一致
+    """
+    text = analysis_result['description'] + analysis_result['story'] + ''.join(analysis_result['items'])
+    vector = np.zeros(POEM_EMBED_DIM, dtype=np.float32)
+    for i in range(len(text) - 1):
+        vector[zlib.crc32(text[i:i + 2].encode('utf-8')) % POEM_EMBED_DIM] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def _load_poem_cache(config):
+    """載入詩歌快取：(向量矩陣, 詩歌路徑列表)"""
+    global _poem_cache
+    if _poem_cache is None:
+        _poem_cache = (np.empty((0, POEM_EMBED_DIM), dtype=np.float32), [])
+        cache_path = os.path.join(config.poem_dir, POEM_CACHE_FILE)
+        try:
+            with np.load(cache_path) as data:
+                _poem_cache = (data['embeddings'].astype(np.float32), data['paths'].tolist())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"詩歌快取讀取失敗，將重新建立: {e}")
+    return _poem_cache
+
+def _save_poem_cache(config):
+    """在背景寫回詩歌快取（快取內容每次更新都是新物件，可直接交給寫檔執行緒）"""
+    _io_pool.submit(_write_poem_cache, os.path.join(config.poem_dir, POEM_CACHE_FILE), *_poem_cache)
+
+def _write_poem_cache(cache_path, embeddings, paths):
+    """寫入詩歌快取檔案"""
+    try:
+        # np.savez 會自動補上 .npz，暫存檔名需以 .npz 結尾
+        temp_path = cache_path + ".tmp.npz"
+        np.savez(temp_path, embeddings=embeddings, paths=np.array(paths, dtype=str))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"詩歌快取寫入失敗: {e}")
+
+def lookup_poem_cache(vector, config: Config):
+    """查詢相似度超過門檻且檔案仍存在的詩歌路徑，命中時移到最新位置（LRU）"""
+    global _poem_cache
+    embeddings, paths = _load_poem_cache(config)
+    if not paths:
+        return None
+    # 向量皆為單位長度，內積即餘弦相似度
+    similarities = embeddings @ vector
+    best = int(np.argmax(similarities))
+    if similarities[best] < getattr(config, 'poem_cache_threshold', 0.92) or not os.path.exists(paths[best]):
+        return None
+    logger.info(f"詩歌快取命中 (相似度 {similarities[best]:.3f}): {paths[best]}")
+    order = [i for i in range(len(paths)) if i != best] + [best]
+    _poem_cache = (embeddings[order], [paths[i] for i in order])
+    return paths[best]
+
+def store_poem_cache(vector, poem_path, config: Config):
+    """保存詩歌向量，超過上限時移除最久未使用的項目"""
+    global _poem_cache
+    embeddings, paths = _load_poem_cache(config)
+    cache_max = getattr(config, 'poem_cache_max', 256)
+    embeddings = np.vstack((embeddings, vector[np.newaxis]))[-cache_max:]
+    paths = (paths + [poem_path])[-cache_max:]
+    _poem_cache = (embeddings, paths)
+    _save_poem_cache(config)
+
+def generate_newpoetry_with_deepseek(analysis_result, config: Config, timestamp=None, use_cache=True):
     """使用 DeepSeek API 根據分析結果生成新詩"""
+    return _run(generate_newpoetry_with_deepseek_async(analysis_result, config, timestamp, use_cache))
+
+async def generate_newpoetry_with_deepseek_async(analysis_result, config: Config, timestamp=None, use_cache=True):
+    """使用 DeepSeek API 根據分析結果生成新詩（非同步）；模擬分析結果應傳入 use_cache=False，不查詢也不寫入詩歌快取"""
     if not analysis_result or not isinstance(analysis_result, dict):
         logger.error("無效的分析結果，無法生成新詩")
         print("❌ 無效的分析結果，無法生成新詩")
@@ -261,19 +670,23 @@ def generate_newpoetry_with_deepseek(analysis_result, config: Config, timestamp=
         print(f"❌ 分析結果格式不正確: {e}")
         return None
     
-    deepseek_key = os.environ.get('DEEPSEEK_API_KEY')
-    if not deepseek_key:
-        print("⚠️ DeepSeek API 金鑰未設置，使用模擬詩歌")
-        return generate_mock_poem(config, timestamp)
+    # 相似的分析結果直接重用先前生成的詩歌；模擬分析結果每次都相同，不得進入快取
+    analysis_vector = embed_analysis(analysis_result) if use_cache else None
+    cached_poem = lookup_poem_cache(analysis_vector, config) if use_cache else None
+    if cached_poem:
+        print(f"♻️ 使用快取的詩歌: {os.path.basename(cached_poem)}")
+        return cached_poem
     
-    # 將分析結果轉為 JSON 字符串傳遞給 DeepSeek
-    analysis_json = json.dumps(analysis_result, ensure_ascii=False)
+    # 將分析結果轉為 JSON 字符串傳遞給 DeepSeek，作為唯一的變動內容
+    analysis_json = encode_analysis_result(analysis_result)
     
-    prompt = (
-        "你是一個失明的詩人，擅長創作新詩。請根據以下 JSON 格式的照片分析結果，創作一首繁體中文新詩（4 行，形式自由）：\n"
-        f"{analysis_json}\n"
-        "請以新詩形式捕捉照片的情感與意境，返回純文字新詩內容（僅詩歌文字，不包含其他格式）。"
-    )
+    if getattr(config, 'prefer_local_poet', False):
+        return await generate_local_poem(analysis_json, config, timestamp)
+    
+    deepseek_key = os.environ.get('DEEPSEEK_API_KEY')
+    if not deepseek_key:
+        print("⚠️ DeepSeek API 金鑰未設置，使用本地或模擬詩歌")
+        return await generate_local_poem(analysis_json, config, timestamp)
     
     headers = {
         "Authorization": f"Bearer {deepseek_key}",
@@ -285,11 +698,11 @@ def generate_newpoetry_with_deepseek(analysis_result, config: Config, timestamp=
         "messages": [
             {
                 "role": "system",
-                "content": "你是一個失明的詩人，擅長創作新詩，你透過的助手的眼睛與他對物品、景象的描述來創作新詩，助手所描述的格式:JSON 格式，包含 description、story 和 items。你所創作的新要有詩名,行數在5~10行間,詩將印在一張58公分寬的收據上，將作為禮物或紀念品贈與給別人"
+                "content": POEM_SYSTEM_PROMPT
             },
             {
                 "role": "user",
-                "content": prompt
+                "content": analysis_json
             }
         ],
         "max_tokens": 100
@@ -305,15 +718,8 @@ def generate_newpoetry_with_deepseek(analysis_result, config: Config, timestamp=
         
         for attempt in range(max_retries):
             try:
-                response = requests.post(
-                    "https://api.deepseek.com/v1/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=30
-                )
-                
-                response.raise_for_status()
-                result = response.json()
+                async with _get_semaphore():
+                    result = await _post_deepseek(headers, payload)
                 newpoetry = result['choices'][0]['message']['content'].strip()
                 
                 logger.info("DeepSeek 生成的新詩:")
@@ -321,37 +727,60 @@ def generate_newpoetry_with_deepseek(analysis_result, config: Config, timestamp=
                 print("✅ DeepSeek 生成的新詩:")
                 print(newpoetry)
                 
-                if timestamp is None:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                
-                poem_path = os.path.join(config.poem_dir, f"poem_{timestamp}.txt")
-                os.makedirs(os.path.dirname(poem_path), exist_ok=True)
-                with open(poem_path, 'w', encoding='utf-8') as f:
-                    f.write(newpoetry)
-                
-                logger.info(f"詩歌已保存至: {poem_path}")
-                print(f"💾 詩歌已保存至: {poem_path}")
-                
+                poem_path = await save_poem(newpoetry, config, timestamp)
+                if use_cache:
+                    store_poem_cache(analysis_vector, poem_path, config)
                 return poem_path
                 
-            except (requests.exceptions.RequestException, KeyError) as e:
+            except _HTTP_ERRORS + (KeyError,) as e:
                 logger.warning(f"DeepSeek API 請求失敗 (嘗試 {attempt + 1}/{max_retries}): {e}")
                 print(f"⚠️ DeepSeek API 請求失敗 (嘗試 {attempt + 1}/{max_retries}): {e}")
                 
-                if attempt < max_retries - 1:
-                    print(f"⏳ {retry_delay} 秒後重試...")
-                    time.sleep(retry_delay)
+                if attempt < max_retries - 1 and _is_retriable(e):
+                    delay = _backoff_delay(attempt, retry_delay)
+                    print(f"⏳ {delay:.1f} 秒後重試...")
+                    await asyncio.sleep(delay)
                 else:
                     print("❌ DeepSeek API 請求失敗，使用備用詩歌")
-                    return generate_mock_poem(config, timestamp)
+                    return await generate_local_poem(analysis_json, config, timestamp)
         
     except Exception as e:
         logger.error(f"DeepSeek API 錯誤: {e}")
         print(f"❌ DeepSeek API 錯誤: {e}")
-        return generate_mock_poem(config, timestamp)
+        return await generate_local_poem(analysis_json, config, timestamp)
+
+async def save_poem(poem, config: Config, timestamp=None):
+    """保存詩歌到磁盤，返回詩歌文件路徑"""
+    if timestamp is None:
+        timestamp = new_timestamp()
+    
+    # 列印行程會讀取詩歌檔，返回前須等待寫入完成（不阻塞事件迴圈）
+    poem_path = os.path.join(config.poem_dir, f"poem_{timestamp}.txt")
+    await asyncio.wrap_future(write_file_background(poem_path, poem))
+    
+    logger.info(f"詩歌已保存至: {poem_path}")
+    print(f"💾 詩歌已保存至: {poem_path}")
+    
+    return poem_path
 
-def generate_mock_poem(config, timestamp=None):
-    """生成模擬詩歌"""
+async def generate_local_poem(analysis_json, config: Config, timestamp=None):
+    """使用本地小模型生成新詩，模型不可用或失敗時使用模擬詩歌"""
+    if local_poet.is_available(config):
+        print("📝 使用本地模型生成新詩...")
+        # 本地推論佔用 CPU，在執行緒中執行以免阻塞事件迴圈
+        newpoetry = await asyncio.get_running_loop().run_in_executor(
+            None, local_poet.generate, POEM_SYSTEM_PROMPT, analysis_json, config
+        )
+        if newpoetry:
+            logger.info("本地模型生成的新詩:")
+            logger.info(newpoetry)
+            print("✅ 本地模型生成的新詩:")
+            print(newpoetry)
+            return await save_poem(newpoetry, config, timestamp)
+    return await generate_mock_poem(config, timestamp)
+
+async def generate_mock_poem(config, timestamp=None):
+    """生成模擬詩歌並保存（非同步，不阻塞事件迴圈）"""
     mock_poem = """《瞬間的永恆》
 
 青綠方塊藏文字，
@@ -361,25 +790,29 @@ def generate_mock_poem(config, timestamp=None):
 像素間的詩意流淌，
 簡單卻蘊含深意。"""
     
-    if timestamp is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    poem_path = os.path.join(config.poem_dir, f"poem_{timestamp}.txt")
-    os.makedirs(os.path.dirname(poem_path), exist_ok=True)
-    
-    with open(poem_path, 'w', encoding='utf-8') as f:
-        f.write(mock_poem)
-    
-    logger.info(f"模擬詩歌已保存至: {poem_path}")
+    logger.info("使用模擬詩歌")
     print("📝 模擬詩歌生成:")
     print(mock_poem)
-    print(f"💾 詩歌已保存至: {poem_path}")
     
-    return poem_path
+    return await save_poem(mock_poem, config, timestamp)
 
 def generate_poem(image, photo_path, config: Config):
     """
-    分析照片並生成詩歌，保存到磁盤
+    分析照片並生成詩歌，保存到磁盤（同步包裝，實際在背景事件迴圈中執行）
+    
+    Args:
+        image: 照片圖像（OpenCV 格式）
+        photo_path: 照片文件的路徑
+        config: 配置對象
+        
+    Returns:
+        生成的詩歌文件路徑，如果失敗則返回 None
+    """
+    return _run(generate_poem_async(image, photo_path, config))
+
+async def generate_poem_async(image, photo_path, config: Config):
+    """
+    分析照片並生成詩歌，保存到磁盤（非同步）
     
     Args:
         image: 照片圖像（OpenCV 格式）
@@ -400,7 +833,7 @@ def generate_poem(image, photo_path, config: Config):
         check_api_keys(config)
         
         # 分析照片
-        analysis_result, timestamp = analyze_photo_with_openai(image, config)
+        analysis_result, timestamp, is_real_analysis = await analyze_photo_with_openai_async(image, config)
         
         if not analysis_result:
             logger.error("照片分析失敗，無法生成詩歌")
@@ -408,7 +841,7 @@ def generate_poem(image, photo_path, config: Config):
             return None
         
         # 生成詩歌
-        poem_path = generate_newpoetry_with_deepseek(analysis_result, config, timestamp)
+        poem_path = await generate_newpoetry_with_deepseek_async(analysis_result, config, timestamp, use_cache=is_real_analysis)
         
         if poem_path:
             print(f"✅ 詩歌生成完成: {os.path.basename(poem_path)}")
@@ -422,6 +855,29 @@ def generate_poem(image, photo_path, config: Config):
         print(f"❌ 詩歌生成過程出錯: {e}")
         return None
 
+def generate_poems_batch(images_and_paths, config: Config):
+    """
+    同時為多張照片生成詩歌（同步包裝）
+    
+    Args:
+        images_and_paths: (照片圖像, 照片路徑) 的列表
+        config: 配置對象
+        
+    Returns:
+        詩歌文件路徑列表，順序與輸入相同，失敗的項目為 None
+    """
+    return _run(generate_poems_batch_async(images_and_paths, config))
+
+async def generate_poems_batch_async(images_and_paths, config: Config):
+    """
+    同時為多張照片生成詩歌（非同步）
+    
+    每張照片的分析與生成仍依序進行，照片之間並行；同時進行的 API 請求數由共用的信號量限制
+    """
+    logger.info(f"開始批次生成詩歌: {len(images_and_paths)} 張照片")
+    return await asyncio.gather(*(generate_poem_async(image, photo_path, config)
+                                  for image, photo_path in images_and_paths))
+
 # 測試代碼
 if __name__ == "__main__":
     # 導入需要的模組
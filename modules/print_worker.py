@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import logging
+import logging.handlers
+import signal
+from types import SimpleNamespace
+
+from modules.printer import print_poem, release_printer
+
+# 列印工作行程的入口模組：只導入印表機相關模組，子行程不建立 Config、不開啟 app.log
+# Entry module for the print worker process: imports only the printer modules, the child never builds Config or opens app.log
+logger = logging.getLogger(__name__)
+
+def printer_settings(config):
+    """
+    取出列印工作行程需要的設定 / Extract the settings the print worker needs
+    
+    Args:
+        config: 配置物件 / Configuration object
+    
+    Returns:
+        dict: 可直接傳給子行程的純資料設定 / Plain-data settings safe to hand to the child process
+    """
+    return {
+        'printer_encoding': config.printer_encoding,
+        'chinese_mode': config.chinese_mode,
+        'log_level': logging.getLogger().level,
+    }
+
+def print_worker(jobs, results, log_queue, settings):
+    """
+    列印工作行程主迴圈：依序列印佇列中的詩歌，並持續持有印表機連接 / Print worker loop: prints queued poems in order while holding the printer connection
+    
+    Args:
+        jobs: 詩歌文件路徑佇列，收到 None 時結束 / Queue of poem file paths, None ends the loop
+        results: 回報 (詩歌文件路徑, 是否成功) 的佇列 / Queue receiving (poem file path, success) reports
+        log_queue: 日誌記錄佇列，由主行程寫入 app.log / Log record queue, written to app.log by the main process
+        settings: printer_settings() 產生的設定 / Settings produced by printer_settings()
+    """
+    # forkserver 子行程會恢復預設的 SIGINT 處理；Ctrl-C 只由主行程處理，由它送出 None 結束佇列，避免中斷列印到一半的工作
+    # forkserver children get the default SIGINT handler back; leave Ctrl-C to the main process, which ends the queue with None, so an in-flight print is not cut off
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    # 日誌全部交給主行程，避免兩個行程同時輪替同一個檔案 / Hand every log record to the main process so two processes never rotate the same file
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(settings['log_level'])
+    
+    printer_config = SimpleNamespace(**settings)
+    try:
+        while True:
+            poem_path = jobs.get()
+            if poem_path is None:
+                break
+            try:
+                results.put((poem_path, print_poem(poem_path, printer_config)))
+            except Exception as e:
+                logger.error("列印工作失敗 / Print job failed: %s", e)
+                results.put((poem_path, False))
+    finally:
+        release_printer()
@@ -3,20 +3,40 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import logging
+import threading
 import usb.core
 from escpos.printer import Usb
 from modules.config import Config
 from datetime import datetime  # 引入 datetime 用於獲取當前時間
 
-# 配置日誌 / Configure logging
-config = Config()
-logging.basicConfig(
-    filename=os.path.join(config.log_dir, 'app.log'),
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# 檔案日誌由 Config 建立時的 setup_logging 統一設定 / File logging is configured once by setup_logging when Config is built
 logger = logging.getLogger(__name__)
 
+# 持續持有的印表機物件，避免每次列印都重新列舉、認領 USB 裝置 / Persistent printer handle so each print skips USB enumeration and claim
+_printer = None
+_printer_lock = threading.Lock()
+
+# 預先編碼的中文模式指令與固定頁頭頁尾，整份列印內容以單次 USB 傳輸送出 / Pre-encoded Chinese mode command and static header/footer, the whole job goes out in one USB transfer
+CHINESE_MODE_COMMAND = b'\x1C\x26'
+HEADER_BYTES = "===== 詩歌相機 / Poetry Camera =====\n\n".encode('gb18030')
+FOOTER_RULE_BYTES = "\n======================\n".encode('gb18030')
+PRINT_TIME_PREFIX_BYTES = "列印時間 / Print Time: ".encode('gb18030')
+TEST_BODY_BYTES = "測試列印成功! / Test Print Successful!".encode('gb18030')
+
+def build_payload(body: bytes) -> bytes:
+    """
+    組合完整列印內容：中文模式、頁頭、內容與含列印時間的頁尾 / Assemble a full print job: Chinese mode, header, body and a footer with the print time
+    
+    Args:
+        body: 已編碼的內容 / Encoded body
+        
+    Returns:
+        bytes: 可直接送出的列印內容 / Print job ready to send
+    """
+    # 只有時間戳需要每次產生，且為 ASCII / Only the timestamp changes per job, and it is ASCII
+    print_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S").encode('ascii')
+    return b''.join((CHINESE_MODE_COMMAND, HEADER_BYTES, body, FOOTER_RULE_BYTES, PRINT_TIME_PREFIX_BYTES, print_time))
+
 def check_usb_printer():
     """
     檢查 USB 印表機是否可用 / Check if USB printer is available
@@ -38,7 +58,37 @@ def check_usb_printer():
 
 def get_printer(config: Config):
     """
-    獲取印表機物件 - 直接使用 USB 連接 / Get printer object - direct USB connection
+    獲取印表機物件 - 直接使用 USB 連接，已連接時重用同一個物件 / Get printer object - direct USB connection, reused once connected
+    
+    Args:
+        config: 配置物件 / Configuration object
+        
+    Returns:
+        Usb: 印表機物件 / Printer object
+    """
+    global _printer
+    with _printer_lock:
+        if _printer is None:
+            _printer = _open_printer(config)
+        return _printer
+
+def release_printer():
+    """
+    關閉並丟棄持有的印表機物件，下次列印時重新連接 / Close and drop the held printer handle, reconnecting on the next print
+    """
+    global _printer
+    with _printer_lock:
+        printer, _printer = _printer, None
+    if printer is not None:
+        try:
+            printer.close()
+            logger.info("印表機資源已釋放 / Printer resources released")
+        except Exception as e:
+            logger.error(f"關閉印表機失敗: {e} / Failed to close printer: {e}")
+
+def _open_printer(config: Config):
+    """
+    建立新的印表機連接 / Open a new printer connection
     
     Args:
         config: 配置物件 / Configuration object
@@ -66,72 +116,57 @@ def print_poem(poem_path: str, config: Config):
     Args:
         poem_path: 詩歌文件路徑 / Poem file path
         config: 配置物件 / Configuration object
+        
+    Returns:
+        bool: 是否已在印表機上印出；改用模擬列印時為 False / Whether the poem was printed on the printer, False when it fell back to simulation
     """
-    printer = None
     try:
-        if not check_usb_printer():
-            logger.warning("USB 印表機不可用，進入模擬模式 / USB printer unavailable, entering simulation mode")
-            simulate_print(poem_path)
-            return
-        
+        # 已持有連接時直接使用；沒有時由 Usb() 自行尋找裝置，不再另外列舉一次
+        # Use the held connection when there is one; otherwise Usb() finds the device itself, no separate enumeration
+        reused = _printer is not None
         try:
             printer = get_printer(config)
         except Exception as e:
             logger.error(f"無法連接到印表機: {e} / Cannot connect to printer: {e}")
             logger.info("轉入模擬模式 / Switching to simulation mode")
             simulate_print(poem_path)
-            return
-        
-        try:
-            printer._raw(b'\x1C\x26')
-            logger.info("已啟用印表機中文模式 / Printer Chinese mode enabled")
-        except Exception as e:
-            logger.warning(f"啟用中文模式失敗: {e} / Failed to enable Chinese mode: {e}")
+            return False
         
         with open(poem_path, 'r', encoding='utf-8') as f:
             poem = f.read()
         
-        poem_encoded = poem
-        if config.chinese_mode == "default":
-            try:
-                poem_encoded = poem.encode('gb18030').decode('gb18030', errors='ignore')
-                logger.info("詩歌文本已轉換為 GB18030 編碼 / Poem text converted to GB18030 encoding")
-            except Exception as e:
-                logger.warning(f"詩歌文本編碼轉換失敗（gb18030）: {e} / Poem text encoding conversion failed (gb18030): {e}")
-                poem_encoded = poem
+        # 詩歌只編碼一次，無法編碼的字元略過 / Encode the poem once, skipping characters that cannot be encoded
+        encoding = 'gb18030' if config.chinese_mode == "default" else config.printer_encoding
+        poem_bytes = poem.encode(encoding, errors='ignore')
         
         # 列印雙語頁頭、詩歌內容與頁尾 / Print bilingual header, poem content and footer
+        payload = build_payload(poem_bytes)
         try:
-            # 雙語頁頭 / Bilingual header
-            printer.text("===== 詩歌相機 / Poetry Camera =====\n")
-            printer.text("\n")
-            # 詩歌內容 / Poem content
-            printer.text(poem_encoded)
-            printer.text("\n")
-            # 雙語頁尾：列印日期與時間 / Bilingual footer: print date and time
-            print_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            printer.text("======================\n")
-            printer.text(f"列印時間 / Print Time: {print_time}")
-
+            try:
+                printer._raw(payload)
+            except usb.core.USBError as e:
+                if not reused:
+                    raise
+                # 持有的連接已失效（如印表機重新插拔），重新連接後再試一次 / The held handle went stale (e.g. printer replugged), reconnect and retry once
+                logger.warning(f"印表機連接已失效，重新連接: {e} / Printer handle is stale, reconnecting: {e}")
+                release_printer()
+                printer = get_printer(config)
+                printer._raw(payload)
             printer.cut()
             logger.info(f"詩歌已成功列印: {poem_path} / Poem printed successfully: {poem_path}")
             print(f"詩歌已成功列印: {os.path.basename(poem_path)} / Poem printed successfully: {os.path.basename(poem_path)}")
+            return True
         except Exception as e:
             logger.error(f"列印過程中發生錯誤: {e} / Error during printing: {e}")
+            # 連接可能已失效（如 USBError），丟棄後下次重新連接 / The handle may be stale (e.g. USBError), drop it so the next print reconnects
+            release_printer()
             raise
         
     except Exception as e:
         logger.error(f"列印詩歌失敗: {e} / Failed to print poem: {e}")
         logger.info("轉入模擬模式 / Switching to simulation mode")
         simulate_print(poem_path)
-        
-    finally:
-        if printer is not None:
-            try:
-                printer.close()
-                logger.info("印表機資源已釋放 / Printer resources released")
-            except Exception as e:
-                logger.error(f"關閉印表機失敗: {e} / Failed to close printer: {e}")
+        return False
 
 def simulate_print(poem_path: str):
     """
@@ -179,13 +214,7 @@ def test_printer_connection():
         print("✓ 印表機初始化成功 / Printer initialized successfully")
         
         try:
-            printer._raw(b'\x1C\x26')
-            printer.text("===== 詩歌相機 / Poetry Camera =====\n")
-            printer.text("測試列印成功! / Test Print Successful!\n")
-            print_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            printer.text("=================\n")
-            printer.text(f"列印時間 / Print Time: {print_time}")
+            printer._raw(build_payload(TEST_BODY_BYTES))
             printer.cut()
             print("✓ 測試列印成功 / Test print successful")
             return True
@@ -193,7 +222,7 @@ def test_printer_connection():
             print(f"✗ 測試列印失敗: {e} / Test print failed: {e}")
             return False
         finally:
-            printer.close()
+            release_printer()
             
     except Exception as e:
         print(f"✗ 印表機初始化失敗: {e} / Printer initialization failed: {e}")